@@ -0,0 +1,55 @@
+"""NOTIFY oauth_token_changed on oauth_tokens writes (in-process connection cache invalidation).
+
+Only connect/disconnect-relevant columns fire the trigger; ``last_webhook_processed_at`` /
+``last_sync_at`` bumps on every webhook would otherwise flush caches constantly.
+
+Revision ID: 066
+Revises: 065
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "066"
+down_revision = "065"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    if "oauth_tokens" not in insp.get_table_names():
+        return
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_oauth_token_changed() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                PERFORM pg_notify('oauth_token_changed', OLD.org_id::text);
+                RETURN OLD;
+            END IF;
+            PERFORM pg_notify('oauth_token_changed', NEW.org_id::text);
+            IF TG_OP = 'UPDATE' AND OLD.org_id IS DISTINCT FROM NEW.org_id THEN
+                PERFORM pg_notify('oauth_token_changed', OLD.org_id::text);
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS trg_oauth_tokens_notify_changed ON oauth_tokens")
+    op.execute(
+        """
+        CREATE TRIGGER trg_oauth_tokens_notify_changed
+        AFTER INSERT OR DELETE OR UPDATE OF org_id, provider, access_token, expires_at
+        ON oauth_tokens
+        FOR EACH ROW EXECUTE FUNCTION notify_oauth_token_changed()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_oauth_tokens_notify_changed ON oauth_tokens")
+    op.execute("DROP FUNCTION IF EXISTS notify_oauth_token_changed()")
@@ -0,0 +1,64 @@
+"""Make users.is_admin a stored generated column derived from role.
+
+Every writer set ``is_admin = role IN (ADMIN, OWNER)`` by hand. Rows whose legacy flag was set
+on a non-admin role are promoted to ADMIN first so nobody loses access in the rebuild.
+
+Revision ID: 067
+Revises: 066
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "067"
+down_revision = "066"
+branch_labels = None
+depends_on = None
+
+
+def _is_admin_generated(conn) -> bool:
+    return bool(
+        conn.execute(
+            sa.text(
+                """
+                SELECT is_generated = 'ALWAYS' FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = 'users' AND column_name = 'is_admin'
+                """
+            )
+        ).scalar()
+    )
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    if "users" not in insp.get_table_names():
+        return
+    if _is_admin_generated(conn):
+        return
+    cols = {c["name"] for c in insp.get_columns("users")}
+    if "is_admin" in cols:
+        op.execute(
+            "UPDATE users SET role = 'ADMIN' WHERE is_admin AND role NOT IN ('OWNER', 'ADMIN')"
+        )
+        op.drop_column("users", "is_admin")
+    op.execute(
+        """
+        ALTER TABLE users
+        ADD COLUMN is_admin BOOLEAN GENERATED ALWAYS AS (role IN ('OWNER', 'ADMIN')) STORED NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    if "users" not in insp.get_table_names() or not _is_admin_generated(conn):
+        return
+    op.drop_column("users", "is_admin")
+    op.add_column(
+        "users",
+        sa.Column("is_admin", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+    )
+    op.execute("UPDATE users SET is_admin = role IN ('OWNER', 'ADMIN')")
@@ -0,0 +1,36 @@
+"""Index users (org_id, created_at DESC) for the org user list.
+
+GET /users filters by org_id and orders by created_at DESC; the composite index returns rows
+already sorted. (email, org_id) and (user_id, tab_name) lookups are already covered by the
+uq_users_email_org / uq_user_tab_permissions_user_tab unique constraints.
+
+Revision ID: 068
+Revises: 067
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "068"
+down_revision = "067"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    if "users" not in insp.get_table_names():
+        return
+    # CONCURRENTLY: no write lock on users while the index builds; needs its own transaction.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_users_org_id_created_at "
+            "ON users (org_id, created_at DESC)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_users_org_id_created_at")
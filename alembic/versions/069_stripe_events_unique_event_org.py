@@ -0,0 +1,48 @@
+"""Unique (stripe_event_id, org_id) on stripe_events for INSERT ... ON CONFLICT idempotency.
+
+Existing duplicates (concurrent Stripe retries under the old SELECT-then-INSERT) are collapsed
+first, keeping a processed row when there is one, else the earliest received.
+
+Revision ID: 069
+Revises: 068
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "069"
+down_revision = "068"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    insp = sa.inspect(conn)
+    if "stripe_events" not in insp.get_table_names():
+        return
+    op.execute(
+        """
+        DELETE FROM stripe_events se
+        USING (
+            SELECT id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY stripe_event_id, org_id
+                       ORDER BY processed DESC, received_at, id
+                   ) AS rn
+            FROM stripe_events
+        ) ranked
+        WHERE se.id = ranked.id AND ranked.rn > 1
+        """
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_stripe_events_event_org "
+            "ON stripe_events (stripe_event_id, org_id)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS uq_stripe_events_event_org")
@@ -0,0 +1,40 @@
+"""stripe_events.payload json -> jsonb (stored parsed; no re-parse on every read).
+
+Revision ID: 070
+Revises: 069
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "070"
+down_revision = "069"
+branch_labels = None
+depends_on = None
+
+
+def _payload_type(conn) -> str | None:
+    return conn.execute(
+        sa.text(
+            """
+            SELECT data_type FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'stripe_events'
+              AND column_name = 'payload'
+            """
+        )
+    ).scalar()
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if _payload_type(conn) != "json":
+        return
+    op.execute("ALTER TABLE stripe_events ALTER COLUMN payload TYPE jsonb USING payload::jsonb")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if _payload_type(conn) != "jsonb":
+        return
+    op.execute("ALTER TABLE stripe_events ALTER COLUMN payload TYPE json USING payload::json")
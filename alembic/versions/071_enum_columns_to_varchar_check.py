@@ -0,0 +1,90 @@
+"""audit_logs.event_type, campaigns.status, recommendations.status: PG enum -> varchar + CHECK.
+
+New members then need only a CHECK swap instead of ALTER TYPE ... ADD VALUE (which cannot run
+inside a transaction block on older Postgres). Stored values are unchanged: audit events keep
+their lowercase values, campaign/recommendation statuses their uppercase names.
+
+Revision ID: 071
+Revises: 070
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "071"
+down_revision = "070"
+branch_labels = None
+depends_on = None
+
+# table, column, enum type, allowed values, server default
+_COLUMNS = (
+    (
+        "audit_logs",
+        "event_type",
+        "auditeventtype",
+        (
+            "api_key_connected", "api_key_disconnected", "oauth_connected", "oauth_disconnected",
+            "token_accessed", "token_decrypted", "rate_limit_exceeded", "unauthorized_access",
+        ),
+        None,
+    ),
+    ("campaigns", "status", "campaignstatus", ("DRAFT", "ACTIVE", "PAUSED", "COMPLETED"), "DRAFT"),
+    (
+        "recommendations",
+        "status",
+        "recommendationstatus",
+        ("PENDING", "APPROVED", "REJECTED", "EXECUTED"),
+        "PENDING",
+    ),
+)
+
+
+def _udt_name(conn, table: str, column: str) -> str | None:
+    return conn.execute(
+        sa.text(
+            """
+            SELECT udt_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = :t AND column_name = :c
+            """
+        ),
+        {"t": table, "c": column},
+    ).scalar()
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    for table, column, type_name, values, default in _COLUMNS:
+        if _udt_name(conn, table, column) != type_name:
+            continue
+        allowed = ", ".join(f"'{v}'" for v in values)
+        if default:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR(32) USING {column}::text"
+        )
+        if default:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{default}'")
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT ck_{table}_{column} CHECK ({column} IN ({allowed}))"
+        )
+        op.execute(f"DROP TYPE IF EXISTS {type_name}")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for table, column, type_name, values, default in _COLUMNS:
+        if _udt_name(conn, table, column) != "varchar":
+            continue
+        allowed = ", ".join(f"'{v}'" for v in values)
+        op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS ck_{table}_{column}")
+        op.execute(f"CREATE TYPE {type_name} AS ENUM ({allowed})")
+        if default:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {type_name} USING {column}::{type_name}"
+        )
+        if default:
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT '{default}'::{type_name}"
+            )
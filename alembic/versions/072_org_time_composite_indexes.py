@@ -0,0 +1,79 @@
+"""Composite (org_id, <time> DESC) indexes for org-scoped time-series reads.
+
+Dashboards filter by org_id and range/order by time; one composite index returns the rows
+already sorted instead of a BitmapAnd of the org_id and time indexes. Each composite has
+org_id as its leading column, so the standalone org_id index on these tables is dropped.
+The standalone time indexes stay for cross-org sweeps (retention, worker requeue).
+
+Revision ID: 072
+Revises: 071
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "072"
+down_revision = "071"
+branch_labels = None
+depends_on = None
+
+# index name, table, key columns, INCLUDE columns, superseded org_id index
+_INDEXES = (
+    ("ix_audit_logs_org_created", "audit_logs", "org_id, created_at DESC", "event_type", "ix_audit_logs_org_id"),
+    ("ix_events_org_occurred", "events", "org_id, occurred_at DESC", None, "ix_events_org_id"),
+    (
+        "ix_stripe_payments_org_created",
+        "stripe_payments",
+        "org_id, created_at DESC",
+        "status, amount_cents",
+        "ix_stripe_payments_org_id",
+    ),
+    (
+        "ix_stripe_subscriptions_org_updated",
+        "stripe_subscriptions",
+        "org_id, updated_at DESC",
+        None,
+        "ix_stripe_subscriptions_org_id",
+    ),
+    (
+        "ix_client_check_ins_org_start",
+        "client_check_ins",
+        "org_id, start_time DESC",
+        None,
+        "ix_client_check_ins_org_id",
+    ),
+    (
+        "ix_stripe_treasury_transactions_org_created",
+        "stripe_treasury_transactions",
+        "org_id, created DESC",
+        None,
+        "ix_stripe_treasury_transactions_org_id",
+    ),
+)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    tables = set(sa.inspect(conn).get_table_names())
+    # CONCURRENTLY: no write lock while each index builds; needs its own transaction.
+    with op.get_context().autocommit_block():
+        for name, table, keys, include, org_index in _INDEXES:
+            if table not in tables:
+                continue
+            include_sql = f" INCLUDE ({include})" if include else ""
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({keys}){include_sql}"
+            )
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {org_index}")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    tables = set(sa.inspect(conn).get_table_names())
+    with op.get_context().autocommit_block():
+        for name, table, _keys, _include, org_index in _INDEXES:
+            if table not in tables:
+                continue
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {org_index} ON {table} (org_id)")
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
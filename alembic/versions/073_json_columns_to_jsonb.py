@@ -0,0 +1,83 @@
+"""json/text payload columns -> jsonb; GIN index for the events idempotency lookup.
+
+jsonb is stored decoded (no re-parse on read) and supports @> with a GIN index. audit_logs.details
+and client_check_ins.raw_event_data held JSON as text; rows that are not valid JSON (none are
+expected) become NULL rather than failing the migration.
+
+Revision ID: 073
+Revises: 072
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "073"
+down_revision = "072"
+branch_labels = None
+depends_on = None
+
+# (table, column, current type)
+_COLUMNS = (
+    ("events", "payload", "json"),
+    ("events", "event_metadata", "json"),
+    ("sessions", "utm", "json"),
+    ("sessions", "session_metadata", "json"),
+    ("recommendations", "payload", "json"),
+    ("stripe_payments", "raw_event", "json"),
+    ("stripe_subscriptions", "raw", "json"),
+    ("stripe_treasury_transactions", "raw_data", "json"),
+    ("audit_logs", "details", "text"),
+    ("client_check_ins", "raw_event_data", "text"),
+)
+
+
+def _data_type(conn, table: str, column: str) -> str | None:
+    return conn.execute(
+        sa.text(
+            """
+            SELECT data_type FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = :t AND column_name = :c
+            """
+        ),
+        {"t": table, "c": column},
+    ).scalar()
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION pg_temp.try_jsonb(value text) RETURNS jsonb AS $$
+        BEGIN
+            RETURN value::jsonb;
+        EXCEPTION WHEN others THEN
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql IMMUTABLE
+        """
+    )
+    for table, column, current in _COLUMNS:
+        if _data_type(conn, table, column) != current:
+            continue
+        using = f"{column}::jsonb" if current == "json" else f"pg_temp.try_jsonb({column})"
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE jsonb USING {using}")
+
+    if _data_type(conn, "events", "event_metadata") == "jsonb":
+        with op.get_context().autocommit_block():
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_events_event_metadata_gin "
+                "ON events USING gin (event_metadata jsonb_path_ops)"
+            )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_events_event_metadata_gin")
+    for table, column, previous in _COLUMNS:
+        if _data_type(conn, table, column) != "jsonb":
+            continue
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {previous} USING {column}::{previous}"
+        )
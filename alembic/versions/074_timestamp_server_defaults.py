@@ -0,0 +1,54 @@
+"""Server defaults (naive UTC) for created_at/updated_at on TimestampMixin tables.
+
+The ORM still sets both columns in Python; the defaults let raw SQL, COPY and Core bulk
+inserts omit them. SET DEFAULT only changes the catalog (no table rewrite).
+
+Revision ID: 074
+Revises: 073
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "074"
+down_revision = "073"
+branch_labels = None
+depends_on = None
+
+_TABLES = (
+    "clients",
+    "content_studio_knowledge_items",
+    "features",
+    "instagram_account_snapshots",
+    "instagram_media",
+    "org_kpi_benchmarks",
+    "org_kpi_daily_entries",
+    "organizations",
+    "organization_invitations",
+    "organization_tab_permissions",
+    "portal_shared_pads",
+    "portal_todos",
+    "stripe_treasury_transactions",
+    "user_tab_permissions",
+)
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for table in _TABLES:
+        if table not in existing:
+            continue
+        for column in ("created_at", "updated_at"):
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} SET DEFAULT timezone('utc', now())"
+            )
+
+
+def downgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for table in _TABLES:
+        if table not in existing:
+            continue
+        for column in ("created_at", "updated_at"):
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} DROP DEFAULT")
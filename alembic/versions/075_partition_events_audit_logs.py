@@ -0,0 +1,158 @@
+"""Partition events (occurred_at) and audit_logs (created_at) by month.
+
+Each table is rebuilt as a RANGE-partitioned table: monthly partitions from its oldest row
+through two months ahead plus a DEFAULT partition, rows copied over, then the original
+indexes and foreign keys recreated on the parent (and so on every partition). The primary
+key becomes (id, <time column>) because a partitioned table's unique keys must include the
+partition key. New months are created by the worker (app.services.table_partitions).
+
+The copy rewrites both tables under an exclusive lock; run during a quiet window.
+
+stripe_events is not partitioned: its unique (stripe_event_id, org_id) index is the ON CONFLICT
+target for idempotent webhook inserts and would have to include received_at.
+
+Revision ID: 075
+Revises: 074
+"""
+from __future__ import annotations
+
+import re
+from datetime import date
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "075"
+down_revision = "074"
+branch_labels = None
+depends_on = None
+
+_TABLES = (("events", "occurred_at"), ("audit_logs", "created_at"))
+_MONTHS_AHEAD = 2
+
+
+def _add_months(d: date, months: int) -> date:
+    index = d.year * 12 + d.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _is_partitioned(conn, table: str) -> bool:
+    return bool(
+        conn.execute(
+            sa.text(
+                "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+                "WHERE c.relname = :t AND c.relnamespace = current_schema()::regnamespace"
+            ),
+            {"t": table},
+        ).scalar()
+    )
+
+
+def _secondary_indexes(conn, table: str) -> list[tuple[str, str]]:
+    """(name, CREATE INDEX ...) for every non-primary-key index."""
+    rows = conn.execute(
+        sa.text(
+            """
+            SELECT i.relname, pg_get_indexdef(x.indexrelid)
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            WHERE x.indrelid = CAST(:t AS regclass) AND NOT x.indisprimary
+            """
+        ),
+        {"t": table},
+    ).fetchall()
+    return [(name, ddl) for name, ddl in rows]
+
+
+def _foreign_keys(conn, table: str) -> list[tuple[str, str]]:
+    return list(
+        conn.execute(
+            sa.text(
+                "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+                "WHERE conrelid = CAST(:t AS regclass) AND contype = 'f'"
+            ),
+            {"t": table},
+        ).fetchall()
+    )
+
+
+def _rebuild(conn, table: str, old: str, create_sql: str, pk_cols: str):
+    """Move ``table`` aside as ``old`` and create it again empty; returns what _finish restores."""
+    pkey = conn.execute(
+        sa.text(
+            "SELECT conname FROM pg_constraint "
+            "WHERE conrelid = CAST(:t AS regclass) AND contype = 'p'"
+        ),
+        {"t": table},
+    ).scalar()
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    if pkey:
+        op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT {pkey} TO {old}_pkey")
+    indexes = _secondary_indexes(conn, old)
+    fks = _foreign_keys(conn, old)
+    for name, _ddl in indexes:
+        op.execute(f"DROP INDEX {name}")
+
+    op.execute(create_sql)
+    op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY ({pk_cols})")
+    return indexes, fks
+
+
+def _finish(table: str, old: str, indexes, fks) -> None:
+    """Copy rows from ``old``, recreate its indexes and foreign keys on ``table``, drop ``old``."""
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    for _name, ddl in indexes:
+        # pg_get_indexdef names the source table ("ON [ONLY] public.<old>"); point it at the new one
+        op.execute(re.sub(rf" ON (ONLY )?(\w+\.)?{old} ", f" ON {table} ", ddl))
+    for name, definition in fks:
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+    op.execute(f"DROP TABLE {old}")
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    existing = set(sa.inspect(conn).get_table_names())
+    for table, column in _TABLES:
+        if table not in existing or _is_partitioned(conn, table):
+            continue
+        old = f"{table}_unpartitioned"
+        oldest = conn.execute(sa.text(f"SELECT min({column}) FROM {table}")).scalar()
+        indexes, fks = _rebuild(
+            conn,
+            table,
+            old,
+            f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE ({column})",
+            f"id, {column}",
+        )
+
+        today = date.today()
+        month = date(oldest.year, oldest.month, 1) if oldest else date(today.year, today.month, 1)
+        horizon = _add_months(date(today.year, today.month, 1), _MONTHS_AHEAD)
+        while month <= horizon:
+            upper = _add_months(month, 1)
+            op.execute(
+                f"CREATE TABLE {table}_{month:%Y_%m} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}')"
+            )
+            month = upper
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+        _finish(table, old, indexes, fks)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for table, _column in _TABLES:
+        if not _is_partitioned(conn, table):
+            continue
+        old = f"{table}_partitioned"
+        indexes, fks = _rebuild(
+            conn,
+            table,
+            old,
+            f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)",
+            "id",
+        )
+        # Dropping the parent drops every partition with it
+        _finish(table, old, indexes, fks)
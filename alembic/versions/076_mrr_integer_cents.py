@@ -0,0 +1,79 @@
+"""MRR columns numeric(10,2) dollars -> integer cents; widen Stripe amount columns to bigint.
+
+clients.estimated_mrr -> estimated_mrr_cents and stripe_subscriptions.mrr -> mrr_cents, matching
+the other money columns (amount_cents, lifetime_revenue_cents). stripe_payments.amount_cents and
+stripe_treasury_transactions.amount / balance_impact_cash become bigint.
+
+Revision ID: 076
+Revises: 075
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "076"
+down_revision = "075"
+branch_labels = None
+depends_on = None
+
+# (table, dollars column, cents column)
+_MRR_COLUMNS = (
+    ("clients", "estimated_mrr", "estimated_mrr_cents"),
+    ("stripe_subscriptions", "mrr", "mrr_cents"),
+)
+
+# (table, column)
+_BIGINT_COLUMNS = (
+    ("stripe_payments", "amount_cents"),
+    ("stripe_treasury_transactions", "amount"),
+    ("stripe_treasury_transactions", "balance_impact_cash"),
+)
+
+
+def _data_type(conn, table: str, column: str) -> str | None:
+    return conn.execute(
+        sa.text(
+            """
+            SELECT data_type FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = :t AND column_name = :c
+            """
+        ),
+        {"t": table, "c": column},
+    ).scalar()
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    for table, dollars, cents in _MRR_COLUMNS:
+        if _data_type(conn, table, dollars) != "numeric":
+            continue
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {dollars} DROP DEFAULT")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {dollars} TYPE integer "
+            f"USING round(COALESCE({dollars}, 0) * 100)::integer"
+        )
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {dollars} SET DEFAULT 0")
+        op.execute(f"ALTER TABLE {table} RENAME COLUMN {dollars} TO {cents}")
+
+    for table, column in _BIGINT_COLUMNS:
+        if _data_type(conn, table, column) == "integer":
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE bigint")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for table, column in _BIGINT_COLUMNS:
+        if _data_type(conn, table, column) == "bigint":
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE integer")
+
+    for table, dollars, cents in _MRR_COLUMNS:
+        if _data_type(conn, table, cents) != "integer":
+            continue
+        op.execute(f"ALTER TABLE {table} RENAME COLUMN {cents} TO {dollars}")
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {dollars} DROP DEFAULT")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {dollars} TYPE numeric(10, 2) "
+            f"USING ({dollars} / 100.0)::numeric(10, 2)"
+        )
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {dollars} SET DEFAULT 0")
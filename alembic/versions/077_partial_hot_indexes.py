@@ -0,0 +1,59 @@
+"""Partial indexes for the hot filters: unprocessed Stripe events, active clients, pending check-ins.
+
+Each predicate matches a small slice of its table, so the partial index stays small and cached
+where a full index would mostly hold rows the queries never want. ix_stripe_events_unprocessed
+replaces the full index on stripe_events.processed (almost every row is true).
+
+clients.lifecycle_state is a native enum that carries both label casings (migration 047), and
+Client binds uppercase, so the predicate lists both.
+
+Revision ID: 077
+Revises: 076
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "077"
+down_revision = "076"
+branch_labels = None
+depends_on = None
+
+# index name, table, key columns, predicate
+_INDEXES = (
+    ("ix_stripe_events_unprocessed", "stripe_events", "received_at", "processed = false"),
+    ("ix_clients_active", "clients", "org_id", "lifecycle_state IN ('active', 'ACTIVE')"),
+    (
+        "ix_client_check_ins_pending",
+        "client_check_ins",
+        "org_id, start_time",
+        "completed = false AND cancelled = false",
+    ),
+)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    tables = set(sa.inspect(conn).get_table_names())
+    # CONCURRENTLY: no write lock while each index builds; needs its own transaction.
+    with op.get_context().autocommit_block():
+        for name, table, keys, where in _INDEXES:
+            if table not in tables:
+                continue
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({keys}) WHERE {where}")
+        if "stripe_events" in tables:
+            op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_stripe_events_processed")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    tables = set(sa.inspect(conn).get_table_names())
+    with op.get_context().autocommit_block():
+        if "stripe_events" in tables:
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_stripe_events_processed "
+                "ON stripe_events (processed)"
+            )
+        for name, _table, _keys, _where in _INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
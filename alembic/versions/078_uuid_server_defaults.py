@@ -0,0 +1,34 @@
+"""gen_random_uuid() server default on the append-heavy id columns.
+
+The application writes time-ordered uuid7 ids (app.utils.ids) to events, audit_logs and
+stripe_events; the server default only covers raw SQL / COPY writers that omit id.
+gen_random_uuid() is built in from PostgreSQL 13.
+
+Revision ID: 078
+Revises: 077
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "078"
+down_revision = "077"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("events", "audit_logs", "stripe_events")
+
+
+def upgrade() -> None:
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    for table in _TABLES:
+        if table in tables:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT gen_random_uuid()")
+
+
+def downgrade() -> None:
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    for table in _TABLES:
+        if table in tables:
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT")
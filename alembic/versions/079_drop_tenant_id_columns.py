@@ -0,0 +1,42 @@
+"""Drop the deprecated tenant_id columns from clients, campaigns and recommendations.
+
+org_id replaced tenant_id in migration 004 and nothing reads or writes it any more. Dropping
+a column only marks it dead in the catalog; the space is reclaimed as rows are rewritten.
+
+Revision ID: 079
+Revises: 078
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "079"
+down_revision = "078"
+branch_labels = None
+depends_on = None
+
+_TABLES = ("clients", "campaigns", "recommendations")
+
+
+def _columns(conn, table: str) -> set[str]:
+    insp = sa.inspect(conn)
+    if table not in insp.get_table_names():
+        return set()
+    return {c["name"] for c in insp.get_columns(table)}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    for table in _TABLES:
+        if "tenant_id" in _columns(conn, table):
+            op.drop_column(table, "tenant_id")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for table in _TABLES:
+        columns = _columns(conn, table)
+        if columns and "tenant_id" not in columns:
+            op.add_column(table, sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=True))
@@ -0,0 +1,56 @@
+"""clients.program_end_date -> stored generated column (program_start_date + duration days).
+
+The end date was computed in Python on every write; the database now derives it, so it can
+never disagree with program_start_date / program_duration_days. Rows whose stored end date was
+not exactly start + duration days take the derived value. Re-adding the column rewrites the
+table under an ACCESS EXCLUSIVE lock.
+
+Revision ID: 080
+Revises: 079
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "080"
+down_revision = "079"
+branch_labels = None
+depends_on = None
+
+_EXPR = "program_start_date + make_interval(days => program_duration_days)"
+
+
+def _is_generated(conn) -> bool | None:
+    """None when the column is missing."""
+    value = conn.execute(
+        sa.text(
+            """
+            SELECT is_generated FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'clients'
+              AND column_name = 'program_end_date'
+            """
+        )
+    ).scalar()
+    return None if value is None else value == "ALWAYS"
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if _is_generated(conn) is not False:
+        return
+    op.execute("ALTER TABLE clients DROP COLUMN program_end_date")
+    op.execute(
+        f"ALTER TABLE clients ADD COLUMN program_end_date timestamp GENERATED ALWAYS AS ({_EXPR}) STORED"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_clients_program_end_date ON clients (program_end_date)")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if not _is_generated(conn):
+        return
+    op.execute("ALTER TABLE clients DROP COLUMN program_end_date")
+    op.execute("ALTER TABLE clients ADD COLUMN program_end_date timestamp")
+    op.execute(f"UPDATE clients SET program_end_date = {_EXPR} WHERE program_start_date IS NOT NULL")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_clients_program_end_date ON clients (program_end_date)")
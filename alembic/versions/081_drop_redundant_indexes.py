@@ -0,0 +1,59 @@
+"""Drop single-column indexes that another index already covers.
+
+- ix_client_check_ins_id: duplicate of the primary key.
+- ix_client_check_ins_event_id, ix_stripe_payments_stripe_id,
+  ix_stripe_subscriptions_stripe_subscription_id, ix_stripe_events_stripe_event_id: leading
+  column of the (external id, org_id) unique constraint on the same table.
+- ix_stripe_payments_status, ix_audit_logs_event_type, ix_events_event_name: low-cardinality
+  columns only ever filtered together with org_id and a time range, which the
+  (org_id, time) composites from migration 072 serve (status / event_type are INCLUDEd).
+
+Revision ID: 081
+Revises: 080
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "081"
+down_revision = "080"
+branch_labels = None
+depends_on = None
+
+# index name, table, column
+_INDEXES = (
+    ("ix_client_check_ins_id", "client_check_ins", "id"),
+    ("ix_client_check_ins_event_id", "client_check_ins", "event_id"),
+    ("ix_stripe_payments_stripe_id", "stripe_payments", "stripe_id"),
+    ("ix_stripe_payments_status", "stripe_payments", "status"),
+    ("ix_stripe_subscriptions_stripe_subscription_id", "stripe_subscriptions", "stripe_subscription_id"),
+    ("ix_stripe_events_stripe_event_id", "stripe_events", "stripe_event_id"),
+    ("ix_audit_logs_event_type", "audit_logs", "event_type"),
+    ("ix_events_event_name", "events", "event_name"),
+)
+
+# Partitioned in migration 075; CONCURRENTLY is not supported on partitioned indexes.
+_PARTITIONED = {"audit_logs", "events"}
+
+
+def upgrade() -> None:
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    for name, table, _column in _INDEXES:
+        if table in _PARTITIONED and table in tables:
+            op.execute(f"DROP INDEX IF EXISTS {name}")
+    with op.get_context().autocommit_block():
+        for name, table, _column in _INDEXES:
+            if table not in _PARTITIONED and table in tables:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def downgrade() -> None:
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    for name, table, column in _INDEXES:
+        if table in _PARTITIONED and table in tables:
+            op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column})")
+    with op.get_context().autocommit_block():
+        for name, table, column in _INDEXES:
+            if table not in _PARTITIONED and table in tables:
+                op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({column})")
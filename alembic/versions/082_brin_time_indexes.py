@@ -0,0 +1,65 @@
+"""Replace single-column BTREE indexes on append-only time columns with BRIN.
+
+Rows land in (roughly) time order, so a BRIN summary per 32 pages serves the time-range
+filters at a fraction of the size and per-insert maintenance of a BTREE. ORDER BY ... LIMIT
+paths keep their (org_id, time) BTREE composites (migration 072) and the stripe_events
+requeue sweep keeps ix_stripe_events_unprocessed (migration 077).
+
+Revision ID: 082
+Revises: 081
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "082"
+down_revision = "081"
+branch_labels = None
+depends_on = None
+
+# btree index dropped, brin index created, table, column
+_INDEXES = (
+    ("ix_audit_logs_created_at", "ix_audit_logs_created_brin", "audit_logs", "created_at"),
+    ("ix_events_occurred_at", "ix_events_occurred_brin", "events", "occurred_at"),
+    ("ix_stripe_events_received_at", "ix_stripe_events_received_brin", "stripe_events", "received_at"),
+    (
+        "ix_stripe_treasury_transactions_created",
+        "ix_stripe_treasury_transactions_created_brin",
+        "stripe_treasury_transactions",
+        "created",
+    ),
+)
+
+# Partitioned in migration 075; CONCURRENTLY is not supported on partitioned indexes.
+_PARTITIONED = {"audit_logs", "events"}
+
+_BRIN = "USING brin ({column}) WITH (pages_per_range = 32)"
+
+
+def upgrade() -> None:
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    for btree, brin, table, column in _INDEXES:
+        if table in _PARTITIONED and table in tables:
+            op.execute(f"CREATE INDEX IF NOT EXISTS {brin} ON {table} " + _BRIN.format(column=column))
+            op.execute(f"DROP INDEX IF EXISTS {btree}")
+    with op.get_context().autocommit_block():
+        for btree, brin, table, column in _INDEXES:
+            if table not in _PARTITIONED and table in tables:
+                op.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {brin} ON {table} " + _BRIN.format(column=column)
+                )
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {btree}")
+
+
+def downgrade() -> None:
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    for btree, brin, table, column in _INDEXES:
+        if table in _PARTITIONED and table in tables:
+            op.execute(f"CREATE INDEX IF NOT EXISTS {btree} ON {table} ({column})")
+            op.execute(f"DROP INDEX IF EXISTS {brin}")
+    with op.get_context().autocommit_block():
+        for btree, brin, table, column in _INDEXES:
+            if table not in _PARTITIONED and table in tables:
+                op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {btree} ON {table} ({column})")
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {brin}")
@@ -0,0 +1,85 @@
+"""Enforce one user_organizations row per (user_id, org_id) and one user_tab_permissions row
+per (user_id, tab_name).
+
+Migrations 019 and 007 only add these unique constraints when they create the table, so
+databases where the tables predate them can hold duplicates. Those are collapsed first
+(keeping the primary membership / most recently updated permission), then the unique index
+is built CONCURRENTLY and attached as the constraint. The single-column user_id indexes are
+dropped: the unique index leads with user_id.
+
+Revision ID: 083
+Revises: 082
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "083"
+down_revision = "082"
+branch_labels = None
+depends_on = None
+
+# constraint, table, columns, dedupe order (first row kept), redundant user_id index
+_CONSTRAINTS = (
+    (
+        "uq_user_organizations_user_org",
+        "user_organizations",
+        ("user_id", "org_id"),
+        "is_primary DESC, created_at, id",
+        "ix_user_organizations_user_id",
+    ),
+    (
+        "uq_user_tab_permissions_user_tab",
+        "user_tab_permissions",
+        ("user_id", "tab_name"),
+        "updated_at DESC, id",
+        "ix_user_tab_permissions_user_id",
+    ),
+)
+
+
+def _has_unique(insp, table: str, columns: tuple[str, ...]) -> bool:
+    wanted = list(columns)
+    if any(uc["column_names"] == wanted for uc in insp.get_unique_constraints(table)):
+        return True
+    return any(ix["unique"] and ix["column_names"] == wanted for ix in insp.get_indexes(table))
+
+
+def upgrade() -> None:
+    insp = sa.inspect(op.get_bind())
+    tables = set(insp.get_table_names())
+    missing = []
+    for name, table, columns, order, _ix in _CONSTRAINTS:
+        if table not in tables or _has_unique(insp, table, columns):
+            continue
+        cols = ", ".join(columns)
+        op.execute(
+            f"""
+            DELETE FROM {table} t
+            USING (
+                SELECT id, ROW_NUMBER() OVER (PARTITION BY {cols} ORDER BY {order}) AS rn
+                FROM {table}
+            ) ranked
+            WHERE t.id = ranked.id AND ranked.rn > 1
+            """
+        )
+        missing.append((name, table, cols))
+
+    with op.get_context().autocommit_block():
+        for name, table, cols in missing:
+            op.execute(f"CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({cols})")
+        for _name, table, _columns, _order, ix in _CONSTRAINTS:
+            if table in tables:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {ix}")
+
+    for name, table, _cols in missing:
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} UNIQUE USING INDEX {name}")
+
+
+def downgrade() -> None:
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    with op.get_context().autocommit_block():
+        for _name, table, _columns, _order, ix in _CONSTRAINTS:
+            if table in tables:
+                op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {ix} ON {table} (user_id)")
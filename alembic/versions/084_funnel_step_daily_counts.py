@@ -0,0 +1,55 @@
+"""funnel_step_daily_counts: daily event counts per (org, funnel, event_name).
+
+Rollup read by the org dashboard's funnel conversion metrics instead of counting raw events
+on every load. The worker refreshes recent days (app.services.funnel_rollup); this migration
+backfills the last 31 days.
+
+Revision ID: 084
+Revises: 083
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "084"
+down_revision = "083"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "funnel_step_daily_counts" not in tables:
+        op.create_table(
+            "funnel_step_daily_counts",
+            sa.Column("org_id", postgresql.UUID(as_uuid=True), nullable=False),
+            sa.Column(
+                "funnel_id",
+                postgresql.UUID(as_uuid=True),
+                sa.ForeignKey("funnels.id", ondelete="CASCADE"),
+                nullable=False,
+            ),
+            sa.Column("day", sa.Date(), nullable=False),
+            sa.Column("event_name", sa.String(), nullable=False),
+            sa.Column("event_count", sa.BigInteger(), nullable=False, server_default="0"),
+            sa.PrimaryKeyConstraint("org_id", "funnel_id", "day", "event_name"),
+        )
+    if "events" in tables:
+        op.execute(
+            """
+            INSERT INTO funnel_step_daily_counts (org_id, funnel_id, day, event_name, event_count)
+            SELECT e.org_id, e.funnel_id, (e.occurred_at)::date, e.event_name, COUNT(*)
+            FROM events e
+            JOIN funnels f ON f.id = e.funnel_id
+            WHERE e.occurred_at >= (timezone('utc', now()))::date - 30
+            GROUP BY e.org_id, e.funnel_id, (e.occurred_at)::date, e.event_name
+            ON CONFLICT (org_id, funnel_id, day, event_name)
+            DO UPDATE SET event_count = EXCLUDED.event_count
+            """
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS funnel_step_daily_counts")
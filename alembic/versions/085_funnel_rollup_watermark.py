@@ -0,0 +1,40 @@
+"""Watermark for the funnel_step_daily_counts refresh, and a BRIN index on events.received_at.
+
+The refresh recomputes every (org, funnel, day) bucket touched by events *received* since
+the last run (app.services.funnel_rollup), so backdated events are counted too. The
+singleton funnel_rollup_watermark row records how far it has got; the BRIN index keeps the
+received_at scan cheap (received_at is append-ordered).
+
+Revision ID: 085
+Revises: 084
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "085"
+down_revision = "084"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "funnel_rollup_watermark" not in tables:
+        op.create_table(
+            "funnel_rollup_watermark",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("refreshed_through", sa.DateTime(), nullable=True),
+        )
+    if "events" in tables:
+        # events is partitioned (migration 075): no CONCURRENTLY on the parent
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_events_received_brin ON events "
+            "USING brin (received_at) WITH (pages_per_range = 32)"
+        )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_events_received_brin")
+    op.execute("DROP TABLE IF EXISTS funnel_rollup_watermark")
@@ -0,0 +1,43 @@
+"""Fire oauth_token_changed on account_id updates too.
+
+The per-worker Stripe ``account_id -> org_id`` cache (platform webhook routing) is dropped on
+this NOTIFY; without account_id in the column list an account-only update kept routing
+webhooks to the stale org until the cache TTL expired. The trigger function from 066 is
+unchanged.
+
+Revision ID: 086
+Revises: 085
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "086"
+down_revision = "085"
+branch_labels = None
+depends_on = None
+
+
+def _create_trigger(columns: str) -> None:
+    op.execute("DROP TRIGGER IF EXISTS trg_oauth_tokens_notify_changed ON oauth_tokens")
+    op.execute(
+        f"""
+        CREATE TRIGGER trg_oauth_tokens_notify_changed
+        AFTER INSERT OR DELETE OR UPDATE OF {columns}
+        ON oauth_tokens
+        FOR EACH ROW EXECUTE FUNCTION notify_oauth_token_changed()
+        """
+    )
+
+
+def upgrade() -> None:
+    if "oauth_tokens" not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    _create_trigger("org_id, provider, account_id, access_token, expires_at")
+
+
+def downgrade() -> None:
+    if "oauth_tokens" not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    _create_trigger("org_id, provider, access_token, expires_at")
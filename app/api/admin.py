@@ -2,7 +2,7 @@
 Admin API endpoints for managing organizations, permissions, and global settings.
 Only accessible to admin/owner users.
 """
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, asc, and_, or_, text, exists
 from typing import List, Optional
@@ -34,6 +34,7 @@ from app.schemas.admin import (
     OrganizationFunnelCreate,
     OrganizationFunnelUpdate,
     FunnelConversionMetric,
+    RecentFunnel,
     FunnelStepConversion,
     GlobalHealthResponse,
     HealthTrendPeriod,
@@ -43,19 +44,29 @@ from app.schemas.admin import (
     LlmUsageTimeseriesResponse,
     LlmUsageTimeseriesPoint,
 )
+from app.schemas import from_orm_fast
+from app.services.funnel_rollup import funnel_step_counts
+from app.services.org_dashboard_cache import (
+    invalidate_org_dashboard,
+    org_dashboard_cache_get,
+    org_dashboard_cache_key,
+    org_dashboard_cache_set,
+)
 from app.schemas.funnel import Funnel as FunnelSchema
 from app.schemas.permission import (
     OrganizationTabPermission as OrgTabPermissionSchema,
     OrganizationTabPermissionCreate,
     OrganizationTabPermissionUpdate
 )
-from app.models.organization_tab_permission import OrganizationTabPermission
+from app.models.organization_tab_permission import OrganizationTabPermission, upsert_org_tab_permission
 from app.models.portal_todo import PortalTodo
 from app.models.org_kpi_daily_entry import OrgKpiDailyEntry
 from app.models.org_kpi_benchmark import OrgKpiBenchmark
 from app.schemas.kpi import KpiSnapshotResponse
 from app.services.kpi_bottleneck_service import detect_bottlenecks, utcnow
 from app.services.kpi_compute import build_kpi_snapshot
+from app.services.org_seat_cache import invalidate_org_seat_limit
+from app.services.tab_permission_cache import invalidate_org_tab_permissions
 from app.services.kpi_integration_sync import (
     has_calendar_source,
     has_payment_source,
@@ -341,6 +352,97 @@ def _org_manual_cash_all_time(db: Session, org_id: UUID) -> float:
     return float(cents or 0) / 100.0
 
 
+def _build_funnel_conversion_metrics(
+    funnels: List[Funnel],
+    steps_by_funnel: dict,
+    step_counts: dict,
+    visitors: dict,
+) -> List[FunnelConversionMetric]:
+    """
+    FunnelConversionMetric per funnel from prefetched data: ``steps_by_funnel`` maps funnel id
+    to its steps in order; ``step_counts`` / ``visitors`` map (funnel id, event name) to the
+    event count / distinct visitors in the window.
+    """
+    metrics: List[FunnelConversionMetric] = []
+    for funnel in funnels:
+        funnel_steps = steps_by_funnel.get(funnel.id, [])
+        step_counts_list: List[FunnelStepConversion] = []
+        previous_count: Optional[int] = None
+        for step in funnel_steps:
+            count = step_counts.get((funnel.id, step.event_name), 0)
+            conversion_rate = None
+            if previous_count is not None and previous_count > 0:
+                conversion_rate = (count / previous_count) * 100.0
+            step_counts_list.append(FunnelStepConversion(
+                step_order=step.step_order,
+                label=step.label,
+                event_name=step.event_name,
+                count=count,
+                conversion_rate=conversion_rate
+            ))
+            previous_count = count
+        total_visitors = total_conversions = 0
+        if funnel_steps:
+            # COUNT(DISTINCT visitor_id) already skips events without a visitor_id
+            total_visitors = visitors.get((funnel.id, funnel_steps[0].event_name), 0)
+            total_conversions = visitors.get((funnel.id, funnel_steps[-1].event_name), 0)
+        overall_conversion_rate = (total_conversions / total_visitors * 100.0) if total_visitors > 0 else 0.0
+        metrics.append(FunnelConversionMetric(
+            funnel_id=funnel.id,
+            funnel_name=funnel.name or "Unnamed",
+            total_visitors=total_visitors,
+            total_conversions=total_conversions,
+            overall_conversion_rate=overall_conversion_rate,
+            step_counts=step_counts_list
+        ))
+    return metrics
+
+
+def _org_funnel_conversion_metrics(
+    db: Session,
+    org_id: UUID,
+    funnels: List[Funnel],
+    start_date: datetime,
+    end_date: datetime,
+) -> List[FunnelConversionMetric]:
+    """
+    Per-funnel step counts and visitor conversion for the dashboard: all steps for the org,
+    step counts from the daily rollup (app.services.funnel_rollup, whole UTC days from
+    ``start_date``), and distinct visitors of each funnel's first/last step from events.
+    """
+    if not funnels:
+        return []
+    steps_by_funnel: dict = {}
+    steps = db.query(FunnelStep).filter(
+        FunnelStep.org_id == org_id,
+        FunnelStep.funnel_id.in_([f.id for f in funnels]),
+    ).order_by(FunnelStep.funnel_id, asc(FunnelStep.step_order)).all()
+    for step in steps:
+        steps_by_funnel.setdefault(step.funnel_id, []).append(step)
+
+    step_counts: dict = {}
+    visitors: dict = {}
+    if steps:
+        step_counts = funnel_step_counts(
+            db, org_id, steps_by_funnel, {step.event_name for step in steps}, start_date.date()
+        )
+        edge_names = {s.event_name for fs in steps_by_funnel.values() for s in (fs[0], fs[-1])}
+        rows = db.query(
+            Event.funnel_id,
+            Event.event_name,
+            func.count(func.distinct(Event.visitor_id)),
+        ).filter(
+            Event.org_id == org_id,
+            Event.funnel_id.in_(list(steps_by_funnel)),
+            Event.event_name.in_(edge_names),
+            Event.occurred_at >= start_date,
+            Event.occurred_at <= end_date,
+        ).group_by(Event.funnel_id, Event.event_name).all()
+        visitors = {(funnel_id, name): n for funnel_id, name, n in rows}
+
+    return _build_funnel_conversion_metrics(funnels, steps_by_funnel, step_counts, visitors)
+
+
 def _global_stripe_rev_month_post_onboarding(
     db: Session,
     ps_naive: datetime,
@@ -418,7 +520,7 @@ def list_organizations(
 
 # Invitation-based org onboarding (only way to create new orgs; uses BREVO_API_KEY)
 @router.post("/organizations/invite", response_model=dict, status_code=status.HTTP_201_CREATED)
-@rate_limit(max_requests=10, window_seconds=900)  # 10 org invites per 15 min per admin
+@rate_limit(max_requests=10, window_seconds=900, user_kw="admin_user")  # 10 org invites per 15 min per admin
 def invite_organization(
     body: InviteOrgAdminRequest,
     request: Request,
@@ -577,6 +679,7 @@ def update_organization(
         org.booking_url = (org_data.booking_url or "").strip() or None
 
     db.commit()
+    invalidate_org_seat_limit(org.id)
     db.refresh(org)
     return org
 
@@ -762,7 +865,7 @@ def get_global_health(
         StripeSubscription.status.in_(["active", "trialing"])
     ).scalar() or 0
 
-    mrr_sum = db.query(func.sum(StripeSubscription.mrr)).filter(
+    mrr_sum = db.query(func.sum(StripeSubscription.mrr_cents) / 100.0).filter(
         StripeSubscription.status.in_(["active", "trialing"])
     ).scalar()
     total_mrr_usd = float(mrr_sum) if mrr_sum is not None else 0.0
@@ -1151,7 +1254,23 @@ def get_organization_dashboard(
     Get dashboard summary for a specific organization.
     Only accessible to admins in the main org.
     Optional range/scope filters Terminal-style KPIs (combined cash, AOV, calendar rates).
+    Served from a 60s cache keyed by (org, range, scope); see app.services.org_dashboard_cache.
     """
+    cache_key = org_dashboard_cache_key(org_id, range_days, scope)
+    body = org_dashboard_cache_get(cache_key)
+    if body is None:
+        summary = _build_organization_dashboard(org_id, range_days, scope, db)
+        body = summary.model_dump_json().encode()
+        org_dashboard_cache_set(cache_key, body)
+    return Response(content=body, media_type="application/json")
+
+
+def _build_organization_dashboard(
+    org_id: UUID,
+    range_days: int,
+    scope: Optional[str],
+    db: Session,
+) -> OrganizationDashboardSummary:
     # Verify organization exists
     org = db.query(Organization).filter(Organization.id == org_id).first()
     if not org:
@@ -1224,7 +1343,7 @@ def get_organization_dashboard(
     
     # Stripe stats (align with Stripe dashboard: active + trialing for MRR/subs; revenue from Treasury or Payment)
     thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    total_mrr_result = db.query(func.sum(StripeSubscription.mrr)).filter(
+    total_mrr_result = db.query(func.sum(StripeSubscription.mrr_cents) / 100.0).filter(
         StripeSubscription.org_id == org_id,
         StripeSubscription.status.in_(["active", "trialing"])
     ).scalar()
@@ -1270,84 +1389,17 @@ def get_organization_dashboard(
         Funnel.org_id == org_id
     ).order_by(desc(Funnel.created_at)).all()
     all_funnels_data = [
-        {
-            "id": str(f.id),
-            "name": f.name,
-            "domain": f.domain,
-            "slug": f.slug,
-            "created_at": f.created_at.isoformat() if f.created_at else None
-        }
+        RecentFunnel(id=f.id, name=f.name, domain=f.domain, slug=f.slug, created_at=f.created_at)
         for f in all_funnels
     ]
 
-    # Funnel conversion metrics (last 30 days, same logic as funnel analytics)
-    funnel_conversion_metrics: List[FunnelConversionMetric] = []
+    # Funnel conversion metrics (last 30 days). Step counts come from the daily rollup (whole
+    # UTC days, refreshed by the worker), so they can differ slightly from /funnels analytics,
+    # which counts raw events over the exact window.
     range_days = 30
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=range_days)
-    for funnel in all_funnels:
-        steps = db.query(FunnelStep).filter(
-            FunnelStep.funnel_id == funnel.id,
-            FunnelStep.org_id == org_id
-        ).order_by(asc(FunnelStep.step_order)).all()
-        if not steps:
-            funnel_conversion_metrics.append(FunnelConversionMetric(
-                funnel_id=funnel.id,
-                funnel_name=funnel.name or "Unnamed",
-                total_visitors=0,
-                total_conversions=0,
-                overall_conversion_rate=0.0,
-                step_counts=[]
-            ))
-            continue
-        step_counts_list: List[FunnelStepConversion] = []
-        previous_count: Optional[int] = None
-        for step in steps:
-            count = db.query(func.count(Event.id)).filter(
-                Event.funnel_id == funnel.id,
-                Event.org_id == org_id,
-                Event.event_name == step.event_name,
-                Event.occurred_at >= start_date,
-                Event.occurred_at <= end_date
-            ).scalar() or 0
-            conversion_rate = None
-            if previous_count is not None and previous_count > 0:
-                conversion_rate = (count / previous_count) * 100.0
-            step_counts_list.append(FunnelStepConversion(
-                step_order=step.step_order,
-                label=step.label,
-                event_name=step.event_name,
-                count=count,
-                conversion_rate=conversion_rate
-            ))
-            previous_count = count
-        first_step = steps[0]
-        total_visitors = db.query(func.count(func.distinct(Event.visitor_id))).filter(
-            Event.funnel_id == funnel.id,
-            Event.org_id == org_id,
-            Event.event_name == first_step.event_name,
-            Event.occurred_at >= start_date,
-            Event.occurred_at <= end_date,
-            Event.visitor_id.isnot(None)
-        ).scalar() or 0
-        last_step = steps[-1]
-        total_conversions = db.query(func.count(func.distinct(Event.visitor_id))).filter(
-            Event.funnel_id == funnel.id,
-            Event.org_id == org_id,
-            Event.event_name == last_step.event_name,
-            Event.occurred_at >= start_date,
-            Event.occurred_at <= end_date,
-            Event.visitor_id.isnot(None)
-        ).scalar() or 0
-        overall_conversion_rate = (total_conversions / total_visitors * 100.0) if total_visitors > 0 else 0.0
-        funnel_conversion_metrics.append(FunnelConversionMetric(
-            funnel_id=funnel.id,
-            funnel_name=funnel.name or "Unnamed",
-            total_visitors=total_visitors,
-            total_conversions=total_conversions,
-            overall_conversion_rate=overall_conversion_rate,
-            step_counts=step_counts_list
-        ))
+    funnel_conversion_metrics = _org_funnel_conversion_metrics(db, org_id, all_funnels, start_date, end_date)
 
     # Owner modal: cash + monthly coaching metrics since org onboarding (calendar months)
     uses_treasury = treasury_count is not None
@@ -1620,7 +1672,7 @@ def list_organization_funnels(
         Funnel.org_id == org_id
     ).order_by(desc(Funnel.created_at)).all()
     
-    return [FunnelSchema.model_validate(f, from_attributes=True) for f in funnels]
+    return [from_orm_fast(FunnelSchema, f) for f in funnels]
 
 
 @router.post("/organizations/{org_id}/funnels", response_model=FunnelSchema, status_code=status.HTTP_201_CREATED)
@@ -1662,6 +1714,7 @@ def create_organization_funnel(
     )
     db.add(funnel)
     db.commit()
+    invalidate_org_dashboard(org_id)
     db.refresh(funnel)
     
     return funnel
@@ -1733,6 +1786,7 @@ def update_organization_funnel(
         funnel.env = funnel_data.env
     
     db.commit()
+    invalidate_org_dashboard(org_id)
     db.refresh(funnel)
     return funnel
 
@@ -1758,6 +1812,7 @@ def delete_organization_funnel(
     
     db.delete(funnel)
     db.commit()
+    invalidate_org_dashboard(org_id)
     return None
 
 
@@ -1797,17 +1852,7 @@ def list_organization_tab_permissions(
                 row = permission_map.get(legacy)
         if row is not None:
             # Prefer current tab_name in the response even when reading a legacy row
-            data = OrgTabPermissionSchema.model_validate(row, from_attributes=True)
-            result.append(
-                OrgTabPermissionSchema(
-                    id=data.id,
-                    org_id=data.org_id,
-                    tab_name=tab,
-                    enabled=data.enabled,
-                    created_at=data.created_at,
-                    updated_at=data.updated_at,
-                )
-            )
+            result.append(from_orm_fast(OrgTabPermissionSchema, row, tab_name=tab))
         else:
             # Return default (enabled) for tabs without explicit permissions
             result.append(OrgTabPermissionSchema(
@@ -1843,27 +1888,10 @@ def create_organization_tab_permission(
             detail="Organization not found"
         )
     
-    # Check if permission already exists
-    existing = db.query(OrganizationTabPermission).filter(
-        OrganizationTabPermission.org_id == org_id,
-        OrganizationTabPermission.tab_name == permission_data.tab_name
-    ).first()
-    
-    if existing:
-        existing.enabled = permission_data.enabled
-        db.commit()
-        db.refresh(existing)
-        return OrgTabPermissionSchema.model_validate(existing, from_attributes=True)
-    
-    # Create new permission
-    permission = OrganizationTabPermission(
-        org_id=org_id,
-        tab_name=permission_data.tab_name,
-        enabled=permission_data.enabled
-    )
-    db.add(permission)
+    # Create or update in one statement (ON CONFLICT on uq_org_tab_permissions_org_tab)
+    permission = upsert_org_tab_permission(db, org_id, permission_data.tab_name, permission_data.enabled)
     db.commit()
-    db.refresh(permission)
+    invalidate_org_tab_permissions(org_id)
     return OrgTabPermissionSchema.model_validate(permission, from_attributes=True)
 
 
@@ -1889,26 +1917,10 @@ def update_organization_tab_permission(
             detail="Organization not found"
         )
     
-    permission = db.query(OrganizationTabPermission).filter(
-        OrganizationTabPermission.org_id == org_id,
-        OrganizationTabPermission.tab_name == tab_name
-    ).first()
-    
-    # If permission doesn't exist, create it
-    if not permission:
-        permission = OrganizationTabPermission(
-            org_id=org_id,
-            tab_name=tab_name,
-            enabled=permission_update.enabled if permission_update.enabled is not None else True
-        )
-        db.add(permission)
-    else:
-        # Update existing permission
-        if permission_update.enabled is not None:
-            permission.enabled = permission_update.enabled
-    
+    # Creates the row (enabled by default) if it doesn't exist, in one statement
+    permission = upsert_org_tab_permission(db, org_id, tab_name, permission_update.enabled)
     db.commit()
-    db.refresh(permission)
+    invalidate_org_tab_permissions(org_id)
     return OrgTabPermissionSchema.model_validate(permission, from_attributes=True)
 
 
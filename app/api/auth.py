@@ -690,7 +690,6 @@ def accept_invitation(
     Returns access_token when a new account is created or when existing user accepts (so frontend can set cookie and switch org).
     """
     from app.models.organization_invitation import OrganizationInvitation
-    from app.models.user import UserRole
 
     token = (body.token or "").strip()
     if not token:
@@ -742,8 +741,8 @@ def accept_invitation(
         org_user_id = uuid.uuid4()
         db.execute(
             text("""
-                INSERT INTO users (id, org_id, email, hashed_password, role, is_admin, created_at)
-                VALUES (:id, :org_id, :email, :hashed_password, CAST(:role AS userrole), :is_admin, NOW())
+                INSERT INTO users (id, org_id, email, hashed_password, role, created_at)
+                VALUES (:id, :org_id, :email, :hashed_password, CAST(:role AS userrole), NOW())
             """),
             {
                 "id": org_user_id,
@@ -751,7 +750,6 @@ def accept_invitation(
                 "email": email_normalized,
                 "hashed_password": existing_user.hashed_password,
                 "role": userrole_bind_value(user_role),
-                "is_admin": user_role in (UserRole.ADMIN, UserRole.OWNER),
             },
         )
         db.add(
@@ -813,8 +811,8 @@ def accept_invitation(
     new_user_id = uuid.uuid4()
     db.execute(
         text("""
-            INSERT INTO users (id, org_id, email, hashed_password, role, is_admin, created_at)
-            VALUES (:id, :org_id, :email, :hashed_password, CAST(:role AS userrole), :is_admin, NOW())
+            INSERT INTO users (id, org_id, email, hashed_password, role, created_at)
+            VALUES (:id, :org_id, :email, :hashed_password, CAST(:role AS userrole), NOW())
         """),
         {
             "id": new_user_id,
@@ -822,7 +820,6 @@ def accept_invitation(
             "email": email_normalized,
             "hashed_password": get_password_hash(password),
             "role": userrole_bind_value(user_role),
-            "is_admin": (user_role in (UserRole.ADMIN, UserRole.OWNER)),
         },
     )
     uo = UserOrganization(
@@ -34,7 +34,6 @@ from app.models.organization import Organization
 from app.models.organization_invitation import OrganizationInvitation
 from app.models.user import (
     User,
-    UserRole,
     parse_user_role_from_api,
     role_to_api,
     userrole_bind_value,
@@ -143,8 +142,8 @@ def _create_user_from_invite(
     db.execute(
         text(
             """
-            INSERT INTO users (id, org_id, email, hashed_password, role, is_admin, created_at, google_id, google_email)
-            VALUES (:id, :org_id, :email, :hashed_password, CAST(:role AS userrole), :is_admin, NOW(), :google_id, :google_email)
+            INSERT INTO users (id, org_id, email, hashed_password, role, created_at, google_id, google_email)
+            VALUES (:id, :org_id, :email, :hashed_password, CAST(:role AS userrole), NOW(), :google_id, :google_email)
             """
         ),
         {
@@ -153,7 +152,6 @@ def _create_user_from_invite(
             "email": email_normalized,
             "hashed_password": hashed_password,
             "role": userrole_bind_value(user_role),
-            "is_admin": user_role in (UserRole.ADMIN, UserRole.OWNER),
             "google_id": google_id,
             "google_email": google_email,
         },
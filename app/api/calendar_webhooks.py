@@ -163,7 +163,7 @@ def _upsert_check_in(
         if getattr(existing, "sale_closed", None) is None and sale_closed is not None:
             existing.sale_closed = sale_closed
         existing.updated_at = datetime.now(timezone.utc)
-        existing.raw_event_data = json.dumps(raw_payload)
+        existing.raw_event_data = raw_payload
         return existing, False
 
     row = ClientCheckIn(
@@ -186,7 +186,7 @@ def _upsert_check_in(
         no_show=False,
         is_sales_call=is_sales_call,
         sale_closed=sale_closed,
-        raw_event_data=json.dumps(raw_payload),
+        raw_event_data=raw_payload,
     )
     db.add(row)
     return row, True
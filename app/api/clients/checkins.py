@@ -388,7 +388,9 @@ def get_check_in(
         try:
             import json as _json
 
-            raw = _json.loads(check_in.raw_event_data)
+            raw = check_in.raw_event_data
+            if isinstance(raw, str):
+                raw = _json.loads(raw)
             if isinstance(raw, dict):
                 u = raw.get("uid")
                 if not u and isinstance(raw.get("data"), dict):
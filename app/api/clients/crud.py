@@ -154,23 +154,16 @@ def create_client(
     # CRITICAL: Set org_id from selected org (token)
     client_dict = client_data.model_dump()
     client_dict['org_id'] = org_id
+    # program_end_date is generated (start + duration); a submitted end date sets the duration
+    program_end_date = client_dict.pop('program_end_date', None)
     client = Client(**client_dict)
     
-    # Update program dates if program fields are set
-    # Handle end_date -> duration calculation
-    if client.program_start_date and client.program_end_date:
-        # Calculate duration from start and end dates
-        duration = (client.program_end_date - client.program_start_date).days
-        if duration > 0:
-            client.program_duration_days = duration
-        else:
-            # Invalid: end date before start date
-            client.program_end_date = None
-            client.program_duration_days = None
+    if client.program_start_date and program_end_date:
+        # End date before start date clears the duration
+        client.set_program_end_date(program_end_date)
     
-    # Update program dates (handles duration -> end_date if needed)
-    if client.program_start_date or client.program_duration_days or client.program_end_date:
-        client.update_program_dates()
+    if client.program_start_date or client.program_duration_days:
+        client.normalize_program_dates()
         # Calculate initial progress
         client.program_progress_percent = client.calculate_progress()
     
@@ -314,6 +307,8 @@ def update_client(
 
         # Apply remaining scalar updates
         for field, value in update_data.items():
+            if field == 'program_end_date':
+                continue  # Generated column; applied below as program_duration_days
             setattr(client, field, value)
         
         # Handle program fields updates
@@ -322,19 +317,16 @@ def update_client(
             # Clearing program - also clear related fields
             client.program_start_date = None
             client.program_duration_days = None
-            client.program_end_date = None
             client.program_progress_percent = None
             print(f"[UPDATE_CLIENT] Cleared program fields for client {client.id}")
         elif 'program_end_date' in update_data and update_data['program_end_date'] is None:
             # Clearing program end date - also clear related fields
-            client.program_end_date = None
             client.program_duration_days = None
             client.program_progress_percent = None
             print(f"[UPDATE_CLIENT] Cleared program end date for client {client.id}")
         elif 'program_duration_days' in update_data and update_data['program_duration_days'] is None:
             # Clearing program duration - also clear related fields
             client.program_duration_days = None
-            client.program_end_date = None
             client.program_progress_percent = None
             print(f"[UPDATE_CLIENT] Cleared program duration for client {client.id}")
         elif 'program_start_date' in update_data or 'program_end_date' in update_data or 'program_duration_days' in update_data:
@@ -345,20 +337,12 @@ def update_client(
                     end_date = update_data['program_end_date']
                     if isinstance(end_date, str):
                         end_date = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-                    client.program_end_date = end_date
-                    
-                    # Calculate duration if start date exists
-                    if client.program_start_date:
-                        duration = (client.program_end_date - client.program_start_date).days
-                        if duration > 0:
-                            client.program_duration_days = duration
-                        else:
-                            print(f"[UPDATE_CLIENT] Warning: End date is before start date for client {client.id}")
-                            client.program_end_date = None
-                            client.program_duration_days = None
+                    # Stored as duration from the start date (program_end_date is generated)
+                    client.set_program_end_date(end_date)
+                    if client.program_start_date and not client.program_duration_days:
+                        print(f"[UPDATE_CLIENT] Warning: End date is before start date for client {client.id}")
                 
-                # Update program dates (this handles duration -> end_date calculation if needed)
-                client.update_program_dates()
+                client.normalize_program_dates()
                 
                 # Recalculate progress
                 progress = client.calculate_progress()
@@ -380,7 +364,6 @@ def update_client(
         if not client.program_start_date or not client.program_duration_days:
             client.program_progress_percent = None
             if not client.program_start_date:
-                client.program_end_date = None
                 client.program_duration_days = None
         
         schedule_dead_llm_refresh = False
@@ -519,7 +502,6 @@ def merge_clients(
     if best_program.program_progress_percent is not None:
         keep.program_start_date = best_program.program_start_date
         keep.program_duration_days = best_program.program_duration_days
-        keep.program_end_date = best_program.program_end_date
         keep.program_progress_percent = best_program.program_progress_percent
 
     merge_client_meta_from_duplicates(keep, to_remove)
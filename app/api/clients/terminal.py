@@ -218,7 +218,7 @@ def get_terminal_summary(
     # --- MRR/ARR: from Stripe subscriptions (active/trialing) or fallback to client estimated_mrr ---
     current_mrr = 0.0
     mrr_result = (
-        db.query(func.coalesce(func.sum(StripeSubscription.mrr), 0))
+        db.query(func.coalesce(func.sum(StripeSubscription.mrr_cents) / 100.0, 0))
         .filter(
             StripeSubscription.org_id == org_id,
             StripeSubscription.status.in_(["active", "trialing"]),
@@ -139,7 +139,7 @@ def get_encryption_status(
             token_stats["by_provider"][provider] = token_stats["by_provider"].get(provider, 0) + 1
             
             # Check if token has version prefix (new format)
-            if token.access_token and token.access_token.startswith('v'):
+            if token.access_token and token.access_token.startswith(('v', 'g')):
                 token_stats["encrypted_count"] += 1
         
         return {
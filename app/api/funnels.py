@@ -5,8 +5,7 @@ Provides CRUD for funnels, steps, event ingestion, analytics, and health monitor
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi import Request
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc, asc, text, cast
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import func, and_, or_, desc, asc, text
 from typing import List, Optional, Union
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
@@ -21,6 +20,7 @@ from app.models.event import Event
 from app.models.session import Session
 from app.models.event_error import EventError
 from app.models.client import Client
+from app.schemas import from_orm_fast
 from app.schemas.funnel import (
     Funnel as FunnelSchema,
     FunnelCreate,
@@ -42,6 +42,7 @@ from app.schemas.funnel import (
 from app.models.client import find_client_by_email, find_client_by_phone
 from app.models.client import LifecycleState
 from app.services.health_score_cache_service import invalidate_health_score_cache
+from app.services.org_dashboard_cache import invalidate_org_dashboard
 
 router = APIRouter()
 
@@ -95,6 +96,7 @@ def create_funnel(
     funnel = Funnel(**funnel_dict)
     db.add(funnel)
     db.commit()
+    invalidate_org_dashboard(org_id)
     db.refresh(funnel)
     return funnel
 
@@ -126,12 +128,11 @@ def get_funnel(
         FunnelStep.org_id == org_id
     ).order_by(asc(FunnelStep.step_order)).all()
     
-    funnel_dict = {
-        **FunnelSchema.model_validate(funnel, from_attributes=True).model_dump(),
-        "steps": [FunnelStepSchema.model_validate(step, from_attributes=True) for step in steps]
-    }
-    
-    return FunnelWithSteps(**funnel_dict)
+    return from_orm_fast(
+        FunnelWithSteps,
+        funnel,
+        steps=[from_orm_fast(FunnelStepSchema, step) for step in steps],
+    )
 
 
 @router.patch("/{funnel_id}", response_model=FunnelSchema)
@@ -175,6 +176,7 @@ def update_funnel(
     
     funnel.updated_at = datetime.utcnow()
     db.commit()
+    invalidate_org_dashboard(org_id)
     db.refresh(funnel)
     return funnel
 
@@ -202,6 +204,7 @@ def delete_funnel(
     
     db.delete(funnel)
     db.commit()
+    invalidate_org_dashboard(org_id)
     return None
 
 
@@ -236,6 +239,7 @@ def create_funnel_step(
     step = FunnelStep(**step_dict)
     db.add(step)
     db.commit()
+    invalidate_org_dashboard(org_id)
     db.refresh(step)
     return step
 
@@ -270,6 +274,7 @@ def update_funnel_step(
     
     step.updated_at = datetime.utcnow()
     db.commit()
+    invalidate_org_dashboard(org_id)
     db.refresh(step)
     return step
 
@@ -299,6 +304,7 @@ def delete_funnel_step(
     
     db.delete(step)
     db.commit()
+    invalidate_org_dashboard(org_id)
     return None
 
 
@@ -341,6 +347,7 @@ def reorder_funnel_steps(
             step.updated_at = datetime.utcnow()
     
     db.commit()
+    invalidate_org_dashboard(org_id)
     
     # Return updated steps
     steps = db.query(FunnelStep).filter(
@@ -348,7 +355,7 @@ def reorder_funnel_steps(
         FunnelStep.org_id == org_id
     ).order_by(asc(FunnelStep.step_order)).all()
     
-    return [FunnelStepSchema.model_validate(step, from_attributes=True) for step in steps]
+    return [from_orm_fast(FunnelStepSchema, step) for step in steps]
 
 
 # Event Ingestion - Public endpoint for client-side tracking
@@ -395,11 +402,11 @@ def ingest_event(
                     detail="Client not found"
                 )
         
-        # Check idempotency if key provided (event_metadata is PG json, not jsonb — cast for @>)
+        # Check idempotency if key provided (@> on jsonb uses ix_events_event_metadata_gin)
         if event_data.idempotency_key:
             existing = db.query(Event).filter(
                 Event.org_id == org_id,
-                cast(Event.event_metadata, JSONB).contains(
+                Event.event_metadata.contains(
                     {"idempotency_key": event_data.idempotency_key}
                 ),
             ).first()
@@ -1,4 +1,6 @@
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status, Request, Body
+from fastapi.responses import ORJSONResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 from sqlalchemy import func, case, and_, exists, or_
 from app.db.session import get_db
@@ -11,6 +13,7 @@ from app.schemas.integration import (
 )
 from app.schemas.brevo import (
     BrevoContactCreate, BrevoContactUpdate, BrevoContactResponse, BrevoContactList,
+    BrevoContactResponseListAdapter, BrevoListResponseListAdapter,
     BrevoListCreate, BrevoListResponse, BrevoListList,
     BrevoMoveContactsRequest, BrevoAddContactsToListRequest, BrevoRemoveContactsFromListRequest, BrevoBulkDeleteContactsRequest, BrevoCreateClientsFromContactsRequest, BrevoListContactsRequest,
     BrevoSendEmailRequest, BrevoSendEmailResponse, BrevoEmailRecipient,
@@ -1650,7 +1653,51 @@ def get_brevo_contact(
         )
 
 
-@router.get("/brevo/contacts", response_model=BrevoContactList)
+def _brevo_contact_list_response(data: dict, offset: int, limit: int, label: str) -> ORJSONResponse:
+    """
+    Brevo contacts page -> BrevoContactList JSON.
+
+    The page is validated and dumped with one TypeAdapter call each and handed straight to
+    orjson, skipping FastAPI's response_model re-validation and jsonable_encoder pass. If the
+    page has invalid contacts, they are validated one by one and skipped (and logged).
+    """
+    contacts_data = []
+    for contact in data.get("contacts", []):
+        contact_data = contact.copy()
+        # Brevo API might not always include email directly; fall back to attributes
+        if not contact_data.get("email") and contact_data.get("attributes"):
+            attributes = contact_data["attributes"]
+            email = attributes.get("EMAIL") or attributes.get("email")
+            if email:
+                contact_data["email"] = email
+        contacts_data.append(contact_data)
+
+    try:
+        contacts_list = BrevoContactResponseListAdapter.validate_python(contacts_data)
+    except ValidationError:
+        contacts_list = []
+        for contact_data in contacts_data:
+            try:
+                contacts_list.append(BrevoContactResponse.model_validate(contact_data))
+            except ValidationError as e:
+                print(f"[BREVO] Failed to parse {label}: {e}")
+                print(f"[BREVO] Contact data: {contact_data}")
+
+    return ORJSONResponse(
+        {
+            "contacts": BrevoContactResponseListAdapter.dump_python(contacts_list, mode="json"),
+            "count": data.get("count", len(contacts_list)),
+            "offset": data.get("offset", offset),
+            "limit": data.get("limit", limit),
+        }
+    )
+
+
+@router.get(
+    "/brevo/contacts",
+    response_class=ORJSONResponse,
+    responses={200: {"model": BrevoContactList}},
+)
 def get_brevo_contacts(
     limit: int = Query(50, ge=1, le=1000),
     offset: int = Query(0, ge=0),
@@ -1674,39 +1721,7 @@ def get_brevo_contacts(
         )
         
         if response.status_code == 200:
-            data = response.json()
-            contacts_list = []
-            
-            for contact in data.get("contacts", []):
-                # Brevo API might not always include email directly
-                # Try to extract email from attributes if missing
-                contact_data = contact.copy()
-                
-                # If email is missing, try to get it from attributes
-                if 'email' not in contact_data or not contact_data.get('email'):
-                    if contact_data.get('attributes'):
-                        email = contact_data['attributes'].get('EMAIL') or contact_data['attributes'].get('email')
-                        if email:
-                            contact_data['email'] = email
-                
-                # Ensure email field exists (even if None)
-                if 'email' not in contact_data:
-                    contact_data['email'] = None
-                
-                try:
-                    contacts_list.append(BrevoContactResponse(**contact_data))
-                except Exception as e:
-                    print(f"[BREVO] Failed to parse contact: {e}")
-                    print(f"[BREVO] Contact data: {contact_data}")
-                    # Skip invalid contacts but log the issue
-                    continue
-            
-            return BrevoContactList(
-                contacts=contacts_list,
-                count=data.get("count", len(contacts_list)),
-                offset=data.get("offset", offset),
-                limit=data.get("limit", limit)
-            )
+            return _brevo_contact_list_response(response.json(), offset, limit, "contact")
         else:
             error_data = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
             error_msg = error_data.get("message", f"HTTP {response.status_code}: {response.text}")
@@ -1956,7 +1971,11 @@ def bulk_delete_brevo_contacts(
 # BREVO LISTS ENDPOINTS
 # ============================================================================
 
-@router.get("/brevo/lists", response_model=BrevoListList)
+@router.get(
+    "/brevo/lists",
+    response_class=ORJSONResponse,
+    responses={200: {"model": BrevoListList}},
+)
 def get_brevo_lists(
     limit: int = Query(50, ge=1, le=1000),
     offset: int = Query(0, ge=0),
@@ -1981,11 +2000,14 @@ def get_brevo_lists(
         
         if response.status_code == 200:
             data = response.json()
-            return BrevoListList(
-                lists=[BrevoListResponse(**lst) for lst in data.get("lists", [])],
-                count=data.get("count", 0),
-                offset=data.get("offset", offset),
-                limit=data.get("limit", limit)
+            lists = BrevoListResponseListAdapter.validate_python(data.get("lists", []))
+            return ORJSONResponse(
+                {
+                    "lists": BrevoListResponseListAdapter.dump_python(lists, mode="json"),
+                    "count": data.get("count", 0),
+                    "offset": data.get("offset", offset),
+                    "limit": data.get("limit", limit),
+                }
             )
         else:
             error_data = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
@@ -2087,7 +2109,11 @@ def delete_brevo_list(
         )
 
 
-@router.get("/brevo/lists/{list_id}/contacts", response_model=BrevoContactList)
+@router.get(
+    "/brevo/lists/{list_id}/contacts",
+    response_class=ORJSONResponse,
+    responses={200: {"model": BrevoContactList}},
+)
 def get_brevo_list_contacts(
     list_id: int,
     limit: int = Query(50, ge=1, le=1000),
@@ -2112,39 +2138,7 @@ def get_brevo_list_contacts(
         )
         
         if response.status_code == 200:
-            data = response.json()
-            contacts_list = []
-            
-            for contact in data.get("contacts", []):
-                # Brevo API might not always include email directly
-                # Try to extract email from attributes if missing
-                contact_data = contact.copy()
-                
-                # If email is missing, try to get it from attributes
-                if 'email' not in contact_data or not contact_data.get('email'):
-                    if contact_data.get('attributes'):
-                        email = contact_data['attributes'].get('EMAIL') or contact_data['attributes'].get('email')
-                        if email:
-                            contact_data['email'] = email
-                
-                # Ensure email field exists (even if None)
-                if 'email' not in contact_data:
-                    contact_data['email'] = None
-                
-                try:
-                    contacts_list.append(BrevoContactResponse(**contact_data))
-                except Exception as e:
-                    print(f"[BREVO] Failed to parse list contact: {e}")
-                    print(f"[BREVO] Contact data: {contact_data}")
-                    # Skip invalid contacts but log the issue
-                    continue
-            
-            return BrevoContactList(
-                contacts=contacts_list,
-                count=data.get("count", len(contacts_list)),
-                offset=data.get("offset", offset),
-                limit=data.get("limit", limit)
-            )
+            return _brevo_contact_list_response(response.json(), offset, limit, "list contact")
         else:
             error_data = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
             error_msg = error_data.get("message", f"HTTP {response.status_code}: {response.text}")
@@ -2613,7 +2607,7 @@ def send_brevo_transactional_email(
         # Prepare email payload for Brevo API
         # Brevo supports sending to multiple recipients in a single call
         email_payload = {
-            "sender": request.sender,
+            "sender": request.sender.model_dump(exclude_none=True),
             "subject": request.subject,
             "to": recipient_emails[:100],  # Brevo limits to 100 recipients per call
         }
@@ -2634,7 +2628,7 @@ def send_brevo_transactional_email(
         if request.tags:
             email_payload["tags"] = request.tags
         if request.replyTo:
-            email_payload["replyTo"] = request.replyTo
+            email_payload["replyTo"] = request.replyTo.model_dump(exclude_none=True)
         if request.attachments:
             email_payload["attachment"] = request.attachments
         
@@ -3429,11 +3423,11 @@ def get_calendar_manual_events(
     return out
 
 
-def _calcom_uid_from_raw(raw_event_data: Optional[str]) -> Optional[str]:
+def _calcom_uid_from_raw(raw_event_data: Any) -> Optional[str]:
     if not raw_event_data:
         return None
     try:
-        d = json.loads(raw_event_data)
+        d = json.loads(raw_event_data) if isinstance(raw_event_data, str) else raw_event_data
         if not isinstance(d, dict):
             return None
         u = d.get("uid")
@@ -9,7 +9,7 @@ from app.core.config import settings
 from app.schemas.oauth import OAuthStartResponse, OAuthTokenResponse, DirectApiKeyRequest
 from app.api.deps import get_current_user, require_admin, require_admin_or_owner
 from app.models.user import User
-from app.models.oauth_token import OAuthToken, OAuthProvider
+from app.models.oauth_token import OAuthToken, OAuthProvider, upsert_oauth_token
 from app.models.organization import Organization
 from app.models.stripe_payment import StripePayment
 from app.models.stripe_subscription import StripeSubscription
@@ -226,28 +226,16 @@ def stripe_oauth_callback_original(
         if "expires_in" in token_data:
             expires_at = datetime.utcnow() + timedelta(seconds=token_data["expires_in"])
         
-        # CRITICAL: Check if token exists for this provider AND org (multi-tenant isolation)
-        existing = db.query(OAuthToken).filter(
-            OAuthToken.provider == OAuthProvider.STRIPE,
-            OAuthToken.org_id == org_id
-        ).first()
-        
-        if existing:
-            existing.access_token = encrypted_token
-            existing.refresh_token = encrypted_refresh
-            existing.account_id = stripe_user_id or f"acct_{code[:10]}"
-            existing.expires_at = expires_at
-        else:
-            # Store token with org_id for multi-tenant isolation
-            oauth_token = OAuthToken(
-                org_id=org_id,  # Use org_id from state parameter
-                provider=OAuthProvider.STRIPE,
-                account_id=stripe_user_id or f"acct_{code[:10]}",
-                access_token=encrypted_token,
-                refresh_token=encrypted_refresh,
-                expires_at=expires_at
-            )
-            db.add(oauth_token)
+        # One token per provider AND org (multi-tenant isolation); org_id from state parameter
+        upsert_oauth_token(
+            db,
+            org_id,
+            OAuthProvider.STRIPE,
+            account_id=stripe_user_id or f"acct_{code[:10]}",
+            access_token=encrypted_token,
+            refresh_token=encrypted_refresh,
+            expires_at=expires_at,
+        )
         
         db.commit()
         
@@ -373,27 +361,16 @@ def stripe_oauth_callback_manual(
         if "expires_in" in token_data:
             expires_at = datetime.utcnow() + timedelta(seconds=token_data["expires_in"])
         
-        # Check if token exists for this provider AND org
-        existing = db.query(OAuthToken).filter(
-            OAuthToken.provider == OAuthProvider.STRIPE,
-            OAuthToken.org_id == org_id
-        ).first()
-        
-        if existing:
-            existing.access_token = encrypted_token
-            existing.refresh_token = encrypted_refresh
-            existing.account_id = stripe_user_id or f"acct_{code[:10]}"
-            existing.expires_at = expires_at
-        else:
-            oauth_token = OAuthToken(
-                org_id=org_id,
-                provider=OAuthProvider.STRIPE,
-                account_id=stripe_user_id or f"acct_{code[:10]}",
-                access_token=encrypted_token,
-                refresh_token=encrypted_refresh,
-                expires_at=expires_at
-            )
-            db.add(oauth_token)
+        # One token per provider AND org
+        upsert_oauth_token(
+            db,
+            org_id,
+            OAuthProvider.STRIPE,
+            account_id=stripe_user_id or f"acct_{code[:10]}",
+            access_token=encrypted_token,
+            refresh_token=encrypted_refresh,
+            expires_at=expires_at,
+        )
         
         db.commit()
         
@@ -480,10 +457,10 @@ def connect_stripe_direct(
         Success message with account ID
     """
     from fastapi.responses import JSONResponse
-    from app.core.rate_limit import _rate_limit_store, _rate_limit_lock, _cleanup_old_entries
+    from app.core.rate_limit import sliding_window_try_acquire
     from app.core.audit import log_security_event
     from app.models.audit_log import AuditEventType
-    from datetime import datetime, timedelta
+    from datetime import datetime
     # Dynamic import for stripe
     try:
         import stripe
@@ -494,42 +471,28 @@ def connect_stripe_direct(
         )
     
     # Rate limiting: 3 attempts per 15 minutes per user
-    _cleanup_old_entries()
     identifier = f"direct_api_key_{current_user.id}_{current_user.org_id}"
-    now = datetime.utcnow()
-    window_start = now - timedelta(seconds=900)  # 15 minutes
-    
-    with _rate_limit_lock:
-        recent_requests = [
-            ts for ts, _ in _rate_limit_store[identifier]
-            if ts > window_start
-        ]
-        
-        if len(recent_requests) >= 3:
-            # Log rate limit event
-            log_security_event(
-                db=db,
-                event_type=AuditEventType.RATE_LIMIT_EXCEEDED,
-                org_id=current_user.org_id,
-                user_id=current_user.id,
-                resource_type="api_endpoint",
-                resource_id="connect_stripe_direct",
-                ip_address=http_request.client.host if http_request.client else None,
-                user_agent=http_request.headers.get("user-agent"),
-                details={
-                    "endpoint": "connect_stripe_direct",
-                    "max_requests": 3,
-                    "window_seconds": 900,
-                    "recent_requests": len(recent_requests)
-                }
-            )
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Rate limit exceeded: 3 direct API key connections per 15 minutes. Please try again later or use OAuth instead."
-            )
-        
-        # Add current request
-        _rate_limit_store[identifier].append((now, 1))
+    if not sliding_window_try_acquire(identifier, 3, 900):  # 15 minutes
+        # Log rate limit event
+        log_security_event(
+            db=db,
+            event_type=AuditEventType.RATE_LIMIT_EXCEEDED,
+            org_id=current_user.org_id,
+            user_id=current_user.id,
+            resource_type="api_endpoint",
+            resource_id="connect_stripe_direct",
+            ip_address=http_request.client.host if http_request.client else None,
+            user_agent=http_request.headers.get("user-agent"),
+            details={
+                "endpoint": "connect_stripe_direct",
+                "max_requests": 3,
+                "window_seconds": 900
+            }
+        )
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded: 3 direct API key connections per 15 minutes. Please try again later or use OAuth instead."
+        )
     
     api_key = request.api_key
     if not api_key or not api_key.strip():
@@ -576,30 +539,17 @@ def connect_stripe_direct(
         # Encrypt the API key before storing
         encrypted_token = encrypt_token(api_key)
         
-        # Check if token exists for this provider AND org
-        existing = db.query(OAuthToken).filter(
-            OAuthToken.provider == OAuthProvider.STRIPE,
-            OAuthToken.org_id == org_id
-        ).first()
-        
-        if existing:
-            existing.access_token = encrypted_token
-            existing.refresh_token = None  # Direct API keys don't have refresh tokens
-            existing.account_id = account_id
-            existing.expires_at = None  # API keys don't expire
-            existing.scope = "direct_api_key"  # Mark as direct connection
-            oauth_token = existing
-        else:
-            oauth_token = OAuthToken(
-                org_id=org_id,
-                provider=OAuthProvider.STRIPE,
-                account_id=account_id,
-                access_token=encrypted_token,
-                refresh_token=None,  # Direct API keys don't have refresh tokens
-                expires_at=None,  # API keys don't expire
-                scope="direct_api_key"  # Mark as direct connection
-            )
-            db.add(oauth_token)
+        # One token per provider AND org
+        upsert_oauth_token(
+            db,
+            org_id,
+            OAuthProvider.STRIPE,
+            account_id=account_id,
+            access_token=encrypted_token,
+            refresh_token=None,  # Direct API keys don't have refresh tokens
+            expires_at=None,  # API keys don't expire
+            scope="direct_api_key",  # Mark as direct connection
+        )
 
         db.commit()
 
@@ -841,28 +791,16 @@ def stripe_oauth_callback_manual_get(
         # In production, always use the regular callback which has state
         org_id = DEFAULT_ORG_ID
         
-        # CRITICAL: Check if token exists for this provider AND org (multi-tenant isolation)
-        existing = db.query(OAuthToken).filter(
-            OAuthToken.provider == OAuthProvider.STRIPE,
-            OAuthToken.org_id == org_id
-        ).first()
-        
-        if existing:
-            existing.access_token = encrypted_token
-            existing.refresh_token = encrypted_refresh
-            existing.account_id = stripe_user_id or f"acct_{code[:10]}"
-            existing.expires_at = expires_at
-        else:
-            # Store token with org_id for multi-tenant isolation
-            oauth_token = OAuthToken(
-                org_id=org_id,
-                provider=OAuthProvider.STRIPE,
-                account_id=stripe_user_id or f"acct_{code[:10]}",
-                access_token=encrypted_token,
-                refresh_token=encrypted_refresh,
-                expires_at=expires_at
-            )
-            db.add(oauth_token)
+        # One token per provider AND org (multi-tenant isolation)
+        upsert_oauth_token(
+            db,
+            org_id,
+            OAuthProvider.STRIPE,
+            account_id=stripe_user_id or f"acct_{code[:10]}",
+            access_token=encrypted_token,
+            refresh_token=encrypted_refresh,
+            expires_at=expires_at,
+        )
         
         db.commit()
         
@@ -1207,30 +1145,17 @@ def brevo_oauth_callback(
         # Calculate expiration timestamp
         expires_at = datetime.utcnow() + timedelta(seconds=expires_in)
         
-        # CRITICAL: Check if token exists for this provider AND org (multi-tenant isolation)
-        existing = db.query(OAuthToken).filter(
-            OAuthToken.provider == OAuthProvider.BREVO,
-            OAuthToken.org_id == org_id
-        ).first()
-        
-        if existing:
-            existing.access_token = encrypted_token
-            existing.refresh_token = encrypted_refresh
-            existing.expires_at = expires_at
-            existing.scope = scope  # Use extracted scope
-            print(f"[BREVO OAUTH] Updated existing token for org {org_id}")
-        else:
-            # Store token with org_id for multi-tenant isolation
-            oauth_token = OAuthToken(
-                org_id=org_id,  # Use org_id from state parameter
-                provider=OAuthProvider.BREVO,
-                access_token=encrypted_token,
-                refresh_token=encrypted_refresh,
-                expires_at=expires_at,
-                scope=scope  # Use extracted scope
-            )
-            db.add(oauth_token)
-            print(f"[BREVO OAUTH] Created new token for org {org_id}")
+        # One token per provider AND org (multi-tenant isolation); org_id from state parameter
+        upsert_oauth_token(
+            db,
+            org_id,
+            OAuthProvider.BREVO,
+            access_token=encrypted_token,
+            refresh_token=encrypted_refresh,
+            expires_at=expires_at,
+            scope=scope,  # Use extracted scope
+        )
+        print(f"[BREVO OAUTH] Stored token for org {org_id}")
         
         db.commit()
         
@@ -1285,53 +1210,36 @@ def connect_brevo_direct(
         Success message with account email
     """
     from fastapi.responses import JSONResponse
-    from app.core.rate_limit import _rate_limit_store, _rate_limit_lock, _cleanup_old_entries
+    from app.core.rate_limit import sliding_window_try_acquire
     from app.core.audit import log_security_event
     from app.models.audit_log import AuditEventType
-    from datetime import datetime, timedelta
     import httpx
     
     # Use selected org (e.g. when system owner is acting as another org) so Brevo stays org-specific
     org_id = getattr(current_user, 'selected_org_id', current_user.org_id)
     # Rate limiting: 3 attempts per 15 minutes per user per org
-    _cleanup_old_entries()
     identifier = f"brevo_direct_api_key_{current_user.id}_{org_id}"
-    now = datetime.utcnow()
-    window_start = now - timedelta(seconds=900)  # 15 minutes
-    
-    with _rate_limit_lock:
-        if identifier not in _rate_limit_store:
-            _rate_limit_store[identifier] = []
-        recent_requests = [
-            ts for ts, _ in _rate_limit_store[identifier]
-            if ts > window_start
-        ]
-        
-        if len(recent_requests) >= 3:
-            # Log rate limit event
-            log_security_event(
-                db=db,
-                event_type=AuditEventType.RATE_LIMIT_EXCEEDED,
-                org_id=org_id,
-                user_id=current_user.id,
-                resource_type="api_endpoint",
-                resource_id="connect_brevo_direct",
-                ip_address=http_request.client.host if http_request.client else None,
-                user_agent=http_request.headers.get("user-agent"),
-                details={
-                    "endpoint": "connect_brevo_direct",
-                    "max_requests": 3,
-                    "window_seconds": 900,
-                    "recent_requests": len(recent_requests)
-                }
-            )
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Rate limit exceeded: 3 direct API key connections per 15 minutes. Please try again later or use OAuth instead."
-            )
-        
-        # Add current request
-        _rate_limit_store[identifier].append((now, 1))
+    if not sliding_window_try_acquire(identifier, 3, 900):  # 15 minutes
+        # Log rate limit event
+        log_security_event(
+            db=db,
+            event_type=AuditEventType.RATE_LIMIT_EXCEEDED,
+            org_id=org_id,
+            user_id=current_user.id,
+            resource_type="api_endpoint",
+            resource_id="connect_brevo_direct",
+            ip_address=http_request.client.host if http_request.client else None,
+            user_agent=http_request.headers.get("user-agent"),
+            details={
+                "endpoint": "connect_brevo_direct",
+                "max_requests": 3,
+                "window_seconds": 900
+            }
+        )
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded: 3 direct API key connections per 15 minutes. Please try again later or use OAuth instead."
+        )
     
     api_key = request.api_key
     if not api_key or not api_key.strip():
@@ -1389,32 +1297,18 @@ def connect_brevo_direct(
         # Encrypt the API key before storing
         encrypted_token = encrypt_token(api_key)
         
-        # Check if token exists for this provider AND org
-        existing = db.query(OAuthToken).filter(
-            OAuthToken.provider == OAuthProvider.BREVO,
-            OAuthToken.org_id == org_id
-        ).first()
-        
-        if existing:
-            existing.access_token = encrypted_token
-            existing.refresh_token = None  # API keys don't have refresh tokens
-            existing.expires_at = None  # API keys don't expire
-            existing.scope = "api_key"  # Mark as API key method
-            existing.account_id = account_id
-            print(f"[BREVO DIRECT] Updated existing connection for org {org_id}")
-        else:
-            # Store API key as OAuth token (encrypted)
-            oauth_token = OAuthToken(
-                org_id=org_id,
-                provider=OAuthProvider.BREVO,
-                access_token=encrypted_token,
-                refresh_token=None,  # API keys don't have refresh tokens
-                expires_at=None,  # API keys don't expire
-                scope="api_key",  # Mark as API key method
-                account_id=account_id
-            )
-            db.add(oauth_token)
-            print(f"[BREVO DIRECT] Created new connection for org {org_id}")
+        # Store API key as OAuth token (encrypted); one per provider AND org
+        upsert_oauth_token(
+            db,
+            org_id,
+            OAuthProvider.BREVO,
+            access_token=encrypted_token,
+            refresh_token=None,  # API keys don't have refresh tokens
+            expires_at=None,  # API keys don't expire
+            scope="api_key",  # Mark as API key method
+            account_id=account_id,
+        )
+        print(f"[BREVO DIRECT] Stored connection for org {org_id}")
         
         db.commit()
         
@@ -1620,52 +1514,35 @@ def connect_calcom_direct(
         Success message with account information
     """
     from fastapi.responses import JSONResponse
-    from app.core.rate_limit import _rate_limit_store, _rate_limit_lock, _cleanup_old_entries
+    from app.core.rate_limit import sliding_window_try_acquire
     from app.core.audit import log_security_event
     from app.models.audit_log import AuditEventType
-    from datetime import datetime, timedelta
     import httpx
     
     # Rate limiting: 3 attempts per 15 minutes per user
-    _cleanup_old_entries()
     org_id_for_limit = _calendar_integration_org_id(current_user)
     identifier = f"calcom_direct_api_key_{current_user.id}_{org_id_for_limit}"
-    now = datetime.utcnow()
-    window_start = now - timedelta(seconds=900)  # 15 minutes
-    
-    with _rate_limit_lock:
-        if identifier not in _rate_limit_store:
-            _rate_limit_store[identifier] = []
-        recent_requests = [
-            ts for ts, _ in _rate_limit_store[identifier]
-            if ts > window_start
-        ]
-        
-        if len(recent_requests) >= 3:
-            # Log rate limit event
-            log_security_event(
-                db=db,
-                event_type=AuditEventType.RATE_LIMIT_EXCEEDED,
-                org_id=org_id_for_limit,
-                user_id=current_user.id,
-                resource_type="api_endpoint",
-                resource_id="connect_calcom_direct",
-                ip_address=http_request.client.host if http_request.client else None,
-                user_agent=http_request.headers.get("user-agent"),
-                details={
-                    "endpoint": "connect_calcom_direct",
-                    "max_requests": 3,
-                    "window_seconds": 900,
-                    "recent_requests": len(recent_requests)
-                }
-            )
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Rate limit exceeded: 3 direct API key connections per 15 minutes. Please try again later."
-            )
-        
-        # Add current request
-        _rate_limit_store[identifier].append((now, 1))
+    if not sliding_window_try_acquire(identifier, 3, 900):  # 15 minutes
+        # Log rate limit event
+        log_security_event(
+            db=db,
+            event_type=AuditEventType.RATE_LIMIT_EXCEEDED,
+            org_id=org_id_for_limit,
+            user_id=current_user.id,
+            resource_type="api_endpoint",
+            resource_id="connect_calcom_direct",
+            ip_address=http_request.client.host if http_request.client else None,
+            user_agent=http_request.headers.get("user-agent"),
+            details={
+                "endpoint": "connect_calcom_direct",
+                "max_requests": 3,
+                "window_seconds": 900
+            }
+        )
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded: 3 direct API key connections per 15 minutes. Please try again later."
+        )
     
     api_key = request.api_key
     if not api_key or not api_key.strip():
@@ -1768,73 +1645,18 @@ def connect_calcom_direct(
         # Encrypt the API key before storing
         encrypted_token = encrypt_token(api_key)
         
-        # Check if token exists for this provider AND org
-        # Use raw SQL to bypass SQLAlchemy's enum name conversion
-        from sqlalchemy import text
-        existing_result = db.execute(
-            text("""
-                SELECT id FROM oauth_tokens 
-                WHERE provider = 'calcom'::oauthprovider 
-                AND org_id = :org_id 
-                LIMIT 1
-            """),
-            {"org_id": org_id}
-        ).first()
-        
-        # Check if token exists and get its ID (don't load the object to avoid enum validation)
-        existing_id = None
-        if existing_result:
-            existing_id = existing_result[0]
-        
-        if existing_id:
-            # Use raw SQL UPDATE to bypass SQLAlchemy's enum validation
-            from sqlalchemy import text
-            db.execute(
-                text("""
-                    UPDATE oauth_tokens 
-                    SET access_token = :access_token,
-                        refresh_token = NULL,
-                        expires_at = NULL,
-                        scope = :scope,
-                        account_id = :account_id
-                    WHERE id = :id
-                """),
-                {
-                    "id": existing_id,
-                    "access_token": encrypted_token,
-                    "scope": "api_key",
-                    "account_id": str(account_id)
-                }
-            )
-            print(f"[CALCOM DIRECT] Updated existing connection for org {org_id}")
-            # Don't load the object - it will trigger enum validation
-            oauth_token = None
-        else:
-            # Store API key as OAuth token (encrypted)
-            # Use raw SQL insert to bypass SQLAlchemy's enum name conversion
-            # SQLAlchemy uses enum names (CALCOM) but database has lowercase value (calcom)
-            from sqlalchemy import text
-            import uuid as uuid_lib
-            token_id = uuid_lib.uuid4()
-            # Use bindparam with explicit type to bypass SQLAlchemy enum validation
-            from sqlalchemy import bindparam
-            db.execute(
-                text("""
-                    INSERT INTO oauth_tokens (id, org_id, provider, account_id, access_token, refresh_token, scope, expires_at, created_at)
-                    VALUES (:id, :org_id, CAST(:provider AS oauthprovider), :account_id, :access_token, NULL, :scope, NULL, NOW())
-                """),
-                {
-                    "id": token_id,
-                    "org_id": org_id,
-                    "provider": "calcom",  # Use string value directly
-                    "account_id": str(account_id),
-                    "access_token": encrypted_token,
-                    "scope": "api_key"
-                }
-            )
-            # Don't query back - just use the ID for response
-            oauth_token = None  # We don't need the object, just the ID
-            print(f"[CALCOM DIRECT] Created new connection for org {org_id}")
+        # Store API key as OAuth token (encrypted); one per provider AND org
+        upsert_oauth_token(
+            db,
+            org_id,
+            OAuthProvider.CALCOM,
+            account_id=str(account_id),
+            access_token=encrypted_token,
+            refresh_token=None,
+            expires_at=None,
+            scope="api_key",
+        )
+        print(f"[CALCOM DIRECT] Stored connection for org {org_id}")
         
         db.commit()
         
@@ -1896,50 +1718,34 @@ def connect_calendly_direct(
         Success message with account information
     """
     from fastapi.responses import JSONResponse
-    from app.core.rate_limit import _rate_limit_store, _rate_limit_lock, _cleanup_old_entries
+    from app.core.rate_limit import sliding_window_try_acquire
     from app.core.audit import log_security_event
     from app.models.audit_log import AuditEventType
-    from datetime import datetime, timedelta
     import httpx
     
     # Rate limiting: 3 attempts per 15 minutes per user
-    _cleanup_old_entries()
     org_id_for_limit = _calendar_integration_org_id(current_user)
     identifier = f"calendly_direct_api_key_{current_user.id}_{org_id_for_limit}"
-    now = datetime.utcnow()
-    window_start = now - timedelta(seconds=900)  # 15 minutes
-    
-    with _rate_limit_lock:
-        if identifier not in _rate_limit_store:
-            _rate_limit_store[identifier] = []
-        recent_requests = [
-            ts for ts, _ in _rate_limit_store[identifier]
-            if ts > window_start
-        ]
-        
-        if len(recent_requests) >= 3:
-            log_security_event(
-                db=db,
-                event_type=AuditEventType.RATE_LIMIT_EXCEEDED,
-                org_id=org_id_for_limit,
-                user_id=current_user.id,
-                resource_type="api_endpoint",
-                resource_id="connect_calendly_direct",
-                ip_address=http_request.client.host if http_request.client else None,
-                user_agent=http_request.headers.get("user-agent"),
-                details={
-                    "endpoint": "connect_calendly_direct",
-                    "max_requests": 3,
-                    "window_seconds": 900,
-                    "recent_requests": len(recent_requests)
-                }
-            )
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Rate limit exceeded: 3 direct API key connections per 15 minutes. Please try again later."
-            )
-        
-        _rate_limit_store[identifier].append((now, 1))
+    if not sliding_window_try_acquire(identifier, 3, 900):  # 15 minutes
+        log_security_event(
+            db=db,
+            event_type=AuditEventType.RATE_LIMIT_EXCEEDED,
+            org_id=org_id_for_limit,
+            user_id=current_user.id,
+            resource_type="api_endpoint",
+            resource_id="connect_calendly_direct",
+            ip_address=http_request.client.host if http_request.client else None,
+            user_agent=http_request.headers.get("user-agent"),
+            details={
+                "endpoint": "connect_calendly_direct",
+                "max_requests": 3,
+                "window_seconds": 900
+            }
+        )
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded: 3 direct API key connections per 15 minutes. Please try again later."
+        )
     
     api_key = request.api_key
     if not api_key or not api_key.strip():
@@ -2057,61 +1863,18 @@ def connect_calendly_direct(
     # Encrypt the API key before storing
     encrypted_token = encrypt_token(api_key)
     
-    # Check if token exists for this provider AND org
-    # Use raw SQL to bypass SQLAlchemy's enum name conversion
-    existing_result = db.execute(
-        text("""
-            SELECT id FROM oauth_tokens 
-            WHERE provider = 'calendly'::oauthprovider
-            AND org_id = :org_id 
-            LIMIT 1
-        """),
-        {"org_id": org_id}
-    ).first()
-    
-    existing_id = None
-    if existing_result:
-        existing_id = existing_result[0]
-    
-    if existing_id:
-        # Use raw SQL UPDATE to bypass SQLAlchemy's enum validation
-        db.execute(
-            text("""
-                UPDATE oauth_tokens 
-                SET access_token = :access_token,
-                    refresh_token = NULL,
-                    expires_at = NULL,
-                    scope = :scope,
-                    account_id = :account_id
-                WHERE id = :id
-            """),
-            {
-                "id": existing_id,
-                "access_token": encrypted_token,
-                "scope": "api_key",
-                "account_id": str(account_id)
-            }
-        )
-        print(f"[CALENDLY DIRECT] Updated existing connection for org {org_id}")
-    else:
-        # Store API key as OAuth token (encrypted)
-        import uuid as uuid_lib
-        token_id = uuid_lib.uuid4()
-        db.execute(
-            text("""
-                INSERT INTO oauth_tokens (id, org_id, provider, account_id, access_token, refresh_token, scope, expires_at, created_at)
-                VALUES (:id, :org_id, CAST(:provider AS oauthprovider), :account_id, :access_token, NULL, :scope, NULL, NOW())
-            """),
-            {
-                "id": token_id,
-                "org_id": org_id,
-                "provider": "calendly",
-                "account_id": str(account_id),
-                "access_token": encrypted_token,
-                "scope": "api_key"
-            }
-        )
-        print(f"[CALENDLY DIRECT] Created new connection for org {org_id}")
+    # Store API key as OAuth token (encrypted); one per provider AND org
+    upsert_oauth_token(
+        db,
+        org_id,
+        OAuthProvider.CALENDLY,
+        account_id=str(account_id),
+        access_token=encrypted_token,
+        refresh_token=None,
+        expires_at=None,
+        scope="api_key",
+    )
+    print(f"[CALENDLY DIRECT] Stored connection for org {org_id}")
     
     db.commit()
     
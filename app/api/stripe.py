@@ -3,7 +3,7 @@ Enhanced Stripe Analytics API - uses database data from webhook-processed events
 Provides KPIs, revenue timeline, subscriptions, payments, and failed payments queue.
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import func, and_, or_, desc, select
 from typing import List, Optional
 from datetime import datetime, timedelta, timezone
@@ -22,6 +22,7 @@ from app.models.stripe_treasury_transaction import StripeTreasuryTransaction, Tr
 from app.models.client import Client
 from app.models.manual_payment import ManualPayment
 from app.models.recommendation import Recommendation, RecommendationStatus
+from app.services.stripe_connection_cache import stripe_connected_cache_get, stripe_connected_cache_set
 from app.utils.stripe_ids import normalize_stripe_id, normalize_stripe_id_for_dedup
 from app.utils.stripe_helpers import collect_email_from_raw_events, extract_email_from_payment_raw
 from app.schemas.stripe import (
@@ -86,10 +87,11 @@ def _manual_payment_stripe_responses(
             )
         )
 
-    rows = query.order_by(desc(ManualPayment.payment_date)).all()
+    # One IN query for all payment clients instead of a SELECT per row
+    rows = query.options(selectinload(ManualPayment.client)).order_by(desc(ManualPayment.payment_date)).all()
     result: List[StripePaymentResponse] = []
     for mp in rows:
-        client = db.query(Client).filter(Client.id == mp.client_id).first()
+        client = mp.client
         disp_name, disp_email = _payment_display_client_info(client)
         pay_dt = mp.payment_date or mp.created_at
         created_ts = int(pay_dt.timestamp()) if pay_dt else 0
@@ -157,16 +159,23 @@ def _payment_display_client_info(client, transaction_email=None, payment_raw_eve
 
 
 def check_stripe_connected(db: Session, org_id: uuid.UUID) -> bool:
-    """Check if Stripe is connected via OAuth for a specific org"""
-    oauth_token = db.query(OAuthToken).filter(
-        OAuthToken.provider == OAuthProvider.STRIPE,
-        OAuthToken.org_id == org_id
-    ).first()
-    
-    if not oauth_token:
+    """Check if Stripe is connected via OAuth for a specific org (per-worker cache, NOTIFY-invalidated)."""
+    cached = stripe_connected_cache_get(org_id)
+    if cached is None:
+        row = db.query(OAuthToken.expires_at).filter(
+            OAuthToken.provider == OAuthProvider.STRIPE,
+            OAuthToken.org_id == org_id
+        ).first()
+        has_token = row is not None
+        expires_at = row[0] if row is not None else None
+        stripe_connected_cache_set(org_id, has_token, expires_at)
+    else:
+        has_token, expires_at = cached
+
+    if not has_token:
         return False
     
-    if oauth_token.expires_at and oauth_token.expires_at < datetime.utcnow():
+    if expires_at and expires_at < datetime.utcnow():
         return False
     
     return True
@@ -891,7 +900,7 @@ def get_stripe_summary(
     db.commit()
     
     # Also try SQL sum for comparison
-    current_mrr_result = db.query(func.sum(StripeSubscription.mrr)).filter(
+    current_mrr_result = db.query(func.sum(StripeSubscription.mrr_cents) / 100.0).filter(
         and_(
             StripeSubscription.status.in_(["active", "trialing"]),
             StripeSubscription.org_id == org_id
@@ -913,7 +922,7 @@ def get_stripe_summary(
     print(f"[DEBUG] Final MRR: ${current_mrr:.2f}")
     
     # Get previous period MRR for comparison
-    prev_mrr_result = db.query(func.sum(StripeSubscription.mrr)).filter(
+    prev_mrr_result = db.query(func.sum(StripeSubscription.mrr_cents) / 100.0).filter(
         and_(
             StripeSubscription.status.in_(["active", "trialing"]),
             StripeSubscription.org_id == org_id,
@@ -2446,7 +2455,7 @@ def get_failed_payments(
 
 @router.get("/client/{client_id}/revenue", response_model=StripeClientRevenueResponse)
 def get_client_revenue(
-    client_id: str,
+    client_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -2460,18 +2469,9 @@ def get_client_revenue(
             detail="Stripe not connected."
         )
     
-    from uuid import UUID
-    try:
-        client_uuid = UUID(client_id)
-    except ValueError:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid client ID"
-        )
-    
     # Verify client belongs to selected org
     client = db.query(Client).filter(
-        Client.id == client_uuid,
+        Client.id == client_id,
         Client.org_id == org_id
     ).first()
     if not client:
@@ -2486,30 +2486,38 @@ def get_client_revenue(
     # Get current subscription
     current_subscription = db.query(StripeSubscription).filter(
         and_(
-            StripeSubscription.client_id == client_uuid,
+            StripeSubscription.client_id == client_id,
             StripeSubscription.status == "active"
         )
     ).first()
     
-    # Get payment history
-    payments = db.query(StripePayment).filter(
-        StripePayment.client_id == client_uuid
-    ).order_by(desc(StripePayment.created_at)).limit(20).all()
-    
+    # Get payment history (columns only: no ORM identity/state per row)
+    payment_rows = db.execute(
+        select(
+            StripePayment.id,
+            StripePayment.amount_cents,
+            StripePayment.status,
+            StripePayment.created_at,
+            StripePayment.receipt_url,
+        )
+        .where(StripePayment.client_id == client_id)
+        .order_by(desc(StripePayment.created_at))
+        .limit(20)
+    )
     payment_history = [
         {
-            "id": str(p.id),
-            "amount_cents": p.amount_cents,
-            "status": p.status,
-            "created_at": p.created_at,
-            "receipt_url": p.receipt_url
+            "id": str(r.id),
+            "amount_cents": r.amount_cents,
+            "status": r.status,
+            "created_at": r.created_at,
+            "receipt_url": r.receipt_url
         }
-        for p in payments
+        for r in payment_rows
     ]
     
     disp_name, disp_email = _payment_display_client_info(client)
     return StripeClientRevenueResponse(
-        client_id=client_id,
+        client_id=str(client_id),
         client_name=disp_name,
         client_email=disp_email,
         lifetime_revenue_cents=lifetime_revenue_cents,
@@ -130,13 +130,13 @@ def get_stripe_summary(
     prev_start_date = start_date - timedelta(days=range_days)
     
     # Get current MRR (from active subscriptions)
-    current_mrr_result = db.query(func.sum(StripeSubscription.mrr)).filter(
+    current_mrr_result = db.query(func.sum(StripeSubscription.mrr_cents) / 100.0).filter(
         StripeSubscription.status == "active"
     ).scalar() or Decimal(0)
     current_mrr = float(current_mrr_result)
     
     # Get previous period MRR for comparison
-    prev_mrr_result = db.query(func.sum(StripeSubscription.mrr)).filter(
+    prev_mrr_result = db.query(func.sum(StripeSubscription.mrr_cents) / 100.0).filter(
         and_(
             StripeSubscription.status == "active",
             StripeSubscription.updated_at >= prev_start_date,
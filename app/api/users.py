@@ -2,22 +2,42 @@
 User Management API
 Allows organization admins to manage users within their organization.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import text
 from typing import List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
+import hashlib
 import secrets
-import string
 
-from app.db.session import get_db
-from app.api.deps import get_current_user, check_tab_access, get_user_tab_permissions, is_sudo_admin
-from app.models.user import User, UserRole, parse_user_role_from_api, parse_user_role_from_db, role_to_api
+import orjson
+
+from app.db.session import get_async_db, get_db
+from app.utils.ids import uuid7
+from app.api.deps import get_current_user, is_sudo_admin
+from app.models.user import (
+    User,
+    UserRole,
+    parse_user_role_from_api,
+    parse_user_role_from_db,
+    role_to_api,
+    userrole_bind_value,
+)
 from app.models.organization import Organization
 from app.models.organization_tab_permission import OrganizationTabPermission
-from app.models.user_tab_permission import UserTabPermission
+from app.core.config import settings
+from app.core.rate_limit import rate_limit
 from app.core.security import get_password_hash
 from app.schemas.user import User as UserSchema, UserCreate, UserUpdate
+from app.services.org_seat_cache import org_seat_limit_cache_get, org_seat_limit_cache_set
+from app.services.tab_permission_cache import (
+    cached_check_tab_access,
+    get_cached_user_tab_permissions,
+    invalidate_tab_permissions,
+)
 from app.schemas.organization import Organization as OrganizationSchema, OrganizationUpdate
 from app.schemas.permission import (
     OrganizationTabPermission as OrgTabPermissionSchema,
@@ -51,18 +71,203 @@ LEGACY_TAB_ALIASES = {
 }
 
 
+# DB `userrole` label (incl. legacy lowercase) → API role string.
+_ROLE_DB_TO_PY = {
+    "OWNER": "owner",
+    "ADMIN": "admin",
+    "MEMBER": "member",
+    "owner": "owner",
+    "admin": "admin",
+    "member": "member",
+}
+
+
 def _role_python_from_db(role_db: object) -> str:
-    role_db_value = role_db
-    role_python_value = str(role_db_value).lower() if role_db_value else "admin"
-    if role_db_value in ("member", "MEMBER"):
-        role_python_value = "member"
-    elif role_db_value == "OWNER":
-        role_python_value = "owner"
-    elif role_db_value == "ADMIN":
-        role_python_value = "admin"
+    role_python_value = _ROLE_DB_TO_PY.get(role_db)
+    if role_python_value is None:
+        role_python_value = str(role_db).lower() if role_db else "admin"
     return role_python_value
 
 
+_USER_COLS = ("id", "org_id", "email", "role", "is_admin", "created_at")
+# UserSchema fields that only apply to the signed-in user (/auth/me); constant in list rows.
+_USER_LIST_ROW_DEFAULTS = {
+    "org_name": None,
+    "is_system_owner": False,
+    "is_sudo_admin": False,
+    "consulting_tier": None,
+    "booking_url": None,
+}
+
+
+def _row_to_user_mapping(row) -> dict:
+    """Same shape as UserSchema, for orjson responses that skip the Pydantic pass."""
+    out = dict(zip(_USER_COLS, row))
+    out["role"] = _role_python_from_db(out["role"])
+    out.update(_USER_LIST_ROW_DEFAULTS)
+    return out
+
+
+def _row_to_tab_permission_schema(row) -> UserTabPermissionSchema:
+    """(id, user_id, tab_name, enabled, created_at, updated_at) row → schema, no validation pass."""
+    return UserTabPermissionSchema.model_construct(
+        id=row[0],
+        user_id=row[1],
+        tab_name=row[2],
+        enabled=row[3],
+        created_at=row[4],
+        updated_at=row[5],
+    )
+
+
+def _row_to_user_schema(row) -> UserSchema:
+    """
+    (id, org_id, email, role, is_admin, created_at) row → UserSchema.
+
+    model_construct skips validation: every field comes straight from typed users columns.
+    """
+    return UserSchema.model_construct(
+        id=row[0],
+        org_id=row[1],
+        email=row[2],
+        role=_role_python_from_db(row[3]),
+        is_admin=row[4],
+        created_at=row[5],
+    )
+
+# Hot raw-SQL statements, built once at import (raw SQL avoids SQLAlchemy enum name conversion).
+# Reusing the same TextClause keeps SQLAlchemy's compiled cache warm, and asyncpg's
+# per-connection prepared-statement cache then parses/plans each one once per connection.
+_USER_COLUMNS_SQL = "id, org_id, email, role, is_admin, created_at"
+
+_Q_USERS_BY_ORG = text(f"""
+    SELECT {_USER_COLUMNS_SQL}
+    FROM users
+    WHERE org_id = :org_id
+    ORDER BY created_at DESC
+""")
+
+_Q_USER_BY_ID_ORG = text(f"""
+    SELECT {_USER_COLUMNS_SQL}
+    FROM users
+    WHERE id = :user_id AND org_id = :org_id
+""")
+
+_Q_USER_ROLE_BY_ID_ORG = text("""
+    SELECT role FROM users
+    WHERE id = :user_id AND org_id = :org_id
+""")
+
+# Locks the org row (serializes concurrent creates) and counts members in the same round-trip.
+_Q_ORG_SEATS_FOR_UPDATE = text("""
+    SELECT o.max_user_seats,
+           (SELECT COUNT(*) FROM users u WHERE u.org_id = o.id) AS user_count
+    FROM organizations o
+    WHERE o.id = :org_id
+    FOR UPDATE
+""")
+
+# Appended to the UPDATE's WHERE when demoting an owner. FOR UPDATE locks the org's owner
+# rows so two concurrent demotions serialize and the second re-counts after the first commits.
+_LAST_OWNER_GUARD_SQL = """
+    AND (
+        SELECT COUNT(*) FROM (
+            SELECT 1 FROM users
+            WHERE org_id = :org_id AND role = 'OWNER'
+            FOR UPDATE
+        ) AS owners
+    ) > 1
+"""
+
+_Q_EMAIL_TAKEN_BY_OTHER = text("""
+    SELECT EXISTS (
+        SELECT 1 FROM users
+        WHERE email = :email AND org_id = :org_id AND id != :user_id
+    )
+""")
+
+# Create user + primary user_organization row in one statement.
+# ON CONFLICT on uq_users_email_org replaces the separate "email already exists" SELECT.
+_Q_CREATE_USER = text(f"""
+    WITH new_user AS (
+        INSERT INTO users (id, org_id, email, hashed_password, role, created_at)
+        VALUES (:id, :org_id, :email, :hashed_password, CAST(:role AS userrole), NOW())
+        ON CONFLICT (email, org_id) DO NOTHING
+        RETURNING {_USER_COLUMNS_SQL}
+    ), new_membership AS (
+        INSERT INTO user_organizations (id, user_id, org_id, is_primary, created_at)
+        SELECT :membership_id, id, org_id, TRUE, NOW() FROM new_user
+    )
+    SELECT {_USER_COLUMNS_SQL} FROM new_user
+""")
+
+# One round trip, atomic against concurrent writes (uq_user_tab_permissions_user_tab).
+_Q_UPSERT_USER_TAB_PERMISSION = text("""
+    INSERT INTO user_tab_permissions (id, user_id, tab_name, enabled, created_at, updated_at)
+    VALUES (:id, :user_id, :tab_name, :enabled, NOW(), NOW())
+    ON CONFLICT (user_id, tab_name)
+    DO UPDATE SET enabled = EXCLUDED.enabled, updated_at = NOW()
+    RETURNING id, user_id, tab_name, enabled, created_at, updated_at
+""")
+
+# Org membership check + the user's permission rows in one round trip (LEFT JOIN: a user
+# with no explicit permissions still yields one row with NULL permission columns).
+_Q_USER_ROLE_WITH_TAB_PERMISSIONS = text("""
+    SELECT u.role, p.id, p.user_id, p.tab_name, p.enabled, p.created_at, p.updated_at
+    FROM users u
+    LEFT JOIN user_tab_permissions p ON p.user_id = u.id
+    WHERE u.id = :user_id AND u.org_id = :org_id
+""")
+
+# Same, narrowed to one tab: membership/role check and the permission row (if any) together.
+_Q_USER_ROLE_WITH_TAB_PERMISSION = text("""
+    SELECT u.role, p.id, p.user_id, p.tab_name, p.enabled, p.created_at, p.updated_at
+    FROM users u
+    LEFT JOIN user_tab_permissions p ON p.user_id = u.id AND p.tab_name = :tab_name
+    WHERE u.id = :user_id AND u.org_id = :org_id
+""")
+
+_Q_UPDATE_USER_TAB_PERMISSION = text("""
+    UPDATE user_tab_permissions
+    SET enabled = :enabled, updated_at = NOW()
+    WHERE id = :id
+    RETURNING id, user_id, tab_name, enabled, created_at, updated_at
+""")
+
+_Q_DELETE_USER_TAB_PERMISSION = text("DELETE FROM user_tab_permissions WHERE id = :id")
+
+_Q_DELETE_USER = text("""
+    DELETE FROM users
+    WHERE id = :user_id AND org_id = :org_id
+    RETURNING id
+""")
+
+
+_ADMIN_ROLES = frozenset({UserRole.ADMIN, UserRole.OWNER})
+
+
+def _require_admin(current_user: User = Depends(get_current_user)) -> User:
+    """Dependency: only admins/owners of the scoped org may manage its users."""
+    if current_user.role not in _ADMIN_ROLES and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins can perform this action",
+        )
+    return current_user
+
+
+def _user_management_rate_limit(func):
+    """Per-admin sliding window shared by the /users CRUD endpoints (one bucket for all four)."""
+    limit = settings.USER_MANAGEMENT_RATE_LIMIT_PER_MINUTE
+    if limit <= 0:
+        return func
+    return rate_limit(
+        max_requests=limit,
+        window_seconds=60,
+        identifier_func=lambda request, user: f"users_crud:{user.id if user else 'anon'}",
+    )(func)
+
+
 def _target_user_is_owner(role_db: object) -> bool:
     return parse_user_role_from_db(role_db) == UserRole.OWNER
 
@@ -75,108 +280,59 @@ def _require_sudo_to_modify_owner(actor: User, target_role_db: object, *, action
         )
 
 
-@router.get("", response_model=List[UserSchema])
-def list_users(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+@router.get(
+    "",
+    response_class=ORJSONResponse,
+    responses={200: {"model": List[UserSchema]}},
+)
+@_user_management_rate_limit
+async def list_users(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(_require_admin)
 ):
     """List all users in the current user's organization"""
-    # Only admins/owners can list users
-    if current_user.role not in [UserRole.ADMIN, UserRole.OWNER] and not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admins can list users"
-        )
     
     # Get selected org_id from user object (set by get_current_user)
     org_id = getattr(current_user, 'selected_org_id', current_user.org_id)
     
-    # Use raw SQL to read users to avoid SQLAlchemy enum conversion issues
-    # Some users may have lowercase 'member' while enum expects uppercase 'MEMBER'
-    from sqlalchemy import text
-    users_result = db.execute(
-        text("""
-            SELECT id, org_id, email, role, is_admin, created_at
-            FROM users
-            WHERE org_id = :org_id
-            ORDER BY created_at DESC
-        """),
-        {"org_id": org_id}
-    ).fetchall()
-    
-    # Convert to schema with proper enum handling
-    result = []
-    for row in users_result:
-        # Map database enum values (uppercase) to Python enum values (lowercase)
-        role_db_value = row[3]  # role column
-        role_python_value = role_db_value.lower() if role_db_value else "admin"
-        
-        # Handle case where database might have lowercase 'member' from old data
-        if role_db_value == "member":
-            role_python_value = "member"
-        elif role_db_value == "MEMBER":
-            role_python_value = "member"
-        elif role_db_value == "OWNER":
-            role_python_value = "owner"
-        elif role_db_value == "ADMIN":
-            role_python_value = "admin"
-        
-        user_dict = {
-            "id": row[0],  # id
-            "org_id": row[1],  # org_id
-            "email": row[2],  # email
-            "role": role_python_value,  # role (converted to lowercase)
-            "is_admin": row[4],  # is_admin
-            "created_at": row[5]  # created_at
-        }
-        result.append(UserSchema(**user_dict))
+    # Raw SQL: some users may have lowercase 'member' while enum expects uppercase 'MEMBER'
+    users_result = (await db.execute(_Q_USERS_BY_ORG, {"org_id": org_id})).fetchall()
     
-    return result
+    # Map database enum values (uppercase / legacy lowercase) to API role strings and
+    # serialize straight to JSON (orjson handles UUID/datetime; no per-row Pydantic model).
+    return ORJSONResponse([_row_to_user_mapping(row) for row in users_result])
 
 
 @router.post("", response_model=UserSchema, status_code=status.HTTP_201_CREATED)
-def create_user(
+@_user_management_rate_limit
+async def create_user(
     user_data: UserCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(_require_admin)
 ):
     """Create a new user in the current user's organization"""
-    # Only admins/owners can create users
-    if current_user.role not in [UserRole.ADMIN, UserRole.OWNER] and not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admins can create users"
-        )
     
     # Get selected org_id from user object (set by get_current_user)
     org_id = getattr(current_user, 'selected_org_id', current_user.org_id)
     
-    # Check if email already exists in this org
-    existing_user = db.query(User).filter(
-        User.email == user_data.email,
-        User.org_id == org_id
-    ).first()
-    
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User with this email already exists in this organization"
-        )
-
-    org = db.query(Organization).filter(Organization.id == org_id).first()
-    if org and org.max_user_seats is not None:
-        current_count = db.query(func.count(User.id)).filter(User.org_id == org_id).scalar() or 0
-        if current_count >= org.max_user_seats:
+    # Lock the org row so concurrent creates cannot both pass the seat check (TOCTOU).
+    # Orgs cached as unlimited (None) skip the lock and the member count; a miss is a sentinel.
+    max_user_seats = org_seat_limit_cache_get(org_id)
+    if max_user_seats is not None:
+        org_row = (await db.execute(_Q_ORG_SEATS_FOR_UPDATE, {"org_id": org_id})).fetchone()
+        max_user_seats = org_row[0] if org_row else None
+        org_seat_limit_cache_set(org_id, max_user_seats)
+        if max_user_seats is not None and (org_row[1] or 0) >= max_user_seats:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Organization user limit reached ({org.max_user_seats} seats). Contact your system owner to increase the limit.",
+                detail=f"Organization user limit reached ({max_user_seats} seats). Contact your system owner to increase the limit.",
             )
     
     # Generate password if not provided
     password = user_data.password
     if not password:
-        alphabet = string.ascii_letters + string.digits + "!@#$%^&*"
-        password = ''.join(secrets.choice(alphabet) for _ in range(12))
+        # 12 random bytes (96 bits) → 16 URL-safe chars in a single CSPRNG read
+        password = secrets.token_urlsafe(12)
     
     # Determine role for new user
     user_role = UserRole.MEMBER  # Default to member
@@ -190,71 +346,34 @@ def create_user(
             detail="Only owners can assign the owner role"
         )
     
-    # Create user
+    # Create user + primary user_organization row in one statement.
     # Use org_id from selected org (not current_user.org_id)
-    # Use raw SQL to insert role value directly to avoid SQLAlchemy enum name conversion
-    from sqlalchemy import text
-    import uuid as uuid_lib
-    user_id = uuid_lib.uuid4()
-    
-    role_db_value = user_role.value
-
-    db.execute(
-        text("""
-            INSERT INTO users (id, org_id, email, hashed_password, role, is_admin, created_at)
-            VALUES (:id, :org_id, :email, :hashed_password, CAST(:role AS userrole), :is_admin, NOW())
-        """),
+    role_db_value = userrole_bind_value(user_role)
+    # bcrypt is CPU-bound; keep it off the event loop
+    hashed_password = await run_in_threadpool(get_password_hash, password)
+
+    user_row = (await db.execute(
+        _Q_CREATE_USER,
         {
-            "id": user_id,
+            "id": uuid4(),
+            "membership_id": uuid7(),
             "org_id": org_id,
             "email": user_data.email,
-            "hashed_password": get_password_hash(password),
+            "hashed_password": hashed_password,
             "role": role_db_value,
-            "is_admin": (user_role in [UserRole.ADMIN, UserRole.OWNER])
         }
-    )
-    db.commit()
-    
-    # Fetch the created user using raw SQL to avoid enum conversion issues
-    user_row = db.execute(
-        text("""
-            SELECT id, org_id, email, role, is_admin, created_at
-            FROM users
-            WHERE id = :user_id
-        """),
-        {"user_id": user_id}
-    ).fetchone()
-    
-    # Create user_organization record for multi-org support
-    from app.models.user_organization import UserOrganization
-    user_org = UserOrganization(
-        user_id=user_id,
-        org_id=org_id,
-        is_primary=True  # First org is always primary
-    )
-    db.add(user_org)
-    db.commit()
-    
-    # Map database enum values to Python enum values
-    role_db_value = user_row[3]  # role column
-    role_python_value = role_db_value.lower() if role_db_value else "admin"
-    if role_db_value == "member" or role_db_value == "MEMBER":
-        role_python_value = "member"
-    elif role_db_value == "OWNER":
-        role_python_value = "owner"
-    elif role_db_value == "ADMIN":
-        role_python_value = "admin"
+    )).fetchone()
+
+    if not user_row:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User with this email already exists in this organization"
+        )
+    await db.commit()
     
     # Return user with password (only on creation)
-    user_dict = {
-        "id": user_row[0],  # id
-        "org_id": user_row[1],  # org_id
-        "email": user_row[2],  # email
-        "role": role_python_value,  # role (converted to lowercase)
-        "is_admin": user_row[4],  # is_admin
-        "created_at": user_row[5]  # created_at
-    }
-    result = UserSchema(**user_dict)
+    result = _row_to_user_schema(user_row)
     
     # Include password in response for display (only on creation)
     result_dict = result.model_dump()
@@ -263,35 +382,19 @@ def create_user(
 
 
 @router.get("/{user_id}", response_model=UserSchema)
-def get_user(
+async def get_user(
     user_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(_require_admin)
 ):
     """Get a specific user in the current user's organization"""
-    # Only admins/owners can view users
-    if current_user.role not in [UserRole.ADMIN, UserRole.OWNER] and not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admins can view users"
-        )
     
     # Get selected org_id from user object (set by get_current_user)
     org_id = getattr(current_user, 'selected_org_id', current_user.org_id)
     
-    # Use raw SQL to read user to avoid enum conversion issues
-    from sqlalchemy import text
-    user_row = db.execute(
-        text("""
-            SELECT id, org_id, email, role, is_admin, created_at
-            FROM users
-            WHERE id = :user_id AND org_id = :org_id
-        """),
-        {
-            "user_id": user_id,
-            "org_id": org_id
-        }
-    ).fetchone()
+    user_row = (await db.execute(
+        _Q_USER_BY_ID_ORG, {"user_id": user_id, "org_id": org_id}
+    )).fetchone()
     
     if not user_row:
         raise HTTPException(
@@ -299,58 +402,33 @@ def get_user(
             detail="User not found"
         )
     
-    # Map database enum values to Python enum values
-    role_db_value = user_row[3]  # role column
-    role_python_value = role_db_value.lower() if role_db_value else "admin"
-    if role_db_value == "member" or role_db_value == "MEMBER":
-        role_python_value = "member"
-    elif role_db_value == "OWNER":
-        role_python_value = "owner"
-    elif role_db_value == "ADMIN":
-        role_python_value = "admin"
-    
-    user_dict = {
-        "id": user_row[0],  # id
-        "org_id": user_row[1],  # org_id
-        "email": user_row[2],  # email
-        "role": role_python_value,  # role (converted to lowercase)
-        "is_admin": user_row[4],  # is_admin
-        "created_at": user_row[5]  # created_at
-    }
-    return UserSchema(**user_dict)
+    return _row_to_user_schema(user_row)
 
 
 @router.patch("/{user_id}", response_model=UserSchema)
-def update_user(
+@_user_management_rate_limit
+async def update_user(
     user_id: UUID,
     user_update: UserUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(_require_admin)
 ):
     """Update a user in the current user's organization"""
-    # Only admins/owners can update users
-    if current_user.role not in [UserRole.ADMIN, UserRole.OWNER] and not current_user.is_admin:
+    
+    # Prevent users from modifying themselves (they should use /auth/me/settings)
+    # Exception: allow role changes (but with restrictions)
+    if user_id == current_user.id and user_update.role is None:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admins can update users"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use /auth/me/settings to update your own account"
         )
     
     # Get selected org_id from user object (set by get_current_user)
     org_id = getattr(current_user, 'selected_org_id', current_user.org_id)
     
-    # Use raw SQL to read user to avoid enum conversion issues
-    from sqlalchemy import text
-    user_row = db.execute(
-        text("""
-            SELECT id, org_id, email, role, is_admin, created_at
-            FROM users
-            WHERE id = :user_id AND org_id = :org_id
-        """),
-        {
-            "user_id": user_id,
-            "org_id": org_id
-        }
-    ).fetchone()
+    user_row = (await db.execute(
+        _Q_USER_BY_ID_ORG, {"user_id": user_id, "org_id": org_id}
+    )).fetchone()
     
     if not user_row:
         raise HTTPException(
@@ -358,14 +436,6 @@ def update_user(
             detail="User not found"
         )
     
-    # Prevent users from modifying themselves (they should use /auth/me/settings)
-    # Exception: allow role changes (but with restrictions)
-    if user_id == current_user.id and user_update.role is None:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Use /auth/me/settings to update your own account"
-        )
-    
     # Get current role from database (handle both uppercase and lowercase)
     current_role_db = user_row[3]  # role column
     current_role_python = _role_python_from_db(current_role_db)
@@ -393,41 +463,29 @@ def update_user(
                     detail="Only the system administrator can remove the owner role.",
                 )
         
-        # Prevent demoting the last owner in an org
-        if current_role_python == "owner" and new_role != UserRole.OWNER:
-            owner_count_result = db.execute(
-                text("""
-                    SELECT COUNT(*) FROM users
-                    WHERE org_id = :org_id AND role = 'OWNER'
-                """),
-                {"org_id": org_id}
-            ).scalar()
-            owner_count = owner_count_result or 0
-            if owner_count <= 1:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Cannot demote the last owner in the organization"
-                )
+    # Demoting an owner: the last-owner check runs inside the UPDATE itself (see below)
+    demotes_owner = (
+        user_update.role is not None
+        and current_role_python == "owner"
+        and parse_user_role_from_api(user_update.role) != UserRole.OWNER
+    )
     
     # Build update query dynamically
     update_fields = []
     update_params = {"user_id": user_id, "org_id": org_id}
     
-    # Update email if provided
-    if user_update.email is not None:
+    # Update email if provided (unchanged email needs no uniqueness check)
+    if user_update.email is not None and user_update.email != user_row[2]:
         # Check if email is already taken in this org
-        existing_user_result = db.execute(
-            text("""
-                SELECT id FROM users
-                WHERE email = :email AND org_id = :org_id AND id != :user_id
-            """),
+        email_taken = await db.scalar(
+            _Q_EMAIL_TAKEN_BY_OTHER,
             {
                 "email": user_update.email,
                 "org_id": org_id,
                 "user_id": user_id
             }
-        ).fetchone()
-        if existing_user_result:
+        )
+        if email_taken:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already in use in this organization"
@@ -438,18 +496,17 @@ def update_user(
     # Update password if provided
     if user_update.password is not None:
         update_fields.append("hashed_password = :hashed_password")
-        update_params["hashed_password"] = get_password_hash(user_update.password)
+        # bcrypt is CPU-bound; keep it off the event loop
+        update_params["hashed_password"] = await run_in_threadpool(get_password_hash, user_update.password)
     
     # Update role if provided
     if user_update.role is not None:
         new_role = parse_user_role_from_api(user_update.role)
-        role_db_value = new_role.value
+        role_db_value = userrole_bind_value(new_role)
 
         update_fields.append("role = CAST(:role AS userrole)")
         update_params["role"] = role_db_value
-        # Update is_admin flag for backward compatibility
-        update_fields.append("is_admin = :is_admin")
-        update_params["is_admin"] = (new_role in [UserRole.ADMIN, UserRole.OWNER])
+        # is_admin is a generated column (migration 067); Postgres derives it from role
     
     # Execute update if there are fields to update
     if update_fields:
@@ -457,101 +514,64 @@ def update_user(
             UPDATE users
             SET {', '.join(update_fields)}
             WHERE id = :user_id AND org_id = :org_id
+            {_LAST_OWNER_GUARD_SQL if demotes_owner else ""}
+            RETURNING {_USER_COLUMNS_SQL}
         """
-        db.execute(text(update_query), update_params)
-        db.commit()
-    
-    # Fetch updated user
-    updated_user_row = db.execute(
-        text("""
-            SELECT id, org_id, email, role, is_admin, created_at
-            FROM users
-            WHERE id = :user_id AND org_id = :org_id
-        """),
-        {
-            "user_id": user_id,
-            "org_id": org_id
-        }
-    ).fetchone()
-    
-    # Map database enum values to Python enum values
-    role_db_value = updated_user_row[3]  # role column
-    role_python_value = role_db_value.lower() if role_db_value else "admin"
-    if role_db_value == "member" or role_db_value == "MEMBER":
-        role_python_value = "member"
-    elif role_db_value == "OWNER":
-        role_python_value = "owner"
-    elif role_db_value == "ADMIN":
-        role_python_value = "admin"
-    
-    user_dict = {
-        "id": updated_user_row[0],  # id
-        "org_id": updated_user_row[1],  # org_id
-        "email": updated_user_row[2],  # email
-        "role": role_python_value,  # role (converted to lowercase)
-        "is_admin": updated_user_row[4],  # is_admin
-        "created_at": updated_user_row[5]  # created_at
-    }
-    return UserSchema(**user_dict)
+        updated = (await db.execute(text(update_query), update_params)).fetchone()
+        if not updated:
+            await db.rollback()
+            if demotes_owner:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cannot demote the last owner in the organization"
+                )
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        await db.commit()
+        if user_update.role is not None:
+            # Role gates the owner tab
+            invalidate_tab_permissions(user_id, org_id)
+        # RETURNING already carries the written row (incl. regenerated is_admin)
+        user_row = updated
+    
+    return _row_to_user_schema(user_row)
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(
+@_user_management_rate_limit
+async def delete_user(
     user_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(_require_admin)
 ):
     """Delete a user from the current user's organization"""
-    # Only admins/owners can delete users
-    if current_user.role not in [UserRole.ADMIN, UserRole.OWNER] and not current_user.is_admin:
+    
+    # Prevent users from deleting themselves
+    if user_id == current_user.id:
         raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admins can delete users"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot delete your own account"
         )
     
     # Get selected org_id from user object (set by get_current_user)
     org_id = getattr(current_user, 'selected_org_id', current_user.org_id)
     
-    from sqlalchemy import text
-    target_row = db.execute(
-        text("""
-            SELECT role FROM users
-            WHERE id = :user_id AND org_id = :org_id
-        """),
-        {"user_id": user_id, "org_id": org_id},
-    ).fetchone()
+    target_row = (await db.execute(
+        _Q_USER_ROLE_BY_ID_ORG, {"user_id": user_id, "org_id": org_id}
+    )).fetchone()
     if not target_row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
     _require_sudo_to_modify_owner(current_user, target_row[0], action="remove")
-
-    # Prevent users from deleting themselves
-    if user_id == current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot delete your own account"
-        )
     
-    # Clear audit_logs references so FK does not block delete (user_id is nullable)
-    from sqlalchemy import text
-    db.execute(
-        text("UPDATE audit_logs SET user_id = NULL WHERE user_id = :user_id"),
-        {"user_id": user_id}
-    )
-    # Now delete the user
-    result = db.execute(
-        text("""
-            DELETE FROM users
-            WHERE id = :user_id AND org_id = :org_id
-            RETURNING id
-        """),
-        {
-            "user_id": user_id,
-            "org_id": org_id
-        }
-    ).fetchone()
+    # audit_logs.user_id is ON DELETE SET NULL (migration 021), so one DELETE is enough
+    result = (await db.execute(
+        _Q_DELETE_USER, {"user_id": user_id, "org_id": org_id}
+    )).fetchone()
 
     if not result:
         raise HTTPException(
@@ -559,15 +579,15 @@ def delete_user(
             detail="User not found"
         )
     
-    db.commit()
+    await db.commit()
     return None
 
 
 @router.patch("/me/organization", response_model=OrganizationSchema)
-def update_my_organization(
+async def update_my_organization(
     org_update: OrganizationUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(_require_admin),
 ):
     """
     Update the current organization (currently supports renaming).
@@ -575,15 +595,9 @@ def update_my_organization(
     - Uses selected_org_id from token when present.
     - Only OWNER or ADMIN in that org may change its name.
     """
-    # Only admins/owners can rename org
-    if current_user.role not in [UserRole.ADMIN, UserRole.OWNER] and not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admins can update organization settings",
-        )
 
     org_id = getattr(current_user, "selected_org_id", current_user.org_id)
-    org = db.query(Organization).filter(Organization.id == org_id).first()
+    org = await db.get(Organization, org_id)
     if not org:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -599,30 +613,65 @@ def update_my_organization(
             )
         org.name = new_name
 
-    db.commit()
-    db.refresh(org)
+    await db.commit()
+    await db.refresh(org)
     # Return Pydantic schema to satisfy FastAPI response_model requirements
     return OrganizationSchema.model_validate(org, from_attributes=True)
 
 
 # Tab Permissions Endpoints
+def _weak_etag(body: bytes) -> str:
+    return f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison; header may list several tags or *)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {t.strip() for t in header.split(",")}
+    return "*" in tags or etag in tags or etag[2:] in tags
+
+
+def _tab_access_cache_headers(etag: str) -> dict:
+    # Vary: the body depends on the bearer token's user/org
+    return {"Cache-Control": "private, max-age=30", "ETag": etag, "Vary": "Authorization"}
+
+
 @router.get("/tabs/access", response_model=dict[str, bool])
 def get_my_tab_permissions(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get current user's tab permissions"""
-    return get_user_tab_permissions(current_user, db)
+    """
+    Get current user's tab permissions.
+    Returns every tab in one response; clients should use this rather than one
+    /tabs/{tab_name}/access call per tab.
+    """
+    perms = get_cached_user_tab_permissions(current_user, db, request)
+    etag = _weak_etag(orjson.dumps(perms, option=orjson.OPT_SORT_KEYS))
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_tab_access_cache_headers(etag))
+    response.headers.update(_tab_access_cache_headers(etag))
+    return perms
 
 
 @router.get("/tabs/{tab_name}/access", response_model=TabAccessResponse)
 def check_my_tab_access(
     tab_name: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Check if current user has access to a specific tab"""
-    has_access = check_tab_access(tab_name, current_user, db)
+    has_access = cached_check_tab_access(tab_name, current_user, db, request)
+    etag = _weak_etag(f"{tab_name}:{int(has_access)}".encode())
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_tab_access_cache_headers(etag))
+    response.headers.update(_tab_access_cache_headers(etag))
     return TabAccessResponse(
         tab_name=tab_name,
         has_access=has_access,
@@ -632,191 +681,146 @@ def check_my_tab_access(
 
 # User Tab Permissions (for admins managing their team)
 @router.get("/{user_id}/tabs", response_model=List[UserTabPermissionSchema])
-def get_user_tab_permissions_list(
+async def get_user_tab_permissions_list(
     user_id: UUID,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(_require_admin)
 ):
     """Get tab permissions for a specific user (admin only)"""
-    # Only admins/owners can view user permissions
-    if current_user.role not in [UserRole.ADMIN, UserRole.OWNER] and not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admins can view user permissions"
-        )
     
     # Get selected org_id from user object (set by get_current_user)
     org_id = getattr(current_user, 'selected_org_id', current_user.org_id)
     
-    # Verify user belongs to same org
-    user = db.query(User).filter(
-        User.id == user_id,
-        User.org_id == org_id
-    ).first()
+    # Verify user belongs to same org and load their permissions in the same statement
+    rows = (await db.execute(
+        _Q_USER_ROLE_WITH_TAB_PERMISSIONS, {"user_id": user_id, "org_id": org_id}
+    )).fetchall()
     
-    if not user:
+    if not rows:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
 
-    _require_sudo_to_modify_owner(current_user, user.role, action="change permissions for")
+    _require_sudo_to_modify_owner(current_user, rows[0][0], action="change permissions for")
     
-    permissions = db.query(UserTabPermission).filter(
-        UserTabPermission.user_id == user_id
-    ).all()
-    
-    return [UserTabPermissionSchema.model_validate(p, from_attributes=True) for p in permissions]
+    return [_row_to_tab_permission_schema(r[1:]) for r in rows if r[1] is not None]
 
 
 @router.post("/{user_id}/tabs", response_model=UserTabPermissionSchema, status_code=status.HTTP_201_CREATED)
-def create_user_tab_permission(
+async def create_user_tab_permission(
     user_id: UUID,
     permission_data: UserTabPermissionCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(_require_admin)
 ):
     """Create or update tab permission for a user (admin only)"""
-    # Only admins/owners can manage user permissions
-    if current_user.role not in [UserRole.ADMIN, UserRole.OWNER] and not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admins can manage user permissions"
-        )
     
     # Get selected org_id from user object (set by get_current_user)
     org_id = getattr(current_user, 'selected_org_id', current_user.org_id)
     
-    # Verify user belongs to same org
-    user = db.query(User).filter(
-        User.id == user_id,
-        User.org_id == org_id
-    ).first()
+    # Verify user belongs to same org (role only; no ORM row needed)
+    target = (await db.execute(
+        _Q_USER_ROLE_BY_ID_ORG, {"user_id": user_id, "org_id": org_id}
+    )).fetchone()
     
-    if not user:
+    if not target:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
 
-    _require_sudo_to_modify_owner(current_user, user.role, action="change permissions for")
-    
-    # Check if permission already exists
-    existing = db.query(UserTabPermission).filter(
-        UserTabPermission.user_id == user_id,
-        UserTabPermission.tab_name == permission_data.tab_name
-    ).first()
-    
-    if existing:
-        existing.enabled = permission_data.enabled
-        db.commit()
-        db.refresh(existing)
-        return UserTabPermissionSchema.model_validate(existing, from_attributes=True)
-    
-    # Create new permission
-    permission = UserTabPermission(
-        user_id=user_id,
-        tab_name=permission_data.tab_name,
-        enabled=permission_data.enabled
-    )
-    db.add(permission)
-    db.commit()
-    db.refresh(permission)
-    return UserTabPermissionSchema.model_validate(permission, from_attributes=True)
+    _require_sudo_to_modify_owner(current_user, target[0], action="change permissions for")
+    
+    row = (await db.execute(
+        _Q_UPSERT_USER_TAB_PERMISSION,
+        {
+            "id": uuid7(),
+            "user_id": user_id,
+            "tab_name": permission_data.tab_name,
+            "enabled": permission_data.enabled,
+        },
+    )).fetchone()
+    await db.commit()
+    invalidate_tab_permissions(user_id, org_id)
+    return _row_to_tab_permission_schema(row)
 
 
 @router.patch("/{user_id}/tabs/{tab_name}", response_model=UserTabPermissionSchema)
-def update_user_tab_permission(
+async def update_user_tab_permission(
     user_id: UUID,
     tab_name: str,
     permission_update: UserTabPermissionUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(_require_admin)
 ):
     """Update tab permission for a user (admin only)"""
-    # Only admins/owners can manage user permissions
-    if current_user.role not in [UserRole.ADMIN, UserRole.OWNER] and not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admins can manage user permissions"
-        )
     
     # Get selected org_id from user object (set by get_current_user)
     org_id = getattr(current_user, 'selected_org_id', current_user.org_id)
     
-    # Verify user belongs to same org
-    user = db.query(User).filter(
-        User.id == user_id,
-        User.org_id == org_id
-    ).first()
+    # Verify user belongs to same org and load the permission in the same statement
+    target = (await db.execute(
+        _Q_USER_ROLE_WITH_TAB_PERMISSION,
+        {"user_id": user_id, "org_id": org_id, "tab_name": tab_name},
+    )).fetchone()
     
-    if not user:
+    if not target:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
 
-    _require_sudo_to_modify_owner(current_user, user.role, action="change permissions for")
+    _require_sudo_to_modify_owner(current_user, target[0], action="change permissions for")
     
-    permission = db.query(UserTabPermission).filter(
-        UserTabPermission.user_id == user_id,
-        UserTabPermission.tab_name == tab_name
-    ).first()
-    
-    if not permission:
+    if target[1] is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Permission not found"
         )
     
-    if permission_update.enabled is not None:
-        permission.enabled = permission_update.enabled
+    if permission_update.enabled is None:
+        return _row_to_tab_permission_schema(target[1:])
     
-    db.commit()
-    db.refresh(permission)
-    return UserTabPermissionSchema.model_validate(permission, from_attributes=True)
+    row = (await db.execute(
+        _Q_UPDATE_USER_TAB_PERMISSION,
+        {"id": target[1], "enabled": permission_update.enabled},
+    )).fetchone()
+    await db.commit()
+    invalidate_tab_permissions(user_id, org_id)
+    return _row_to_tab_permission_schema(row)
 
 
 @router.delete("/{user_id}/tabs/{tab_name}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user_tab_permission(
+async def delete_user_tab_permission(
     user_id: UUID,
     tab_name: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(_require_admin)
 ):
     """Delete user-specific tab permission (falls back to org permissions)"""
-    # Only admins/owners can manage user permissions
-    if current_user.role not in [UserRole.ADMIN, UserRole.OWNER] and not current_user.is_admin:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Only admins can manage user permissions"
-        )
     
     # Get selected org_id from user object (set by get_current_user)
     org_id = getattr(current_user, 'selected_org_id', current_user.org_id)
     
-    # Verify user belongs to same org
-    user = db.query(User).filter(
-        User.id == user_id,
-        User.org_id == org_id
-    ).first()
+    # Verify user belongs to same org and load the permission in the same statement
+    target = (await db.execute(
+        _Q_USER_ROLE_WITH_TAB_PERMISSION,
+        {"user_id": user_id, "org_id": org_id, "tab_name": tab_name},
+    )).fetchone()
     
-    if not user:
+    if not target:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
 
-    _require_sudo_to_modify_owner(current_user, user.role, action="change permissions for")
-    
-    permission = db.query(UserTabPermission).filter(
-        UserTabPermission.user_id == user_id,
-        UserTabPermission.tab_name == tab_name
-    ).first()
+    _require_sudo_to_modify_owner(current_user, target[0], action="change permissions for")
     
-    if permission:
-        db.delete(permission)
-        db.commit()
+    if target[1] is not None:
+        await db.execute(_Q_DELETE_USER_TAB_PERMISSION, {"id": target[1]})
+        await db.commit()
+        invalidate_tab_permissions(user_id, org_id)
     
     return None
 
@@ -1,19 +1,31 @@
 """
 Stripe webhook handler.
-Verifies webhook signatures and processes events immediately in-request.
+Verifies webhook signatures and stores the event. With RQ long jobs enabled (and
+STRIPE_WEBHOOK_ASYNC) processing is handed to the worker and the request acks at once;
+otherwise events are processed in-request.
 Non-2xx responses are intentional so Stripe retries delivery when we cannot process.
 """
 from fastapi import APIRouter, Request, Header, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import SessionLocal, get_async_db
 from app.core.config import settings
-from app.models.stripe_event import StripeEvent
+from app.core.rate_limit import async_sliding_window_try_acquire
+from app.core.request_ip import get_client_ip
 from app.models.oauth_token import OAuthToken, OAuthProvider
-from datetime import datetime
+from app.services.stripe_connection_cache import (
+    stripe_account_org_cache_get,
+    stripe_account_org_cache_set,
+)
 from typing import Optional
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 # Import stripe only when needed (don't fail on import if stripe package has issues)
@@ -39,59 +51,93 @@ def _json_response(status_code: int, content: str) -> Response:
     return Response(status_code=status_code, content=content)
 
 
+async def _stripe_webhook_rate_limited(request: Request) -> bool:
+    """
+    Per-source-IP sliding window, checked before any DB or signature work. Stripe retries
+    429s with backoff, so a legitimate burst is delayed rather than lost.
+    """
+    limit = settings.STRIPE_WEBHOOK_RATE_LIMIT_PER_MINUTE
+    if limit <= 0:
+        return False
+    ok = await async_sliding_window_try_acquire(
+        f"stripe_webhook:{get_client_ip(request)}", limit, 60
+    )
+    return not ok
+
+
+def _rate_limited_response() -> Response:
+    return Response(status_code=429, content="Too many requests", headers={"Retry-After": "60"})
+
+
 # Per-org webhook route (used when connecting via API key - each org has its own webhook endpoint)
 @router.post("/stripe/org/{org_id}")
 async def stripe_webhook_per_org(
     org_id: str,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     stripe_signature: Optional[str] = Header(None, alias="stripe-signature"),
 ):
     """
     Handle Stripe webhook events for a specific org (per-org webhook created on API key connect).
     Verifies signature using org-specific webhook secret.
     """
+    if await _stripe_webhook_rate_limited(request):
+        return _rate_limited_response()
+
     if not STRIPE_AVAILABLE or stripe is None:
-        print(f"[WEBHOOK] Stripe library not available for org {org_id}")
+        logger.error("Stripe library not available (org %s)", org_id)
         return _json_response(503, "Stripe library not available")
 
     try:
         org_uuid = uuid.UUID(org_id)
     except ValueError:
-        print(f"[WEBHOOK] Invalid org_id in path: {org_id}")
+        logger.warning("Invalid org_id in webhook path: %s", org_id)
         # Permanent bad URL — ack so Stripe stops retrying this endpoint.
         return _json_response(400, "Invalid org")
 
-    oauth_token = db.query(OAuthToken).filter(
-        OAuthToken.provider == OAuthProvider.STRIPE,
-        OAuthToken.org_id == org_uuid,
-        OAuthToken.webhook_secret.isnot(None),
-    ).first()
+    encrypted_secret = await db.scalar(
+        select(OAuthToken.webhook_secret).where(
+            OAuthToken.provider == OAuthProvider.STRIPE,
+            OAuthToken.org_id == org_uuid,
+            OAuthToken.webhook_secret.isnot(None),
+        ).limit(1)
+    )
 
-    if not oauth_token or not oauth_token.webhook_secret:
-        print(f"[WEBHOOK] No webhook secret for org {org_id}")
+    if not encrypted_secret:
+        logger.warning("No webhook secret for org %s", org_id)
         # Retryable: repair endpoint / reconnect may restore the secret.
         return _json_response(500, "Webhook not configured for org")
 
     from app.core.encryption import decrypt_token
-    webhook_secret = decrypt_token(oauth_token.webhook_secret)
+    webhook_secret = decrypt_token(encrypted_secret)
 
     body = await request.body()
     if not stripe_signature:
-        print(f"[WEBHOOK] Missing Stripe-Signature header for org {org_id}")
+        logger.warning("Missing Stripe-Signature header (org %s)", org_id)
         return _json_response(400, "Missing signature")
 
     try:
         event = stripe.Webhook.construct_event(body, stripe_signature, webhook_secret)
     except ValueError as e:
-        print(f"[WEBHOOK] Invalid payload for org {org_id}: {e}")
+        logger.warning("Invalid webhook payload (org %s): %s", org_id, e)
         return _json_response(400, "Invalid payload")
     except stripe.error.SignatureVerificationError as e:
-        print(f"[WEBHOOK] Signature verification failed for org {org_id}: {e}")
+        logger.warning("Signature verification failed (org %s): %s", org_id, e)
         # Wrong/rotated secret — retry so a repaired endpoint can succeed.
         return _json_response(400, "Invalid signature")
 
-    return _process_stripe_event_internal(db, event, org_uuid)
+    await db.close()
+    return await _process_stripe_event_in_threadpool(event, org_uuid)
+
+
+async def _process_stripe_event_in_threadpool(event: dict, org_id: uuid.UUID) -> Response:
+    """Store/process on a sync session off the event loop (stripe_processor is sync ORM)."""
+
+    def _run() -> Response:
+        with SessionLocal() as db:
+            return _process_stripe_event_internal(db, event, org_id)
+
+    return await run_in_threadpool(_run)
 
 
 def _process_stripe_event_internal(db: Session, event: dict, org_id: uuid.UUID):
@@ -100,58 +146,39 @@ def _process_stripe_event_internal(db: Session, event: dict, org_id: uuid.UUID):
     Idempotency: skip only when the event was already processed successfully.
     Failed prior attempts are retried. Processing failures return 500 so Stripe retries.
     """
-    stripe_event = None
+    from app.services.stripe_webhook_jobs import (
+        apply_stored_stripe_event,
+        enqueue_stored_stripe_event,
+        store_stripe_event,
+        stripe_webhook_async_enabled,
+        trim_stripe_event,
+    )
+    # Store and process the same trimmed payload on both the inline and the queued path
+    event = trim_stripe_event(event)
     try:
-        existing_event = db.query(StripeEvent).filter(
-            StripeEvent.stripe_event_id == event["id"],
-            StripeEvent.org_id == org_id
-        ).first()
-
-        if existing_event and existing_event.processed:
+        # INSERT ... ON CONFLICT: atomic against concurrent Stripe retries of the same event
+        stored = store_stripe_event(db, event, org_id)
+        if stored is None:
+            db.rollback()
             return _json_response(200, "Event already processed")
-
-        if existing_event:
-            stripe_event = existing_event
-            stripe_event.payload = event
-            stripe_event.type = event["type"]
-            print(f"[WEBHOOK] Retrying previously failed event {event.get('id')}")
-        else:
-            stripe_event = StripeEvent(
-                org_id=org_id,
-                stripe_event_id=event["id"],
-                type=event["type"],
-                payload=event,
-                processed=False,
-                received_at=datetime.utcnow()
-            )
-            db.add(stripe_event)
+        row_id, inserted = stored
+        if not inserted:
+            logger.info("Retrying previously failed event %s", event.get("id"))
         db.commit()
 
-        from app.services.stripe_processor import process_stripe_event
-        print(f"[WEBHOOK] Processing Stripe event: {event.get('type')} (ID: {event.get('id')}) for org {org_id}")
-        process_stripe_event(db, event, org_id)
-        stripe_event.processed = True
-        stripe_event.processed_at = datetime.utcnow()
-        # Mark org's Stripe data as updated so terminal tab can refetch only when webhook fired
-        token = db.query(OAuthToken).filter(
-            OAuthToken.provider == OAuthProvider.STRIPE,
-            OAuthToken.org_id == org_id,
-        ).first()
-        if token:
-            token.last_webhook_processed_at = datetime.utcnow()
-        db.commit()
-        print(f"[WEBHOOK] ✅ Processed event {event.get('id')} ({event.get('type')})")
+        if stripe_webhook_async_enabled():
+            # Row is committed; the worker applies it (and its sweep retries if the job is lost).
+            enqueue_stored_stripe_event(row_id)
+            logger.info("Queued event %s (%s) for org %s", event.get("id"), event.get("type"), org_id)
+            return _json_response(200, "Webhook queued")
+
+        apply_stored_stripe_event(db, row_id, org_id, event)
+        logger.info("Processed event %s (%s) for org %s", event.get("id"), event.get("type"), org_id)
         return _json_response(200, "Webhook received")
-    except Exception as e:
-        import traceback
-        print(f"[WEBHOOK] ❌ ERROR processing event: {e}")
-        print(traceback.format_exc())
-        try:
-            if stripe_event is not None:
-                stripe_event.processed = False
-                db.commit()
-        except Exception:
-            db.rollback()
+    except Exception:
+        logger.exception("Error processing Stripe event %s for org %s", event.get("id"), org_id)
+        # The stored row stays processed=False; a redelivery (or the worker sweep) retries it.
+        db.rollback()
         # Non-2xx so Stripe retries delivery instead of permanently dropping the event.
         return _json_response(500, "Webhook processing failed")
 
@@ -159,29 +186,29 @@ def _process_stripe_event_internal(db: Session, event: dict, org_id: uuid.UUID):
 @router.post("/stripe")
 async def stripe_webhook(
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     stripe_signature: Optional[str] = Header(None, alias="stripe-signature")
 ):
     """
     Platform Stripe webhook (Connect / single-account).
     Prefer per-org endpoints at /webhooks/stripe/org/{org_id} for API-key multi-tenant.
     """
-    print(f"[WEBHOOK] Received platform webhook request")
-    print(f"[WEBHOOK] Has signature header: {stripe_signature is not None}")
+    if await _stripe_webhook_rate_limited(request):
+        return _rate_limited_response()
 
     if not STRIPE_AVAILABLE or stripe is None:
-        print(f"[WEBHOOK] ❌ ERROR: Stripe library not available")
+        logger.error("Stripe library not available")
         return _json_response(503, "Stripe library not available")
 
     if not settings.STRIPE_WEBHOOK_SECRET:
-        print(f"[WEBHOOK] ❌ ERROR: STRIPE_WEBHOOK_SECRET not configured in .env")
-        print(f"[WEBHOOK] For local development: Run 'stripe listen --forward-to localhost:8000/webhooks/stripe'")
-        print(f"[WEBHOOK] Then copy the webhook signing secret (whsec_...) from the output and add it to .env")
+        # Local dev: `stripe listen --forward-to localhost:8000/webhooks/stripe`, then put the
+        # printed whsec_... signing secret in .env
+        logger.error("STRIPE_WEBHOOK_SECRET not configured")
         return _json_response(500, "Webhook secret not configured")
 
     body = await request.body()
     if not stripe_signature:
-        print(f"[WEBHOOK] ❌ Missing Stripe-Signature header")
+        logger.warning("Missing Stripe-Signature header")
         return _json_response(400, "Missing signature")
 
     try:
@@ -191,49 +218,57 @@ async def stripe_webhook(
             settings.STRIPE_WEBHOOK_SECRET
         )
     except ValueError as e:
-        print(f"[WEBHOOK] ❌ Invalid payload: {str(e)}")
+        logger.warning("Invalid webhook payload: %s", e)
         return _json_response(400, "Invalid payload")
     except stripe.error.SignatureVerificationError as e:
-        print(f"[WEBHOOK] ❌ Signature verification failed: {str(e)}")
-        print(f"[WEBHOOK] Make sure STRIPE_WEBHOOK_SECRET is set correctly in .env")
+        logger.warning("Signature verification failed (check STRIPE_WEBHOOK_SECRET): %s", e)
         return _json_response(400, "Invalid signature")
 
     try:
         event_account_id = event.get("account")
 
         if event_account_id:
-            stripe_oauth = db.query(OAuthToken).filter(
-                OAuthToken.provider == OAuthProvider.STRIPE,
-                OAuthToken.account_id == event_account_id
-            ).first()
-
-            if stripe_oauth:
-                org_id = stripe_oauth.org_id
-                print(f"[WEBHOOK] Matched event account {event_account_id} to org {org_id}")
+            matched_org_id = stripe_account_org_cache_get(event_account_id)
+            if matched_org_id is None:
+                matched_org_id = await db.scalar(
+                    select(OAuthToken.org_id).where(
+                        OAuthToken.provider == OAuthProvider.STRIPE,
+                        OAuthToken.account_id == event_account_id
+                    ).limit(1)
+                )
+                if matched_org_id:
+                    stripe_account_org_cache_set(event_account_id, matched_org_id)
+
+            if matched_org_id:
+                org_id = matched_org_id
+                logger.debug("Matched event account %s to org %s", event_account_id, org_id)
             else:
                 # Unknown Connect account — do not ack as success or we lose the event forever
                 # if the org connects later in the retry window.
-                print(f"[WEBHOOK] No org matched for Stripe account {event_account_id}")
+                logger.warning("No org matched for Stripe account %s", event_account_id)
                 return _json_response(404, "No matching Stripe account")
         else:
             # Direct (non-Connect) platform webhook: only safe when exactly one Stripe token exists.
-            stripe_tokens = db.query(OAuthToken).filter(
-                OAuthToken.provider == OAuthProvider.STRIPE
-            ).all()
-            if len(stripe_tokens) == 1:
-                org_id = stripe_tokens[0].org_id
-                print(f"[WEBHOOK] Event missing account field; using sole Stripe connection (org {org_id})")
+            # Two rows are enough to know it is ambiguous
+            stripe_org_ids = (await db.scalars(
+                select(OAuthToken.org_id).where(
+                    OAuthToken.provider == OAuthProvider.STRIPE
+                ).limit(2)
+            )).all()
+            if len(stripe_org_ids) == 1:
+                org_id = stripe_org_ids[0]
+                logger.info("Event missing account field; using sole Stripe connection (org %s)", org_id)
             else:
-                print(
-                    f"[WEBHOOK] Event missing account field and {len(stripe_tokens)} Stripe connections; "
-                    "use per-org webhook /webhooks/stripe/org/{org_id}"
+                logger.warning(
+                    "Event missing account field and %s Stripe connections; "
+                    "use per-org webhook /webhooks/stripe/org/{org_id}",
+                    "multiple" if stripe_org_ids else "no",
                 )
                 return _json_response(409, "Ambiguous org for event")
 
-        return _process_stripe_event_internal(db, event, org_id)
-    except Exception as e:
-        import traceback
-        print(f"[WEBHOOK] ❌ UNEXPECTED ERROR in webhook handler: {str(e)}")
-        print(f"[WEBHOOK] Full traceback:")
-        print(traceback.format_exc())
+        # Release the lookup connection before the (possibly long) sync processing
+        await db.close()
+        return await _process_stripe_event_in_threadpool(event, org_id)
+    except Exception:
+        logger.exception("Unexpected error in platform Stripe webhook handler")
         return _json_response(500, "Webhook processing failed")
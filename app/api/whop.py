@@ -15,7 +15,7 @@ from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.api.deps import get_current_user, require_admin_or_owner
 from app.models.user import User
-from app.models.oauth_token import OAuthToken, OAuthProvider
+from app.models.oauth_token import OAuthToken, OAuthProvider, upsert_oauth_token
 from app.models.whop_payment import WhopPayment
 from app.core.encryption import encrypt_token
 from app.schemas.whop import (
@@ -87,30 +87,17 @@ def whop_connect(
             detail="Server encryption is not configured (set ENCRYPTION_KEY). Cannot store API keys.",
         )
 
-    existing = (
-        db.query(OAuthToken)
-        .filter(OAuthToken.org_id == org_id, OAuthToken.provider == OAuthProvider.WHOP)
-        .first()
-    )
-    if existing:
-        existing.access_token = enc
-        existing.account_id = body.company_id.strip()
-        existing.refresh_token = None
-        existing.expires_at = None
-        existing.scope = "company_api_key"
-    else:
-        db.add(
-            OAuthToken(
-                org_id=org_id,
-                provider=OAuthProvider.WHOP,
-                account_id=body.company_id.strip(),
-                access_token=enc,
-                refresh_token=None,
-                expires_at=None,
-                scope="company_api_key",
-            )
-        )
     try:
+        upsert_oauth_token(
+            db,
+            org_id,
+            OAuthProvider.WHOP,
+            account_id=body.company_id.strip(),
+            access_token=enc,
+            refresh_token=None,
+            expires_at=None,
+            scope="company_api_key",
+        )
         db.commit()
     except SQLAlchemyError as e:
         db.rollback()
@@ -1,14 +1,117 @@
 """
 Audit logging for security events
+
+Rows are written with their own short-lived session so an audit write never commits
+(or, on failure, rolls back) the caller's transaction. In the API process the writer
+thread started at app startup batches queued rows into a single multi-row INSERT, so the
+request returns before the audit row is committed. Processes that never start the writer
+(RQ worker, scripts) insert synchronously.
 """
-from sqlalchemy.orm import Session
-from app.models.audit_log import AuditLog, AuditEventType
-from typing import Optional
+import logging
+import os
+import queue
+import threading
+import time
 import uuid
+from typing import List, Optional
+
+import orjson
+from sqlalchemy import Text, bindparam, cast, insert
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from app.models.audit_log import AuditEventType, AuditLog
+from app.utils.ids import uuid7
+
+logger = logging.getLogger(__name__)
+
+AUDIT_FLUSH_INTERVAL_SEC = 0.25
+AUDIT_FLUSH_MAX_ROWS = 200
+# Backpressure: past this many unflushed rows (DB down/slow), new events are dropped and
+# counted rather than growing memory or blocking the request.
+AUDIT_QUEUE_MAX_ROWS = 10_000
+
+# details arrive already encoded (orjson, default=str) and are cast to jsonb server-side, so
+# the writer does not decode and re-encode them through SQLAlchemy's JSON serializer.
+_AUDIT_INSERT = insert(AuditLog).values(details=cast(bindparam("details_json", type_=Text), JSONB))
+
+_audit_queue: "queue.Queue[dict]" = queue.Queue(maxsize=AUDIT_QUEUE_MAX_ROWS)
+# pid that owns the writer thread; a forked child (thread not inherited) writes inline.
+_writer_pid: Optional[int] = None
+_writer_guard = threading.Lock()
+_dropped_events = 0
+
+
+def _insert_audit_rows(rows: List[dict]) -> None:
+    """One multi-VALUES INSERT for the whole batch (Core insert + list of dicts)."""
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        db.execute(_AUDIT_INSERT, rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def flush_audit_events(pending: Optional[List[dict]] = None) -> int:
+    """Drain the queue synchronously (writer thread and app shutdown). Returns rows written."""
+    written = 0
+    while True:
+        batch: List[dict] = pending or []
+        pending = None
+        while len(batch) < AUDIT_FLUSH_MAX_ROWS:
+            try:
+                batch.append(_audit_queue.get_nowait())
+            except queue.Empty:
+                break
+        if not batch:
+            return written
+        try:
+            _insert_audit_rows(batch)
+            written += len(batch)
+        except Exception as e:
+            logger.warning("[AUDIT] Failed to write %d security event(s): %s", len(batch), e)
+
+
+def _write_forever() -> None:
+    while True:
+        first = _audit_queue.get()
+        # Let a burst accumulate so it lands in one INSERT.
+        time.sleep(AUDIT_FLUSH_INTERVAL_SEC)
+        flush_audit_events([first])
+
+
+def start_audit_writer() -> None:
+    """Start the per-process audit writer thread once (called from app startup)."""
+    global _writer_pid
+    with _writer_guard:
+        if _writer_pid == os.getpid():
+            return
+        _writer_pid = os.getpid()
+    threading.Thread(target=_write_forever, daemon=True, name="audit-writer").start()
+
+
+def dropped_audit_events() -> int:
+    """Events discarded because the queue was full (since process start)."""
+    return _dropped_events
+
+
+def _enqueue(row: dict) -> None:
+    global _dropped_events
+    try:
+        _audit_queue.put_nowait(row)
+    except queue.Full:
+        _dropped_events += 1
+        if _dropped_events == 1 or _dropped_events % 1000 == 0:
+            logger.warning("[AUDIT] Queue full; dropped %d security event(s) so far", _dropped_events)
 
 
 def log_security_event(
-    db: Session,
+    db: Optional[Session],
     event_type: AuditEventType,
     org_id: uuid.UUID,
     user_id: Optional[uuid.UUID] = None,
@@ -20,9 +123,10 @@ def log_security_event(
 ):
     """
     Log a security event to the audit log.
-    
+
     Args:
-        db: Database session
+        db: Caller's session; unused (the row is written on its own session) and kept
+            so existing call sites stay unchanged
         event_type: Type of security event
         org_id: Organization ID
         user_id: User ID (if applicable)
@@ -32,40 +136,23 @@ def log_security_event(
         user_agent: User agent string
         details: Additional details as a dictionary (will be JSON-encoded)
     """
-    import json
-    
     try:
-        # Use enum value string to avoid SQLAlchemy using enum name instead of value
-        # SQLAlchemy with native PostgreSQL enums uses enum names, but database has lowercase values
-        event_type_value = event_type.value if hasattr(event_type, 'value') else str(event_type)
-        
-        # Use raw SQL insert to bypass SQLAlchemy's enum name conversion
-        from sqlalchemy import text
-        import uuid as uuid_lib
-        audit_id = uuid_lib.uuid4()
-        
-        # Use CAST in SQL to convert string to enum type, avoiding parameter name conflict
-        db.execute(
-            text("""
-                INSERT INTO audit_logs (id, org_id, user_id, event_type, resource_type, resource_id, ip_address, user_agent, details, created_at)
-                VALUES (:id, :org_id, :user_id, CAST(:event_type AS auditeventtype), :resource_type, :resource_id, :ip_address, :user_agent, :details, NOW())
-            """),
-            {
-                "id": audit_id,
-                "org_id": org_id,
-                "user_id": user_id,
-                "event_type": event_type_value,  # Use lowercase value like "api_key_connected"
-                "resource_type": resource_type,
-                "resource_id": resource_id,
-                "ip_address": ip_address,
-                "user_agent": user_agent,
-                "details": json.dumps(details) if details else None
-            }
-        )
-        db.commit()
+        row = {
+            "id": uuid7(),
+            "org_id": org_id,
+            "user_id": user_id,
+            # Lowercase value like "api_key_connected" (the stored form; see AuditLog.event_type)
+            "event_type": event_type.value if hasattr(event_type, "value") else str(event_type),
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "details_json": orjson.dumps(details, default=str).decode() if details else None,
+        }
+        if _writer_pid == os.getpid():
+            _enqueue(row)
+        else:
+            _insert_audit_rows([row])
     except Exception as e:
         # Don't fail the request if audit logging fails
-        # But log the error for debugging
-        print(f"[AUDIT] Failed to log security event: {str(e)}")
-        db.rollback()
-
+        logger.warning("[AUDIT] Failed to log security event: %s", e)
@@ -36,6 +36,17 @@ class Settings(BaseSettings):
     DATABASE_MAX_OVERFLOW: int = 30
     DATABASE_POOL_TIMEOUT: int = 30
     DATABASE_POOL_RECYCLE: int = 1800
+    # Async (asyncpg) pool for `async def` handlers using get_async_db; no overflow so the
+    # total connection budget stays predictable next to the sync pool.
+    ASYNC_DATABASE_POOL_SIZE: int = 25
+    ASYNC_DATABASE_MAX_OVERFLOW: int = 0
+    # Set when DATABASE_URL points at PgBouncer (transaction pooling, e.g. :6432): the app then
+    # opens NullPool connections, disables asyncpg prepared statements and applies statement_timeout
+    # per transaction (SET LOCAL), leaving pooling to PgBouncer.
+    DATABASE_PGBOUNCER: bool = False
+    # Direct (non-pooled) Postgres URL for session-scoped connections such as LISTEN, which never
+    # receive NOTIFYs through a transaction pooler. Defaults to DATABASE_URL unless DATABASE_PGBOUNCER.
+    DATABASE_DIRECT_URL: Optional[str] = None
 
     # Reverse proxy: set True when the API sits behind a load balancer that sets X-Forwarded-For
     TRUST_PROXY_HEADERS: bool = False
@@ -50,6 +61,15 @@ class Settings(BaseSettings):
     # SPAs (funnel analytics polling + terminal widgets) can burst >120/min from one user; too low causes
     # 429 + Retry-After: 60 and looks like "network errors" for ~1 minute. Override on Render via env if needed.
     GLOBAL_API_RATE_LIMIT_PER_MINUTE: int = 480
+    # One JSON log line per request (route, total_ms, db_rtt_count) to find hot/N+1 handlers.
+    REQUEST_TIMING_LOG: bool = True
+    # Audit rows are queued and flushed off the request path by a per-process writer thread.
+    AUDIT_LOG_ASYNC: bool = True
+
+    # Per-admin limit on /users CRUD (shared across workers when REDIS_URL is set); 0 disables.
+    USER_MANAGEMENT_RATE_LIMIT_PER_MINUTE: int = 60
+    # Per-source-IP limit on Stripe webhooks (exempt from the global limit above); 0 disables.
+    STRIPE_WEBHOOK_RATE_LIMIT_PER_MINUTE: int = 600
 
     # Brute-force protection on POST /auth/login (per IP)
     LOGIN_RATE_LIMIT_MAX: int = 30
@@ -66,6 +86,8 @@ class Settings(BaseSettings):
     # Auth
     SECRET_KEY: str = "supersecret_jwt_key_change_in_production"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours; reduce logout frequency
+    # bcrypt cost factor for new password hashes (~2x CPU per +1). Lower on staging/test only.
+    BCRYPT_ROUNDS: int = 12
 
     # Google OAuth (user sign-in / invite signup / account linking)
     GOOGLE_OAUTH_CLIENT_ID: Optional[str] = None
@@ -114,8 +136,16 @@ class Settings(BaseSettings):
     STRIPE_WEBHOOK_SECRET: Optional[str] = None  # Webhook signing secret for signature verification
     # On deploy, ensure Stripe-connected orgs have a live per-org webhook at BACKEND_PUBLIC_URL.
     STRIPE_RECONCILE_WEBHOOKS_ON_STARTUP: bool = True
+    # Per-worker LISTEN on oauth_token_changed so check_stripe_connected can serve from memory.
+    STRIPE_CONNECTED_CACHE_LISTEN: bool = True
     # Worker safety-net: incremental Stripe (+ recent Treasury) catch-up when webhooks miss.
     STRIPE_CATCHUP_INTERVAL_SEC: int = 600
+    # Worker: create upcoming monthly partitions of events / audit_logs (migration 075).
+    PARTITION_MAINTENANCE_INTERVAL_SEC: int = 21600
+    # Worker: recompute funnel_step_daily_counts buckets touched by newly received events (migrations 084/085); 0 disables.
+    FUNNEL_ROLLUP_INTERVAL_SEC: int = 3600
+    # With REDIS_URL + USE_RQ_LONG_JOBS: webhooks store the event and ack; the worker processes it.
+    STRIPE_WEBHOOK_ASYNC: bool = True
     
     # Brevo
     BREVO_CLIENT_ID: Optional[str] = None
@@ -241,6 +271,12 @@ class Settings(BaseSettings):
     
     # Encryption
     ENCRYPTION_KEY: Optional[str] = None
+    # Write Fernet ("v1:") tokens without the extra base64 layer. Every release reads both forms;
+    # enable only once no running (or rollback-target) deploy predates that reader.
+    ENCRYPTION_FERNET_SINGLE_WRAP: bool = False
+    # Write new tokens as AES-256-GCM ("g1:") instead of Fernet ("v1:"). Every release reads both;
+    # enable only once no running (or rollback-target) deploy predates the "g" reader.
+    ENCRYPTION_AESGCM: bool = False
     
     class Config:
         # Prefer repo-root .env when running uvicorn from backend/; also allow backend/.env
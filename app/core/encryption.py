@@ -12,6 +12,11 @@ except ImportError:
     from cryptography.fernet import Fernet
     from app.core.config import settings
     import base64
+    import threading
+
+    # Built on first use; constructing Fernet re-parses the key on every call otherwise.
+    _fernet = None
+    _fernet_lock = threading.Lock()
     
     def get_encryption_key() -> bytes:
         """Get or generate encryption key for OAuth tokens"""
@@ -33,36 +38,41 @@ except ImportError:
         print(f"WARNING: Generated encryption key. Set ENCRYPTION_KEY={key.decode()} in .env")
         return key
     
+    def _get_fernet() -> Fernet:
+        global _fernet
+        if _fernet is None:
+            with _fernet_lock:
+                if _fernet is None:
+                    # A generated key must be reused, or tokens written now could never be read
+                    _fernet = Fernet(get_encryption_key())
+        return _fernet
+    
     def encrypt_token(token: str) -> str:
         """Encrypt a token for storage"""
-        f = Fernet(get_encryption_key())
-        return f.encrypt(token.encode()).decode()
+        return _get_fernet().encrypt(token.encode()).decode()
     
     def decrypt_token(encrypted_token: str, audit_context: dict = None) -> str:
         """Decrypt a stored token"""
-        f = Fernet(get_encryption_key())
-        decrypted = f.decrypt(encrypted_token.encode()).decode()
+        decrypted = _get_fernet().decrypt(encrypted_token.encode()).decode()
         
         if audit_context:
             try:
                 from app.core.audit import log_security_event
                 from app.models.audit_log import AuditEventType
-                db = audit_context.get('db')
-                if db:
-                    log_security_event(
-                        db=db,
-                        event_type=AuditEventType.TOKEN_DECRYPTED,
-                        org_id=audit_context.get('org_id'),
-                        user_id=audit_context.get('user_id'),
-                        resource_type=audit_context.get('resource_type', 'oauth_token'),
-                        resource_id=audit_context.get('resource_id'),
-                        ip_address=audit_context.get('ip_address'),
-                        user_agent=audit_context.get('user_agent'),
-                        details={
-                            "token_prefix": decrypted[:10] + "..." if len(decrypted) > 10 else "***",
-                            "token_length": len(decrypted)
-                        }
-                    )
+                log_security_event(
+                    db=audit_context.get('db'),
+                    event_type=AuditEventType.TOKEN_DECRYPTED,
+                    org_id=audit_context.get('org_id'),
+                    user_id=audit_context.get('user_id'),
+                    resource_type=audit_context.get('resource_type', 'oauth_token'),
+                    resource_id=audit_context.get('resource_id'),
+                    ip_address=audit_context.get('ip_address'),
+                    user_agent=audit_context.get('user_agent'),
+                    details={
+                        "token_prefix": decrypted[:10] + "..." if len(decrypted) > 10 else "***",
+                        "token_length": len(decrypted)
+                    }
+                )
             except Exception as e:
                 print(f"[ENCRYPTION] Failed to log token access: {str(e)}")
         
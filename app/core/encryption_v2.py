@@ -8,16 +8,101 @@ Best Practices:
 4. Keys are stored securely (never in code, only in env/secrets)
 5. Automatic key derivation from master key
 """
+from cryptography.exceptions import InvalidTag
 from cryptography.fernet import Fernet, MultiFernet
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.backends import default_backend
 from app.core.config import settings
 import base64
+import binascii
+import functools
 import os
-from typing import Optional, List
+import threading
+from typing import Optional, List, Sequence, Union
 from datetime import datetime
 
+_b64decode = base64.urlsafe_b64decode
+_FERNET_TOKEN_PREFIX = "gAAAAA"
+_AESGCM_NONCE_BYTES = 12
+_AESGCM_AAD = b"oauth_token"
+
+# Rust Fernet binding (same token format, much lower per-call overhead); cryptography's
+# Fernet stays the fallback and is still used for key generation and odd key formats.
+try:
+    import rfernet
+except ImportError:
+    rfernet = None
+
+
+class _RustFernet:
+    """bytes-in/bytes-out adapter over rfernet (which takes and returns str tokens)."""
+
+    def __init__(self, impl):
+        self._impl = impl
+
+    def encrypt(self, data: bytes) -> bytes:
+        return self._impl.encrypt(data).encode()
+
+    def decrypt(self, token: bytes) -> bytes:
+        return self._impl.decrypt(token.decode())
+
+
+def _make_encryptor(key: bytes) -> Union[Fernet, _RustFernet]:
+    if rfernet is not None:
+        try:
+            return _RustFernet(rfernet.Fernet(key.decode()))
+        except Exception:
+            pass
+    return Fernet(key)
+
+
+def _make_decryptor(keys: Sequence[bytes]) -> Union[MultiFernet, _RustFernet]:
+    if rfernet is not None:
+        try:
+            return _RustFernet(rfernet.MultiFernet([k.decode() for k in keys]))
+        except Exception:
+            pass
+    return MultiFernet([Fernet(k) for k in keys])
+
+
+class AESGCMEncryptor:
+    """
+    AES-256-GCM over a key derived (HKDF-SHA256) from a Fernet key.
+
+    Tokens are nonce || ciphertext+tag in urlsafe base64: no Fernet version byte, timestamp,
+    PKCS#7 padding or separate HMAC pass, and the tag authenticates the whole payload.
+    """
+
+    def __init__(self, fernet_key: bytes):
+        derived = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b"sweepos oauth_token aes-gcm",
+        ).derive(_b64decode(fernet_key))
+        self._aead = AESGCM(derived)
+
+    def encrypt(self, data: bytes) -> bytes:
+        nonce = os.urandom(_AESGCM_NONCE_BYTES)
+        return base64.urlsafe_b64encode(nonce + self._aead.encrypt(nonce, data, _AESGCM_AAD))
+
+    def decrypt(self, token: bytes) -> bytes:
+        raw = _b64decode(token)
+        return self._aead.decrypt(raw[:_AESGCM_NONCE_BYTES], raw[_AESGCM_NONCE_BYTES:], _AESGCM_AAD)
+
+
+def _aesgcm_decrypt(encryptors: Sequence[AESGCMEncryptor], token: bytes) -> bytes:
+    """Try each key's AES-GCM cipher (primary first, like MultiFernet)."""
+    for encryptor in encryptors:
+        try:
+            return encryptor.decrypt(token)
+        except InvalidTag:
+            continue
+    raise InvalidTag()
+
 
 class EncryptionKeyManager:
     """Manages encryption keys with rotation support"""
@@ -25,10 +110,21 @@ class EncryptionKeyManager:
     def __init__(self):
         self._keys: List[bytes] = []
         self._current_key_version: int = 1
+        self.reload()
+
+    def reload(self):
+        """Re-read keys from the environment and rebuild the cached Fernet objects."""
         self._load_keys()
+        # Built once: constructing Fernet re-parses the key and sets up cipher state.
+        self._encryptor = _make_encryptor(self._keys[0])
+        # Try all keys (oldest to newest for rotation)
+        self._decryptor = _make_decryptor(list(reversed(self._keys)))
+        self._aead_encryptors = [AESGCMEncryptor(k) for k in self._keys]
+        _decrypt_cached.cache_clear()
     
     def _load_keys(self):
         """Load encryption keys from environment"""
+        self._keys = []
         # Primary key (required)
         primary_key = self._get_primary_key()
         if primary_key:
@@ -63,41 +159,43 @@ class EncryptionKeyManager:
         
         key_str = key_str.strip()
         
-        # Check if it's a valid Fernet key (44 chars base64-encoded)
+        # A Fernet key is 44 chars (urlsafe base64 of 32 bytes)
         if len(key_str) == 44:
-            try:
-                return key_str.encode()
-            except:
-                pass
+            return key_str.encode()
         
-        # Try base64 decode
+        # Standard base64 of 32 raw bytes: re-encode into the urlsafe form Fernet expects
         try:
-            decoded = base64.b64decode(key_str)
-            if len(decoded) == 32:  # Fernet keys are 32 bytes
-                return decoded
-        except:
-            pass
+            decoded = base64.b64decode(key_str, validate=True)
+        except (binascii.Error, ValueError):
+            decoded = b""
+        if len(decoded) == 32:
+            return base64.urlsafe_b64encode(decoded)
         
-        # Try as direct Fernet key
-        try:
-            return key_str.encode()
-        except:
-            raise ValueError(f"Invalid encryption key format: {key_str[:10]}...")
+        raise ValueError(f"Invalid encryption key format: {key_str[:10]}...")
     
-    def get_encryptor(self) -> Fernet:
+    def get_encryptor(self) -> Union[Fernet, _RustFernet]:
         """Get the primary encryptor (uses current key)"""
         if not self._keys:
             raise ValueError("No encryption keys available")
-        return Fernet(self._keys[0])
+        return self._encryptor
     
-    def get_decryptor(self) -> MultiFernet:
+    def get_decryptor(self) -> Union[MultiFernet, _RustFernet]:
         """Get a decryptor that can handle multiple key versions"""
         if not self._keys:
             raise ValueError("No encryption keys available")
-        
-        # Create Fernet instances for all keys (oldest to newest for rotation)
-        fernets = [Fernet(key) for key in reversed(self._keys)]
-        return MultiFernet(fernets)
+        return self._decryptor
+    
+    def get_aead_encryptor(self) -> AESGCMEncryptor:
+        """AES-GCM cipher for the primary key (new tokens)"""
+        if not self._keys:
+            raise ValueError("No encryption keys available")
+        return self._aead_encryptors[0]
+
+    def get_aead_decryptors(self) -> List[AESGCMEncryptor]:
+        """AES-GCM ciphers for every configured key, primary first"""
+        if not self._keys:
+            raise ValueError("No encryption keys available")
+        return self._aead_encryptors
     
     def get_current_key_version(self) -> int:
         """Get the current key version number"""
@@ -106,14 +204,19 @@ class EncryptionKeyManager:
 
 # Global key manager instance
 _key_manager: Optional[EncryptionKeyManager] = None
+_key_manager_lock = threading.Lock()
 
 
 def get_key_manager() -> EncryptionKeyManager:
     """Get or create the encryption key manager"""
     global _key_manager
-    if _key_manager is None:
-        _key_manager = EncryptionKeyManager()
-    return _key_manager
+    manager = _key_manager
+    if manager is None:
+        with _key_manager_lock:
+            if _key_manager is None:
+                _key_manager = EncryptionKeyManager()
+            manager = _key_manager
+    return manager
 
 
 def encrypt_token(token: str, key_version: Optional[int] = None) -> str:
@@ -128,16 +231,43 @@ def encrypt_token(token: str, key_version: Optional[int] = None) -> str:
         Base64-encoded encrypted token with version prefix
     """
     manager = get_key_manager()
-    encryptor = manager.get_encryptor()
+    version = key_version or manager.get_current_key_version()
+
+    # "g" marks AES-GCM; "v" tokens (Fernet) remain readable and are written when disabled
+    if getattr(settings, "ENCRYPTION_AESGCM", False):
+        encrypted_str = manager.get_aead_encryptor().encrypt(token.encode()).decode('ascii')
+        return f"g{version}:{encrypted_str}"
     
-    encrypted = encryptor.encrypt(token.encode())
-    encrypted_str = base64.urlsafe_b64encode(encrypted).decode()
+    encrypted = manager.get_encryptor().encrypt(token.encode())
+    if getattr(settings, "ENCRYPTION_FERNET_SINGLE_WRAP", False):
+        # A Fernet token is already urlsafe base64; store it as-is after the prefix
+        encrypted_str = encrypted.decode('ascii')
+    else:
+        # Double-wrapped form every deployed reader understands (see ENCRYPTION_FERNET_SINGLE_WRAP)
+        encrypted_str = base64.urlsafe_b64encode(encrypted).decode('ascii')
     
     # Prefix with key version for tracking
-    version = key_version or manager.get_current_key_version()
     return f"v{version}:{encrypted_str}"
 
 
+@functools.lru_cache(maxsize=1024)
+def _decrypt_cached(encrypted_data: str, aead: bool = False) -> str:
+    """
+    Ciphertext -> plaintext for recently read tokens (stored ciphertext is stable per row).
+    Failures raise and are therefore never cached; cleared when keys reload.
+    """
+    encrypted_bytes = encrypted_data.encode()
+    if aead:
+        return _aesgcm_decrypt(get_key_manager().get_aead_decryptors(), encrypted_bytes).decode()
+    # Fernet tokens start with version byte 0x80 ("gAAAAA" in base64). Rows written before
+    # the single-wrap format wrapped the token in another base64 layer ("Z0FBQUFB...").
+    if not encrypted_data.startswith(_FERNET_TOKEN_PREFIX):
+        encrypted_bytes = _b64decode(encrypted_bytes)
+    
+    # Try decryption with all available keys (MultiFernet handles this)
+    return get_key_manager().get_decryptor().decrypt(encrypted_bytes).decode()
+
+
 def decrypt_token(encrypted_token: str, audit_context: dict = None) -> str:
     """
     Decrypt a stored token (supports multiple key versions for rotation).
@@ -149,31 +279,18 @@ def decrypt_token(encrypted_token: str, audit_context: dict = None) -> str:
     Returns:
         Decrypted token string
     """
-    manager = get_key_manager()
-    decryptor = manager.get_decryptor()
-    
-    # Handle version prefix (v1:encrypted_data or just encrypted_data)
-    if encrypted_token.startswith('v'):
-        # New format with version prefix
-        parts = encrypted_token.split(':', 1)
-        if len(parts) == 2:
-            version_str, encrypted_data = parts
-            version = int(version_str[1:]) if version_str[1:].isdigit() else None
-        else:
-            encrypted_data = encrypted_token
-            version = None
+    # Handle version prefix (v1: Fernet, g1: AES-GCM); legacy tokens have none (':' is not base64)
+    head, sep, body = encrypted_token.partition(':')
+    aead = bool(sep) and head[:1] == 'g'
+    if sep and head[:1] in ('v', 'g'):
+        encrypted_data = body
+        version = int(head[1:]) if head[1:].isdigit() else None
     else:
-        # Legacy format (no version prefix)
         encrypted_data = encrypted_token
         version = None
     
     try:
-        # Decode base64
-        encrypted_bytes = base64.urlsafe_b64decode(encrypted_data.encode())
-        
-        # Try decryption with all available keys (MultiFernet handles this)
-        decrypted = decryptor.decrypt(encrypted_bytes)
-        decrypted_str = decrypted.decode()
+        decrypted_str = _decrypt_cached(encrypted_data, aead)
         
         # Log token access if audit context provided
         if audit_context:
@@ -181,23 +298,21 @@ def decrypt_token(encrypted_token: str, audit_context: dict = None) -> str:
                 from app.core.audit import log_security_event
                 from app.models.audit_log import AuditEventType
                 
-                db = audit_context.get('db')
-                if db:
-                    log_security_event(
-                        db=db,
-                        event_type=AuditEventType.TOKEN_DECRYPTED,
-                        org_id=audit_context.get('org_id'),
-                        user_id=audit_context.get('user_id'),
-                        resource_type=audit_context.get('resource_type', 'oauth_token'),
-                        resource_id=audit_context.get('resource_id'),
-                        ip_address=audit_context.get('ip_address'),
-                        user_agent=audit_context.get('user_agent'),
-                        details={
-                            "key_version": version or "legacy",
-                            "token_prefix": decrypted_str[:10] + "..." if len(decrypted_str) > 10 else "***",
-                            "token_length": len(decrypted_str)
-                        }
-                    )
+                log_security_event(
+                    db=audit_context.get('db'),
+                    event_type=AuditEventType.TOKEN_DECRYPTED,
+                    org_id=audit_context.get('org_id'),
+                    user_id=audit_context.get('user_id'),
+                    resource_type=audit_context.get('resource_type', 'oauth_token'),
+                    resource_id=audit_context.get('resource_id'),
+                    ip_address=audit_context.get('ip_address'),
+                    user_agent=audit_context.get('user_agent'),
+                    details={
+                        "key_version": version or "legacy",
+                        "token_prefix": decrypted_str[:10] + "..." if len(decrypted_str) > 10 else "***",
+                        "token_length": len(decrypted_str)
+                    }
+                )
             except Exception as e:
                 # Don't fail decryption if audit logging fails
                 print(f"[ENCRYPTION] Failed to log token access: {str(e)}")
@@ -0,0 +1,62 @@
+"""
+Process-wide logging setup.
+
+Records are handed to a QueueHandler on the root logger and written by a QueueListener
+thread, so blocking stream I/O never runs on the request thread or the event loop.
+"""
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from typing import Optional
+
+LOG_FORMAT = "%(levelname)s %(name)s %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[logging.handlers.QueueHandler] = None
+_hooks_registered = False
+_guard = threading.Lock()
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Install the queue handler once per process; later calls are no-ops."""
+    global _listener, _handler, _hooks_registered
+    with _guard:
+        if _listener is not None:
+            return
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(logging.Formatter(LOG_FORMAT))
+        _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+
+        root = logging.getLogger()
+        _handler = logging.handlers.QueueHandler(log_queue)
+        root.addHandler(_handler)
+        root.setLevel(level)
+        _listener.start()
+        if not _hooks_registered:
+            atexit.register(stop_logging)
+            # The listener thread does not survive fork (e.g. gunicorn --preload); restart it.
+            os.register_at_fork(after_in_child=_restart_listener_in_child)
+            _hooks_registered = True
+
+
+def _restart_listener_in_child() -> None:
+    if _listener is not None:
+        _listener._thread = None
+        _listener.start()
+
+
+def stop_logging() -> None:
+    """Detach the root queue handler, flush queued records and stop the listener thread."""
+    global _listener, _handler
+    with _guard:
+        listener, _listener = _listener, None
+        handler, _handler = _handler, None
+    if handler is not None:
+        logging.getLogger().removeHandler(handler)
+    if listener is not None:
+        listener.stop()
@@ -3,18 +3,19 @@ Sliding-window rate limiting for API endpoints.
 
 - **In-memory** (default): single-process; suitable for dev and single-worker uvicorn.
 - **Redis** (set REDIS_URL): shared across workers/instances for production with Gunicorn or replicas.
+  One atomic Lua script per check; async callers use async_sliding_window_try_acquire.
 
 Use check_sliding_window() inside handlers for precise control; @rate_limit for decorators.
 """
 from __future__ import annotations
 
+import asyncio
 import inspect
 import logging
 import threading
 import time
 import uuid
-from collections import defaultdict
-from datetime import datetime, timedelta
+from collections import defaultdict, deque
 from functools import wraps
 from typing import Callable, Optional
 
@@ -22,12 +23,21 @@ from fastapi import HTTPException, Request, status
 
 _log = logging.getLogger(__name__)
 
-# In-memory store: {identifier: [(timestamp, 1), ...]}
-_rate_limit_store: dict = defaultdict(list)
-_rate_limit_lock = threading.Lock()
+# In-memory store: {identifier: deque of time.monotonic() stamps, oldest first}. A deque
+# never holds more than max_requests stamps: a full window rejects instead of appending.
+_rate_limit_store: dict[str, deque] = defaultdict(deque)
+# Striped locks: an identifier's deque is only touched under its stripe, so unrelated
+# callers do not serialize on one process-wide lock.
+_LOCK_STRIPES = 64
+_rate_limit_locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
 
-_last_cleanup = datetime.utcnow()
-_cleanup_interval = timedelta(minutes=5)
+_CLEANUP_INTERVAL_SEC = 300.0
+_IDLE_TTL_SEC = 3600.0
+_last_cleanup = time.monotonic()
+
+
+def _lock_for(identifier: str) -> threading.Lock:
+    return _rate_limit_locks[hash(identifier) & (_LOCK_STRIPES - 1)]
 
 # None = not initialized; False = init failed (skip Redis until process restart)
 _redis_client: object = None
@@ -67,68 +77,152 @@ def _get_redis():
             return None
 
 
+def get_redis_client():
+    """Shared REDIS_URL client (decode_responses=True) for small caches; None when unavailable."""
+    return _get_redis()
+
+
 def _cleanup_old_entries():
-    """Remove in-memory entries older than 1 hour."""
-    global _last_cleanup, _rate_limit_store
+    """Drop identifiers idle for over an hour (their newest stamp is older than that)."""
+    global _last_cleanup
 
-    now = datetime.utcnow()
-    if now - _last_cleanup < _cleanup_interval:
+    now = time.monotonic()
+    if now - _last_cleanup < _CLEANUP_INTERVAL_SEC:
         return
 
-    with _rate_limit_lock:
-        _last_cleanup = now
-        cutoff_time = now - timedelta(hours=1)
-
-        for key in list(_rate_limit_store.keys()):
-            _rate_limit_store[key] = [
-                (ts, count) for ts, count in _rate_limit_store[key] if ts > cutoff_time
-            ]
-            if not _rate_limit_store[key]:
+    _last_cleanup = now
+    cutoff = now - _IDLE_TTL_SEC
+    # Snapshot without a global lock; each removal re-checks under the key's stripe.
+    for key, dq in list(_rate_limit_store.items()):
+        if dq and dq[-1] > cutoff:
+            continue
+        with _lock_for(key):
+            dq = _rate_limit_store.get(key)
+            if dq is not None and (not dq or dq[-1] <= cutoff):
                 del _rate_limit_store[key]
 
 
 def _memory_try_acquire(identifier: str, max_requests: int, window_seconds: int) -> bool:
-    now = datetime.utcnow()
-    window_start = now - timedelta(seconds=window_seconds)
-
-    with _rate_limit_lock:
-        _rate_limit_store[identifier] = [
-            (ts, c) for ts, c in _rate_limit_store[identifier] if ts > window_start
-        ]
-        recent = [ts for ts, _ in _rate_limit_store[identifier]]
-        if len(recent) >= max_requests:
+    now = time.monotonic()
+    window_start = now - window_seconds
+
+    with _lock_for(identifier):
+        dq = _rate_limit_store[identifier]
+        # Stamps are appended in order, so expired ones are always at the left end
+        while dq and dq[0] <= window_start:
+            dq.popleft()
+        if len(dq) >= max_requests:
             return False
-        _rate_limit_store[identifier].append((now, 1))
+        dq.append(now)
         return True
 
 
+# Prune, count and record in one atomic round trip. Scores are epoch milliseconds.
+_SLIDING_WINDOW_LUA = """
+local key = KEYS[1]
+local window_ms = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local now_ms = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now_ms - window_ms)
+if redis.call('ZCARD', key) >= limit then
+    return 0
+end
+redis.call('ZADD', key, now_ms, ARGV[4])
+redis.call('PEXPIRE', key, window_ms + 60000)
+return 1
+"""
+
+_redis_script = None
+
+# None = not initialized; False = init failed (skip Redis until process restart)
+_async_redis_client: object = None
+_async_redis_script = None
+_async_redis_init_lock: Optional[asyncio.Lock] = None
+
+
+def _sliding_window_args(identifier: str, max_requests: int, window_seconds: int):
+    return (
+        [f"rl:{identifier}"],
+        [window_seconds * 1000, max_requests, int(time.time() * 1000), uuid.uuid4().hex],
+    )
+
+
 def _redis_try_acquire(identifier: str, max_requests: int, window_seconds: int) -> Optional[bool]:
     """
     Try Redis sliding window. Returns True/False if Redis worked, None if Redis unavailable.
     """
+    global _redis_script
     r = _get_redis()
     if r is None:
         return None
-    now = time.time()
-    window_start = now - window_seconds
-    key = f"rl:{identifier}"
     try:
-        pipe = r.pipeline()
-        pipe.zremrangebyscore(key, "-inf", window_start)
-        pipe.zcard(key)
-        _, n = pipe.execute()
-        if n >= max_requests:
-            return False
-        pipe = r.pipeline()
-        pipe.zadd(key, {str(uuid.uuid4()): now})
-        pipe.expire(key, window_seconds + 60)
-        pipe.execute()
-        return True
+        if _redis_script is None:
+            _redis_script = r.register_script(_SLIDING_WINDOW_LUA)
+        keys, args = _sliding_window_args(identifier, max_requests, window_seconds)
+        return bool(_redis_script(keys=keys, args=args))
     except Exception as e:
         _log.warning("Redis rate limit error, falling back to memory: %s", e)
         return None
 
 
+async def _get_async_redis():
+    """
+    Lazy singleton redis.asyncio client for limits checked on the event loop. Pinged on first
+    use like _get_redis; on failure marked False so later calls go straight to memory instead
+    of each waiting out socket_connect_timeout.
+    """
+    global _async_redis_client, _async_redis_script, _async_redis_init_lock
+    from app.core.config import settings
+
+    if not getattr(settings, "REDIS_URL", None) or _async_redis_client is False:
+        return None
+    if _async_redis_client is not None:
+        return _async_redis_client
+    if _async_redis_init_lock is None:
+        _async_redis_init_lock = asyncio.Lock()
+    async with _async_redis_init_lock:
+        if _async_redis_client is False:
+            return None
+        if _async_redis_client is not None:
+            return _async_redis_client
+        try:
+            import redis.asyncio as aioredis
+
+            client = aioredis.from_url(
+                settings.REDIS_URL,
+                decode_responses=True,
+                socket_connect_timeout=2.0,
+                socket_timeout=2.0,
+                health_check_interval=30,
+            )
+            await client.ping()
+            _async_redis_script = client.register_script(_SLIDING_WINDOW_LUA)
+            _async_redis_client = client
+        except Exception as e:
+            _log.warning("async Redis unavailable for rate limiting, using in-memory store: %s", e)
+            _async_redis_client = False
+            return None
+    return _async_redis_client
+
+
+async def async_sliding_window_try_acquire(
+    identifier: str, max_requests: int, window_seconds: int
+) -> bool:
+    """Async twin of sliding_window_try_acquire: no blocking Redis call on the event loop."""
+    if max_requests <= 0:
+        return True
+
+    if await _get_async_redis() is not None:
+        try:
+            keys, args = _sliding_window_args(identifier, max_requests, window_seconds)
+            return bool(await _async_redis_script(keys=keys, args=args))
+        except Exception as e:
+            _log.warning("Redis rate limit error, falling back to memory: %s", e)
+
+    _cleanup_old_entries()
+    return _memory_try_acquire(identifier, max_requests, window_seconds)
+
+
 def sliding_window_try_acquire(identifier: str, max_requests: int, window_seconds: int) -> bool:
     """
     Record one request for identifier. Returns True if under limit, False if exceeded.
@@ -149,20 +243,25 @@ def _resolve_rate_limit_identifier(
     kwargs,
     *,
     identifier_func: Optional[Callable],
+    request_kw: str = "request",
+    user_kw: str = "current_user",
 ) -> tuple[str, Optional[Request], Optional[object]]:
-    request = None
-    user = None
-
-    for arg in args:
-        if isinstance(arg, Request):
-            request = arg
-            break
-
-    for value in kwargs.values():
-        if isinstance(value, Request):
-            request = value
-        elif hasattr(value, "id") and hasattr(value, "org_id"):
-            user = value
+    # FastAPI passes endpoint params as kwargs, so the named lookup is the normal path.
+    request = kwargs.get(request_kw)
+    user = kwargs.get(user_kw)
+
+    if request is None and user is None:
+        # Compatibility: endpoints naming their Request/User params differently
+        for arg in args:
+            if isinstance(arg, Request):
+                request = arg
+                break
+
+        for value in kwargs.values():
+            if isinstance(value, Request):
+                request = value
+            elif hasattr(value, "id") and hasattr(value, "org_id"):
+                user = value
 
     if identifier_func:
         identifier = identifier_func(request, user)
@@ -178,43 +277,57 @@ def _resolve_rate_limit_identifier(
     return identifier, request, user
 
 
-def _enforce_rate_limit(
+def _audit_rate_limited(
     *,
-    identifier: str,
+    endpoint_name: str,
     max_requests: int,
     window_seconds: int,
-    func_name: str,
-    request: Optional[Request],
     user: Optional[object],
-    db: Optional[object],
+    request: Optional[Request],
 ) -> None:
-    if sliding_window_try_acquire(identifier, max_requests, window_seconds):
+    """Queue a RATE_LIMIT_EXCEEDED row; the audit writer inserts it off the rejection path."""
+    if user is None:
         return
-
     try:
         from app.core.audit import log_security_event
         from app.models.audit_log import AuditEventType
         from app.core.request_ip import get_client_ip
 
-        if db and user and request:
-            log_security_event(
-                db=db,
-                event_type=AuditEventType.RATE_LIMIT_EXCEEDED,
-                org_id=user.org_id,
-                user_id=user.id,
-                resource_type="api_endpoint",
-                resource_id=func_name,
-                ip_address=get_client_ip(request),
-                user_agent=request.headers.get("user-agent") if request else None,
-                details={
-                    "endpoint": func_name,
-                    "max_requests": max_requests,
-                    "window_seconds": window_seconds,
-                },
-            )
+        log_security_event(
+            db=None,
+            event_type=AuditEventType.RATE_LIMIT_EXCEEDED,
+            org_id=getattr(user, "org_id", None),
+            user_id=getattr(user, "id", None),
+            resource_type="api_endpoint",
+            resource_id=endpoint_name,
+            ip_address=get_client_ip(request) if request else None,
+            user_agent=request.headers.get("user-agent") if request else None,
+            details={
+                "endpoint": endpoint_name,
+                "max_requests": max_requests,
+                "window_seconds": window_seconds,
+            },
+        )
     except Exception:
         pass
 
+
+def _reject_rate_limited(
+    *,
+    max_requests: int,
+    window_seconds: int,
+    func_name: str,
+    request: Optional[Request],
+    user: Optional[object],
+) -> None:
+    _audit_rate_limited(
+        endpoint_name=func_name,
+        max_requests=max_requests,
+        window_seconds=window_seconds,
+        user=user,
+        request=request,
+    )
+
     raise HTTPException(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
         detail=(
@@ -224,10 +337,21 @@ def _enforce_rate_limit(
     )
 
 
-def rate_limit(max_requests: int = 5, window_seconds: int = 300, identifier_func: Callable = None):
+def rate_limit(
+    max_requests: int = 5,
+    window_seconds: int = 300,
+    identifier_func: Callable = None,
+    *,
+    request_kw: str = "request",
+    user_kw: str = "current_user",
+):
     """
     Rate limiting decorator for FastAPI endpoints (sync and async).
 
+    The Request and authenticated user are read from the endpoint kwargs named request_kw /
+    user_kw (FastAPI always passes params by name); only when neither is present are the
+    arguments scanned for them.
+
     Identifiers:
     - If identifier_func is set: identifier_func(request, user)
     - Else if authenticated user: user_{id}_{org_id}
@@ -240,17 +364,22 @@ def rate_limit(max_requests: int = 5, window_seconds: int = 300, identifier_func
             @wraps(func)
             async def async_wrapper(*args, **kwargs):
                 identifier, request, user = _resolve_rate_limit_identifier(
-                    args, kwargs, identifier_func=identifier_func
-                )
-                _enforce_rate_limit(
-                    identifier=identifier,
-                    max_requests=max_requests,
-                    window_seconds=window_seconds,
-                    func_name=func.__name__,
-                    request=request,
-                    user=user,
-                    db=kwargs.get("db"),
+                    args,
+                    kwargs,
+                    identifier_func=identifier_func,
+                    request_kw=request_kw,
+                    user_kw=user_kw,
                 )
+                if not await async_sliding_window_try_acquire(
+                    identifier, max_requests, window_seconds
+                ):
+                    _reject_rate_limited(
+                        max_requests=max_requests,
+                        window_seconds=window_seconds,
+                        func_name=func.__name__,
+                        request=request,
+                        user=user,
+                    )
                 return await func(*args, **kwargs)
 
             return async_wrapper
@@ -258,17 +387,20 @@ def rate_limit(max_requests: int = 5, window_seconds: int = 300, identifier_func
         @wraps(func)
         def wrapper(*args, **kwargs):
             identifier, request, user = _resolve_rate_limit_identifier(
-                args, kwargs, identifier_func=identifier_func
-            )
-            _enforce_rate_limit(
-                identifier=identifier,
-                max_requests=max_requests,
-                window_seconds=window_seconds,
-                func_name=func.__name__,
-                request=request,
-                user=user,
-                db=kwargs.get("db"),
+                args,
+                kwargs,
+                identifier_func=identifier_func,
+                request_kw=request_kw,
+                user_kw=user_kw,
             )
+            if not sliding_window_try_acquire(identifier, max_requests, window_seconds):
+                _reject_rate_limited(
+                    max_requests=max_requests,
+                    window_seconds=window_seconds,
+                    func_name=func.__name__,
+                    request=request,
+                    user=user,
+                )
             return func(*args, **kwargs)
 
         return wrapper
@@ -288,6 +420,7 @@ def check_sliding_window(
 ) -> None:
     """
     Enforce sliding-window limit inside route handlers. Raises HTTPException 429 when exceeded.
+    db is accepted for existing call sites; the audit row is written on its own session.
     """
     if max_requests <= 0:
         return
@@ -295,29 +428,13 @@ def check_sliding_window(
     if sliding_window_try_acquire(identifier, max_requests, window_seconds):
         return
 
-    try:
-        if db is not None and audit_user is not None and audit_request is not None:
-            from app.core.audit import log_security_event
-            from app.models.audit_log import AuditEventType
-            from app.core.request_ip import get_client_ip
-
-            log_security_event(
-                db=db,
-                event_type=AuditEventType.RATE_LIMIT_EXCEEDED,
-                org_id=getattr(audit_user, "org_id", None),
-                user_id=getattr(audit_user, "id", None),
-                resource_type="api_endpoint",
-                resource_id=endpoint_name,
-                ip_address=get_client_ip(audit_request) if audit_request else None,
-                user_agent=audit_request.headers.get("user-agent") if audit_request else None,
-                details={
-                    "endpoint": endpoint_name,
-                    "max_requests": max_requests,
-                    "window_seconds": window_seconds,
-                },
-            )
-    except Exception:
-        pass
+    _audit_rate_limited(
+        endpoint_name=endpoint_name,
+        max_requests=max_requests,
+        window_seconds=window_seconds,
+        user=audit_user,
+        request=audit_request,
+    )
 
     raise HTTPException(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
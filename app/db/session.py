@@ -1,26 +1,131 @@
+from uuid import uuid4
+
+import orjson
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.core.config import settings
 
+_USE_PGBOUNCER = bool(getattr(settings, "DATABASE_PGBOUNCER", False))
+
+
+def _pool_kwargs(pool_size: int, max_overflow: int) -> dict:
+    """QueuePool sizing, or NullPool when PgBouncer does the pooling."""
+    if _USE_PGBOUNCER:
+        return {"poolclass": NullPool}
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": getattr(settings, "DATABASE_POOL_TIMEOUT", 30),
+        "pool_recycle": getattr(settings, "DATABASE_POOL_RECYCLE", 1800),
+        "pool_pre_ping": True,
+    }
+
+
+def _executemany_kwargs() -> dict:
+    """psycopg2: page executemany UPDATE/DELETE (ORM flushes of many dirty rows) via execute_batch."""
+    if make_url(settings.DATABASE_URL).get_driver_name() == "psycopg2":
+        return {"executemany_mode": "values_plus_batch"}
+    return {}
+
+
+def _json_dumps(value) -> str:
+    """Bind serializer for JSON/JSONB columns: orjson's C encoder instead of stdlib json.dumps."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def json_safe(value):
+    """
+    Plain JSON copy of ``value`` (e.g. a Stripe object) for a JSON/JSONB column; values JSON
+    cannot represent are stored as ``str(value)``.
+    """
+    return orjson.loads(orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS))
+
+
+# Both engines encode/decode JSON columns with orjson.
+_JSON_KWARGS = {"json_serializer": _json_dumps, "json_deserializer": orjson.loads}
+
 engine = create_engine(
     settings.DATABASE_URL,
     echo=False,
-    pool_size=getattr(settings, "DATABASE_POOL_SIZE", 10),
-    max_overflow=getattr(settings, "DATABASE_MAX_OVERFLOW", 20),
-    pool_timeout=getattr(settings, "DATABASE_POOL_TIMEOUT", 30),
-    pool_recycle=getattr(settings, "DATABASE_POOL_RECYCLE", 1800),
-    pool_pre_ping=True,
+    **_JSON_KWARGS,
+    **_executemany_kwargs(),
+    **_pool_kwargs(
+        getattr(settings, "DATABASE_POOL_SIZE", 10),
+        getattr(settings, "DATABASE_MAX_OVERFLOW", 20),
+    ),
 )
 
-@event.listens_for(engine, "connect")
-def _set_statement_timeout(dbapi_conn, connection_record):
-    cursor = dbapi_conn.cursor()
-    cursor.execute("SET statement_timeout = '120s'")
-    cursor.close()
+STATEMENT_TIMEOUT = "120s"
+
+
+def _set_local_statement_timeout(conn):
+    # PgBouncer transaction pooling hands each transaction a different server connection, so a
+    # session-level SET would leak to other clients; scope it to the transaction instead.
+    conn.exec_driver_sql(f"SET LOCAL statement_timeout = '{STATEMENT_TIMEOUT}'")
+
+
+if _USE_PGBOUNCER:
+    event.listen(engine, "begin", _set_local_statement_timeout)
+else:
+    @event.listens_for(engine, "connect")
+    def _set_statement_timeout(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute(f"SET statement_timeout = '{STATEMENT_TIMEOUT}'")
+        cursor.close()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def _async_database_url():
+    """DATABASE_URL rewritten for asyncpg (libpq `sslmode` is spelled `ssl` there)."""
+    url = make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg")
+    query = dict(url.query)
+    sslmode = query.pop("sslmode", None)
+    if sslmode and "ssl" not in query:
+        query["ssl"] = sslmode
+    return url.set(query=query)
+
+
+def _async_connect_args() -> dict:
+    """asyncpg connect args; PgBouncer mode avoids startup parameters and reused statement names."""
+    if _USE_PGBOUNCER:
+        # PgBouncer rejects unknown startup parameters (server_settings) unless
+        # ignore_startup_parameters is set, and transaction pooling cannot keep named prepared
+        # statements across transactions, so disable both caches and name each statement uniquely.
+        return {
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {
+        "server_settings": {"statement_timeout": STATEMENT_TIMEOUT},
+        # Per-connection cache of parsed/planned statements (module-level text() constants hit it).
+        "prepared_statement_cache_size": 256,
+    }
+
+
+# Async engine (asyncpg) for handlers that are `async def` end-to-end; separate pool from `engine`.
+async_engine = create_async_engine(
+    _async_database_url(),
+    echo=False,
+    **_JSON_KWARGS,
+    **_pool_kwargs(
+        getattr(settings, "ASYNC_DATABASE_POOL_SIZE", 25),
+        getattr(settings, "ASYNC_DATABASE_MAX_OVERFLOW", 0),
+    ),
+    connect_args=_async_connect_args(),
+)
+if _USE_PGBOUNCER:
+    event.listen(async_engine.sync_engine, "begin", _set_local_statement_timeout)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 
@@ -41,3 +146,19 @@ def get_db():
             pass
         db.close()
 
+
+
+async def get_async_db():
+    """Async counterpart of get_db (same always-rollback-on-exit rule)."""
+    db = AsyncSessionLocal()
+    try:
+        yield db
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        try:
+            await db.rollback()
+        except Exception:
+            pass
+        await db.close()
@@ -1,16 +1,29 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import auth, clients, events, oauth, integrations, stripe, whop, finances, webhooks, funnels, admin, users, organizations, encryption, email_ingestion, fathom_webhooks, content_studio, call_library, automations, outreach, calendar_webhooks, resources, auth_google, mcp_oauth, portal, kpi, instagram, close_survey
 from app.mcp import server as mcp_server
 from app.core.config import settings as app_settings
+from app.core.logging_config import configure_logging
 from app.middleware.global_rate_limit import GlobalRateLimitMiddleware
+from app.middleware.request_timing import RequestTimingMiddleware
 import logging
 import threading
 
-app = FastAPI(title="Sweep Coach OS API", version="1.0.0")
+# Log I/O happens on a QueueListener thread, off the event loop and request threads
+configure_logging()
+
+# orjson for every JSON body; uvicorn[standard] already runs on uvloop (loop="auto").
+app = FastAPI(
+    title="Sweep Coach OS API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
 
 # CORS: default localhost + ALLOWED_ORIGINS_EXTRA for production (Render/Vercel)
 _allowed_origins = app_settings.get_allowed_origins()
+# O(1) origin check for the error handler below
+_allowed_origins_set = frozenset(_allowed_origins)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=_allowed_origins,
@@ -21,25 +34,26 @@ app.add_middleware(
 )
 # Global throttle (after CORS registration so this runs first on each request — see Starlette order)
 app.add_middleware(GlobalRateLimitMiddleware)
+# Outermost, so total_ms covers the throttle and CORS as well as the handler
+if getattr(app_settings, "REQUEST_TIMING_LOG", True):
+    app.add_middleware(RequestTimingMiddleware)
 
 # Add exception handler to ensure CORS headers are included even on errors
-from fastapi.responses import JSONResponse
 from fastapi import Request
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Ensure CORS headers are included even on unhandled exceptions"""
-    import logging
     logging.getLogger("app").exception("Unhandled exception on %s %s", request.method, request.url.path)
 
-    response = JSONResponse(
+    response = ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
     )
     
     # Add CORS headers manually (same allowed origins as middleware)
     origin = request.headers.get("origin")
-    if origin and origin in _allowed_origins:
+    if origin and origin in _allowed_origins_set:
         response.headers["Access-Control-Allow-Origin"] = origin
         response.headers["Access-Control-Allow-Credentials"] = "true"
         response.headers["Access-Control-Allow-Methods"] = "*"
@@ -295,6 +309,31 @@ def _ensure_schema_columns_on_startup() -> None:
         db.close()
 
 
+@app.on_event("startup")
+def _start_oauth_token_listener() -> None:
+    """Invalidate the in-process Stripe connection cache on oauth_tokens NOTIFY."""
+    if getattr(app_settings, "STRIPE_CONNECTED_CACHE_LISTEN", True):
+        from app.services.stripe_connection_cache import start_oauth_token_listener
+
+        start_oauth_token_listener()
+
+
+@app.on_event("startup")
+def _start_audit_writer() -> None:
+    """Write security audit rows off the request path."""
+    if getattr(app_settings, "AUDIT_LOG_ASYNC", True):
+        from app.core.audit import start_audit_writer
+
+        start_audit_writer()
+
+
+@app.on_event("shutdown")
+def _flush_audit_events() -> None:
+    from app.core.audit import flush_audit_events
+
+    flush_audit_events()
+
+
 @app.get("/")
 async def root():
     return {"message": "Sweep Coach OS API", "version": "1.0.0"}
@@ -1,7 +1,6 @@
 """Optional global per-IP throttle (sliding 60s window). Disabled when GLOBAL_API_RATE_LIMIT_PER_MINUTE is 0."""
 from __future__ import annotations
 
-from starlette.concurrency import run_in_threadpool
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
@@ -29,19 +28,10 @@ class GlobalRateLimitMiddleware(BaseHTTPMiddleware):
             return await call_next(request)
 
         from app.core.request_ip import get_client_ip
-        from app.core.rate_limit import sliding_window_try_acquire
+        from app.core.rate_limit import async_sliding_window_try_acquire
 
         ip = get_client_ip(request)
-        # Avoid thread-pool hop when Redis is off (in-memory path is cheap).
-        if getattr(settings, "REDIS_URL", None):
-            ok = await run_in_threadpool(
-                sliding_window_try_acquire,
-                f"global:{ip}",
-                limit,
-                60,
-            )
-        else:
-            ok = sliding_window_try_acquire(f"global:{ip}", limit, 60)
+        ok = await async_sliding_window_try_acquire(f"global:{ip}", limit, 60)
         if not ok:
             return JSONResponse(
                 status_code=429,
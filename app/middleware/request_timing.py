@@ -0,0 +1,58 @@
+"""Per-request timing log: matched route, wall time, and DB round-trips (cursor executes)."""
+from __future__ import annotations
+
+import contextvars
+import logging
+import time
+from typing import Optional
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+logger = logging.getLogger(__name__)
+
+# Holds a one-element list rather than an int: sync handlers run in a threadpool with a copied
+# context, so the counter must be mutated in place to be visible back in the middleware.
+_db_rtts: contextvars.ContextVar[Optional[list]] = contextvars.ContextVar("db_rtts", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_db_rtt(conn, cursor, statement, parameters, context, executemany):
+    counter = _db_rtts.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def current_db_rtts() -> int:
+    counter = _db_rtts.get()
+    return counter[0] if counter is not None else 0
+
+
+class RequestTimingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        counter = [0]
+        token = _db_rtts.set(counter)
+        start = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            total_ms = (time.perf_counter() - start) * 1000.0
+            _db_rtts.reset(token)
+            route = request.scope.get("route")
+            logger.info(
+                orjson.dumps(
+                    {
+                        "method": request.method,
+                        "route": getattr(route, "path", None) or request.url.path,
+                        "status": status_code,
+                        "db_rtt_count": counter[0],
+                        "total_ms": round(total_ms, 1),
+                    }
+                ).decode()
+            )
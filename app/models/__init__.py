@@ -12,7 +12,7 @@ from app.models.manual_payment import ManualPayment
 from app.models.client_checkin import ClientCheckIn
 from app.models.organization import Organization
 from app.models.feature import Feature
-from app.models.funnel import Funnel, FunnelStep
+from app.models.funnel import Funnel, FunnelRollupWatermark, FunnelStep, FunnelStepDailyCount
 from app.models.session import Session
 from app.models.event_error import EventError
 from app.models.organization_tab_permission import OrganizationTabPermission
@@ -50,7 +50,7 @@ __all__ = [
     "User", "UserRole", "Client", "Event", "OAuthToken", "Campaign", "Recommendation",
     "StripePayment", "StripeSubscription", "StripeEvent", "StripeTreasuryTransaction",
     "ManualPayment", "ClientCheckIn", "Organization", "Feature",
-    "Funnel", "FunnelStep", "Session", "EventError",
+    "Funnel", "FunnelStep", "FunnelStepDailyCount", "FunnelRollupWatermark", "Session", "EventError",
     "OrganizationTabPermission", "UserTabPermission", "UserOrganization",
     "AuditLog", "AuditEventType",
     "CalendarBookingSales", "EventTypeSalesCall",
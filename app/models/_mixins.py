@@ -0,0 +1,69 @@
+from sqlalchemy import Column, DateTime, String, TypeDecorator, text
+from datetime import datetime
+from decimal import ROUND_HALF_UP, Decimal
+
+# Naive UTC, matching datetime.utcnow() (now() alone would follow the session time zone).
+_UTC_NOW = text("timezone('utc', now())")
+
+
+class TimestampMixin:
+    """
+    created_at / updated_at as naive UTC.
+
+    ORM writes keep the Python defaults (values are set before flush); the server defaults
+    (migration 074) fill rows written by raw SQL, COPY or Core bulk inserts that omit them.
+    """
+
+    created_at = Column(DateTime, default=datetime.utcnow, server_default=_UTC_NOW, nullable=False)
+    updated_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        server_default=_UTC_NOW,
+        nullable=False,
+    )
+
+
+def dollars_to_cents(value):
+    """Dollar amount (Decimal/float/str/int) -> integer cents, rounded half up; None stays None."""
+    if value is None:
+        return None
+    return int((Decimal(str(value)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+class FastEnum(TypeDecorator):
+    """
+    Python enum stored as VARCHAR, like ``Enum(native_enum=False)`` but with the member
+    lookups built once per column type instead of going through Enum's result processors.
+
+    Stores member names (SQLAlchemy's default) unless ``by_value`` is set. Bind accepts
+    members, names and (for ``str`` enums) plain values; unknown strings pass through.
+    """
+
+    impl = String
+    cache_ok = True
+
+    def __init__(self, enum_cls, length=None, by_value=False):
+        self.enum_cls = enum_cls
+        self.by_value = by_value
+        self._to_member = {(m.value if by_value else m.name): m for m in enum_cls}
+        self._to_db = {}
+        for stored, member in self._to_member.items():
+            self._to_db[member.name] = stored
+            self._to_db[member] = stored
+        self.length = length or max(len(k) for k in self._to_member)
+        super().__init__(length=self.length)
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self._to_db.get(value, value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._to_member[value]
+
+    @property
+    def python_type(self):
+        return self.enum_cls
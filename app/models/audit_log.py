@@ -1,9 +1,10 @@
-from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, Text, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
-import uuid
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from datetime import datetime
 import enum
 from app.db.session import Base
+from app.models._mixins import FastEnum
+from app.utils.ids import uuid7
 
 
 class AuditEventType(str, enum.Enum):
@@ -21,18 +22,29 @@ class AuditEventType(str, enum.Enum):
 class AuditLog(Base):
     __tablename__ = "audit_logs"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True, index=True)
-    event_type = Column(SQLEnum(AuditEventType), nullable=False, index=True)
+    # Time-ordered ids keep inserts on the right edge of the pkey index; server default
+    # covers raw SQL writers (migration 078)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=text("gen_random_uuid()"))
+    # Indexed by the (org_id, ...) composite below (migration 072)
+    org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    # varchar + CHECK (migration 071), storing the lowercase values
+    event_type = Column(
+        FastEnum(AuditEventType, length=32, by_value=True),
+        nullable=False,
+    )
     resource_type = Column(String, nullable=True)  # e.g., "stripe", "oauth_token"
     resource_id = Column(String, nullable=True)  # e.g., account_id, token_id
     ip_address = Column(String, nullable=True)
     user_agent = Column(String, nullable=True)
-    details = Column(Text, nullable=True)  # JSON string with additional details
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    details = Column(JSONB, nullable=True)  # Additional details (jsonb since migration 073)
+    # Partition key (migration 075); part of the table's primary key, not the mapper's
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, primary_key=True)
     
     __table_args__ = (
-        {"schema": None},
+        Index("ix_audit_logs_org_created", "org_id", created_at.desc(), postgresql_include=["event_type"]),
+        Index("ix_audit_logs_created_brin", "created_at", postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
+        {"schema": None, "postgresql_partition_by": "RANGE (created_at)"},
     )
+    __mapper_args__ = {"primary_key": [id]}
 
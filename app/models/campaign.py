@@ -1,9 +1,10 @@
-from sqlalchemy import Column, String, DateTime, JSON, Enum as SQLEnum, ForeignKey
+from sqlalchemy import Column, String, DateTime, JSON, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime
 import enum
 from app.db.session import Base
+from app.models._mixins import FastEnum
 
 
 class CampaignStatus(str, enum.Enum):
@@ -18,10 +19,9 @@ class Campaign(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
-    tenant_id = Column(UUID(as_uuid=True), nullable=True)  # Deprecated: use org_id instead
     name = Column(String, nullable=False)
     audience_filter_json = Column(JSON, nullable=True)
     body = Column(String, nullable=True)
-    status = Column(SQLEnum(CampaignStatus), default=CampaignStatus.DRAFT, nullable=False)
+    status = Column(FastEnum(CampaignStatus, length=32), default=CampaignStatus.DRAFT, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, String, DateTime, Numeric, JSON, Integer, Text, ForeignKey, Index, or_, TypeDecorator
+from sqlalchemy import Column, Computed, String, DateTime, Numeric, JSON, Integer, Text, ForeignKey, Index, or_, TypeDecorator
+from sqlalchemy import Float, case, cast, func, text
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
@@ -7,6 +9,7 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 import enum
 from app.db.session import Base
+from app.models._mixins import TimestampMixin, dollars_to_cents
 
 
 def _as_naive_utc(dt: Optional[datetime]) -> Optional[datetime]:
@@ -18,6 +21,10 @@ def _as_naive_utc(dt: Optional[datetime]) -> Optional[datetime]:
     return dt.astimezone(timezone.utc).replace(tzinfo=None)
 
 
+# Generated expression for clients.program_end_date (make_interval is immutable; a text cast is not)
+PROGRAM_END_DATE_SQL = "program_start_date + make_interval(days => program_duration_days)"
+
+
 class LifecycleState(str, enum.Enum):
     COLD_LEAD = "cold_lead"
     NURTURING = "nurturing"
@@ -92,12 +99,11 @@ PRE_PAYMENT_LIFECYCLE_STATES = frozenset(
 LEAD_PIPELINE_LIFECYCLE_STATES = PRE_PAYMENT_LIFECYCLE_STATES
 
 
-class Client(Base):
+class Client(Base, TimestampMixin):
     __tablename__ = "clients"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
-    tenant_id = Column(UUID(as_uuid=True), nullable=True)  # Deprecated: use org_id instead, kept for backward compatibility
     first_name = Column(String, nullable=True)
     last_name = Column(String, nullable=True)
     email = Column(String, index=True, nullable=True)  # Primary email (backward compat)
@@ -111,7 +117,7 @@ class Client(Base):
     )
     last_activity_at = Column(DateTime, nullable=True)
     stripe_customer_id = Column(String, nullable=True, index=True)
-    estimated_mrr = Column(Numeric(10, 2), default=0, nullable=False)
+    estimated_mrr_cents = Column(Integer, default=0, nullable=False)  # migration 076
     lifetime_revenue_cents = Column(Integer, default=0, nullable=False)  # Lifetime revenue in cents
     notes = Column(Text, nullable=True)  # Client notes
     meta = Column(JSON, nullable=True)
@@ -121,11 +127,15 @@ class Client(Base):
     # Program tracking fields
     program_start_date = Column(DateTime, nullable=True)  # When the program started
     program_duration_days = Column(Integer, nullable=True)  # Program duration in days
-    program_end_date = Column(DateTime, nullable=True, index=True)  # Calculated: start_date + duration_days
+    # Generated from start + duration (migration 080); write program_duration_days (or use
+    # set_program_end_date) instead
+    program_end_date = Column(DateTime, Computed(PROGRAM_END_DATE_SQL, persisted=True), index=True)
     program_progress_percent = Column(Numeric(5, 2), nullable=True)  # Calculated progress percentage (0-100)
-    
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Active-client lists and counts; the enum holds both label casings (migration 047/077)
+        Index("ix_clients_active", "org_id", postgresql_where=text("lifecycle_state IN ('active', 'ACTIVE')")),
+    )
     
     def calculate_progress(self) -> Optional[float]:
         """
@@ -137,9 +147,8 @@ class Client(Base):
             return None
 
         now = datetime.utcnow()
-        end_date = _as_naive_utc(self.program_end_date)
-        if end_date is None:
-            end_date = start + timedelta(days=self.program_duration_days)
+        # Same as the generated program_end_date, which is stale until the row is flushed
+        end_date = start + timedelta(days=self.program_duration_days)
 
         if now < start:
             return 0.0
@@ -153,29 +162,59 @@ class Client(Base):
         progress = (elapsed / total_duration) * 100.0
 
         return min(100.0, max(0.0, progress))
+
+    @hybrid_property
+    def progress_percent(self) -> Optional[float]:
+        """calculate_progress() on an instance; a SQL projection on the class (no row loading)."""
+        return self.calculate_progress()
+
+    @progress_percent.expression
+    def progress_percent(cls):
+        # Same rules as calculate_progress; program dates are naive UTC like utcnow()
+        now = func.timezone("utc", func.now())
+        start = cls.program_start_date
+        end = cls.program_end_date
+        total = func.extract("epoch", end - start)
+        elapsed = func.extract("epoch", now - start)
+        return cast(
+            case(
+                (or_(start.is_(None), func.coalesce(cls.program_duration_days, 0) == 0), None),
+                (now < start, 0.0),
+                (now >= end, 100.0),
+                (total <= 0, None),
+                else_=func.least(100.0, func.greatest(0.0, elapsed * 100.0 / total)),
+            ),
+            Float,
+        )
+
+    @hybrid_property
+    def estimated_mrr(self) -> Optional[float]:
+        """Estimated MRR in dollars; assigning dollars stores rounded cents."""
+        return self.estimated_mrr_cents / 100 if self.estimated_mrr_cents is not None else None
+
+    @estimated_mrr.setter
+    def estimated_mrr(self, value) -> None:
+        self.estimated_mrr_cents = dollars_to_cents(value)
+
+    @estimated_mrr.expression
+    def estimated_mrr(cls):
+        return cls.estimated_mrr_cents / 100.0
     
-    def update_program_dates(self):
-        """Update program dates based on start_date and end_date or duration."""
-        if self.program_start_date is not None:
-            self.program_start_date = _as_naive_utc(self.program_start_date)
-        if self.program_end_date is not None:
-            self.program_end_date = _as_naive_utc(self.program_end_date)
-
-        if self.program_start_date and self.program_end_date:
-            # Calculate duration from start and end dates
-            duration = (self.program_end_date - self.program_start_date).days
-            if duration > 0:
-                self.program_duration_days = duration
-            else:
-                self.program_duration_days = None
-                self.program_end_date = None
-        elif self.program_start_date and self.program_duration_days:
-            # Calculate end date from start date and duration
-            self.program_end_date = self.program_start_date + timedelta(days=self.program_duration_days)
-        else:
-            self.program_end_date = None
-            if not self.program_start_date:
-                self.program_duration_days = None
+    def normalize_program_dates(self) -> None:
+        """Store program_start_date as naive UTC and drop a duration that has no start or is not positive."""
+        self.program_start_date = _as_naive_utc(self.program_start_date)
+        if not self.program_start_date or not self.program_duration_days or self.program_duration_days <= 0:
+            self.program_duration_days = None
+
+    def set_program_end_date(self, end_date: Optional[datetime]) -> None:
+        """
+        Record an end date as program_duration_days (whole days after program_start_date). None,
+        a missing start, or an end on/before the start clears the duration.
+        """
+        start = _as_naive_utc(self.program_start_date)
+        end = _as_naive_utc(end_date)
+        days = (end - start).days if start and end else 0
+        self.program_duration_days = days if days > 0 else None
 
     def get_all_emails_normalized(self) -> set:
         """Return set of normalized (lowercase, no whitespace) emails for this client: primary email + emails list."""
@@ -232,4 +271,3 @@ def find_client_by_phone(db: Session, org_id: uuid.UUID, phone: str) -> Optional
         if normalize_phone(c.phone) == target:
             return c
     return None
-
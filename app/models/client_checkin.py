@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey, Boolean, Index, UniqueConstraint, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 import uuid
@@ -13,12 +13,13 @@ class ClientCheckIn(Base):
     """
     __tablename__ = "client_check_ins"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Indexed by the (org_id, ...) composite below (migration 072)
+    org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=False, index=True)
     
     # Calendar event details
-    event_id = Column(String, nullable=False, index=True)  # Calendar event ID (from Cal.com or Calendly)
+    event_id = Column(String, nullable=False)  # Calendar event ID (from Cal.com or Calendly); leads uq_client_check_ins_event_org
     event_uri = Column(String, nullable=True)  # Calendly event URI (if applicable)
     provider = Column(String, nullable=False)  # "calcom" or "calendly"
     title = Column(String, nullable=True)  # Event title
@@ -46,11 +47,24 @@ class ClientCheckIn(Base):
     sale_closed = Column(Boolean, nullable=True)  # True=closed, False=open, None=not set
     
     # Metadata
-    raw_event_data = Column(Text, nullable=True)  # JSON string of full event data for reference
+    raw_event_data = Column(JSONB, nullable=True)  # Full provider event/booking payload for reference
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
-    # Relationships
+    # Relationships (lazy per row; list paths add selectinload/joinedload per query)
     client = relationship("Client", backref="check_ins")
     organization = relationship("Organization", backref="check_ins")
 
+    __table_args__ = (
+        Index("ix_client_check_ins_org_start", "org_id", start_time.desc()),
+        # One check-in per calendar event per org; migration 018
+        UniqueConstraint("event_id", "org_id", name="uq_client_check_ins_event_org"),
+        # Upcoming / open check-ins; migration 077
+        Index(
+            "ix_client_check_ins_pending",
+            "org_id",
+            "start_time",
+            postgresql_where=text("completed = false AND cancelled = false"),
+        ),
+    )
+
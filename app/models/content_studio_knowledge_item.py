@@ -2,16 +2,16 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
 
-from sqlalchemy import Column, String, Text, Integer, DateTime, ForeignKey, Index
+from sqlalchemy import Column, String, Text, Integer, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
+from app.models._mixins import TimestampMixin
 
 
-class ContentStudioKnowledgeItem(Base):
+class ContentStudioKnowledgeItem(Base, TimestampMixin):
     __tablename__ = "content_studio_knowledge_items"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -19,8 +19,6 @@ class ContentStudioKnowledgeItem(Base):
     kind = Column(String(32), nullable=False)  # objection | closing | reframe
     body = Column(Text, nullable=False)
     sort_order = Column(Integer, nullable=False, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     organization = relationship(
         "Organization",
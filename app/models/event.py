@@ -1,24 +1,44 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
-import uuid
 from datetime import datetime
 from app.db.session import Base
+from app.utils.ids import uuid7
 
 
 class Event(Base):
     __tablename__ = "events"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
+    # Time-ordered ids keep inserts on the right edge of the pkey index; server default
+    # covers raw SQL writers (migration 078)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=text("gen_random_uuid()"))
+    # Indexed by the (org_id, ...) composite below (migration 072)
+    org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
     funnel_id = Column(UUID(as_uuid=True), ForeignKey("funnels.id"), nullable=True, index=True)  # For funnel events
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=True, index=True)
     type = Column(String, nullable=False)  # payment, checkin, message, funnel_event
-    event_name = Column(String, nullable=True, index=True)  # For funnel events: page_view, form_submit, etc.
+    event_name = Column(String, nullable=True)  # For funnel events: page_view, form_submit, etc.
     visitor_id = Column(String, nullable=True, index=True)  # Anonymous visitor identifier
     session_id = Column(String, nullable=True, index=True)  # Session identifier
-    payload = Column(JSON, nullable=True)  # Event payload (backward compatibility)
-    event_metadata = Column(JSON, nullable=True)  # Additional event metadata (for funnel events) - renamed from 'metadata' to avoid SQLAlchemy reserved name
-    occurred_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    payload = Column(JSONB, nullable=True)  # Event payload (backward compatibility)
+    event_metadata = Column(JSONB, nullable=True)  # Additional event metadata (for funnel events) - renamed from 'metadata' to avoid SQLAlchemy reserved name
+    # Partition key (migration 075); part of the table's primary key, not the mapper's
+    occurred_at = Column(DateTime, default=datetime.utcnow, nullable=False, primary_key=True)
     received_at = Column(DateTime, default=datetime.utcnow, nullable=False)  # When event was received by API
 
+    __table_args__ = (
+        Index("ix_events_org_occurred", "org_id", occurred_at.desc()),
+        Index("ix_events_occurred_brin", "occurred_at", postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
+        # Funnel rollup refresh scans events received since its watermark; migration 085
+        Index("ix_events_received_brin", "received_at", postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
+        # Idempotency-key lookup (event_metadata @> {...}) in POST /funnels events
+        Index(
+            "ix_events_event_metadata_gin",
+            event_metadata,
+            postgresql_using="gin",
+            postgresql_ops={"event_metadata": "jsonb_path_ops"},
+        ),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+    __mapper_args__ = {"primary_key": [id]}
+
@@ -1,17 +1,19 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Boolean, ForeignKey, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
-from datetime import datetime
 from app.db.session import Base
+from app.models._mixins import TimestampMixin
 
 
-class Feature(Base):
+class Feature(Base, TimestampMixin):
     __tablename__ = "features"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
     key = Column(String, nullable=False)  # e.g., "client_dashboard", "ai_email_generation"
     enabled = Column(Boolean, default=False, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        # One row per feature key per org (created in migration 004)
+        UniqueConstraint("key", "org_id", name="uq_features_key_org"),
+    )
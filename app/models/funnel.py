@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer
+from sqlalchemy import BigInteger, Column, Date, String, DateTime, ForeignKey, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -32,3 +32,24 @@ class FunnelStep(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+
+class FunnelStepDailyCount(Base):
+    """
+    Daily event counts per (funnel, event_name): the dashboard's step-count rollup
+    (migrations 084 / 085, refreshed by app.services.funnel_rollup).
+    """
+    __tablename__ = "funnel_step_daily_counts"
+
+    org_id = Column(UUID(as_uuid=True), primary_key=True)
+    funnel_id = Column(UUID(as_uuid=True), ForeignKey("funnels.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)  # UTC day of events.occurred_at
+    event_name = Column(String, primary_key=True)
+    event_count = Column(BigInteger, nullable=False, default=0)
+
+
+class FunnelRollupWatermark(Base):
+    """Singleton row: events received before ``refreshed_through`` are in the rollup (migration 085)."""
+    __tablename__ = "funnel_rollup_watermark"
+
+    id = Column(Integer, primary_key=True, default=1)
+    refreshed_through = Column(DateTime, nullable=True)
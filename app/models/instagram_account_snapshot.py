@@ -2,15 +2,15 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy import Column, Date, ForeignKey, Integer, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.db.session import Base
+from app.models._mixins import TimestampMixin
 
 
-class InstagramAccountSnapshot(Base):
+class InstagramAccountSnapshot(Base, TimestampMixin):
     __tablename__ = "instagram_account_snapshots"
     __table_args__ = (
         UniqueConstraint(
@@ -36,6 +36,3 @@ class InstagramAccountSnapshot(Base):
     accounts_engaged = Column(Integer, nullable=True)
     follows = Column(Integer, nullable=True)
     unfollows = Column(Integer, nullable=True)
-
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
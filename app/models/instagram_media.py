@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
 
 from sqlalchemy import (
     Boolean,
@@ -18,9 +17,10 @@ from sqlalchemy import (
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 
 from app.db.session import Base
+from app.models._mixins import TimestampMixin
 
 
-class InstagramMedia(Base):
+class InstagramMedia(Base, TimestampMixin):
     __tablename__ = "instagram_media"
     __table_args__ = (
         UniqueConstraint("org_id", "ig_media_id", name="uq_instagram_media_org_ig_media"),
@@ -78,6 +78,3 @@ class InstagramMedia(Base):
     metrics_settled = Column(Boolean, nullable=False, default=False)
     last_synced_at = Column(DateTime, nullable=True)
     linked_concept_id = Column(String(64), nullable=True)
-
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -33,7 +33,7 @@ class ManualPayment(Base):
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
-    # Relationships
+    # Relationships (lazy per row; list paths add selectinload/joinedload per query)
     client = relationship("Client", backref="manual_payments")
     organization = relationship("Organization", backref="manual_payments")
     creator = relationship("User", foreign_keys=[created_by])
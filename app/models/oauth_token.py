@@ -1,5 +1,6 @@
-from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, Enum as SQLEnum, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.orm import Session
 import uuid
 from datetime import datetime
 import enum
@@ -38,8 +39,22 @@ class OAuthToken(Base):
     last_webhook_processed_at = Column(DateTime, nullable=True)  # Set when a webhook is processed; terminal refetches only if this changed
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
-    # Composite unique constraint: one token per provider per org
+    # Composite unique constraint: one token per provider per org (created in migration 004)
     __table_args__ = (
+        UniqueConstraint("provider", "org_id", name="uq_oauth_tokens_provider_org"),
         {"schema": None},  # Use default schema
     )
 
+
+def upsert_oauth_token(db: Session, org_id: uuid.UUID, provider: OAuthProvider, **values) -> uuid.UUID:
+    """
+    Insert the org's token for ``provider`` or overwrite ``values`` on the existing row, in one
+    ``INSERT ... ON CONFLICT (provider, org_id) DO UPDATE``. Returns the row id. Not committed.
+    """
+    stmt = pg_insert(OAuthToken).values(org_id=org_id, provider=provider, **values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[OAuthToken.provider, OAuthToken.org_id],
+        set_={key: stmt.excluded[key] for key in values},
+    ).returning(OAuthToken.id)
+    return db.execute(stmt).scalar_one()
+
@@ -2,15 +2,15 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey
+from sqlalchemy import Column, ForeignKey
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 
 from app.db.session import Base
+from app.models._mixins import TimestampMixin
 
 
-class OrgKpiBenchmark(Base):
+class OrgKpiBenchmark(Base, TimestampMixin):
     __tablename__ = "org_kpi_benchmarks"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -28,6 +28,3 @@ class OrgKpiBenchmark(Base):
     content_type_tags = Column(JSONB, nullable=True)
     # Private per-org token for external form entry links.
     entry_form_token = Column(UUID(as_uuid=True), unique=True, nullable=True, index=True)
-
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -2,13 +2,11 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
 
 from sqlalchemy import (
     Boolean,
     Column,
     Date,
-    DateTime,
     ForeignKey,
     Integer,
     Numeric,
@@ -19,9 +17,10 @@ from sqlalchemy import (
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.db.session import Base
+from app.models._mixins import TimestampMixin
 
 
-class OrgKpiDailyEntry(Base):
+class OrgKpiDailyEntry(Base, TimestampMixin):
     __tablename__ = "org_kpi_daily_entries"
     __table_args__ = (
         UniqueConstraint("org_id", "entry_date", name="uq_org_kpi_daily_entries_org_date"),
@@ -59,6 +58,3 @@ class OrgKpiDailyEntry(Base):
     cash_collected = Column(Numeric(12, 2), nullable=True)
     revenue = Column(Numeric(12, 2), nullable=True)
     setter_context = Column(Text, nullable=True)
-
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -1,11 +1,11 @@
-from sqlalchemy import Column, String, DateTime, Integer, Text
+from sqlalchemy import Column, String, Integer, Text
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
-from datetime import datetime
 from app.db.session import Base
+from app.models._mixins import TimestampMixin
 
 
-class Organization(Base):
+class Organization(Base, TimestampMixin):
     __tablename__ = "organizations"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -23,6 +23,3 @@ class Organization(Base):
     booking_url = Column(Text, nullable=True)
     # Public post-sales close survey link token (no login)
     close_form_token = Column(UUID(as_uuid=True), unique=True, nullable=True, index=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
-
@@ -1,11 +1,11 @@
 from sqlalchemy import Column, String, DateTime, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
-from datetime import datetime
 from app.db.session import Base
+from app.models._mixins import TimestampMixin
 
 
-class OrganizationInvitation(Base):
+class OrganizationInvitation(Base, TimestampMixin):
     """
     Invitation to join an organization (as org admin or as user).
     Token is one-time use and expires.
@@ -21,5 +21,3 @@ class OrganizationInvitation(Base):
     expires_at = Column(DateTime, nullable=False)
     used_at = Column(DateTime, nullable=True)
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -1,11 +1,15 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
 import uuid
 from datetime import datetime
+from typing import Optional
 from app.db.session import Base
+from app.models._mixins import TimestampMixin
 
 
-class OrganizationTabPermission(Base):
+class OrganizationTabPermission(Base, TimestampMixin):
     """Controls which tabs an organization has access to"""
     __tablename__ = "organization_tab_permissions"
 
@@ -13,11 +17,29 @@ class OrganizationTabPermission(Base):
     org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True)
     tab_name = Column(String, nullable=False)  # 'brevo', 'clients', 'stripe', 'funnels', 'users'
     enabled = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
-    # Unique constraint: one permission per tab per org
+    # Unique constraint: one permission per tab per org (created in migration 007)
     __table_args__ = (
+        UniqueConstraint("org_id", "tab_name", name="uq_org_tab_permissions_org_tab"),
         {"schema": None},
     )
 
+
+def upsert_org_tab_permission(
+    db: Session, org_id: uuid.UUID, tab_name: str, enabled: Optional[bool]
+) -> Row:
+    """
+    Create or update the org's permission row for ``tab_name`` in one statement and return it.
+    ``enabled=None`` keeps an existing row's value (a new row is enabled). Not committed.
+    """
+    stmt = pg_insert(OrganizationTabPermission).values(
+        org_id=org_id, tab_name=tab_name, enabled=True if enabled is None else enabled
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[OrganizationTabPermission.org_id, OrganizationTabPermission.tab_name],
+        set_={
+            "enabled": OrganizationTabPermission.enabled if enabled is None else stmt.excluded.enabled,
+            "updated_at": datetime.utcnow(),
+        },
+    ).returning(*OrganizationTabPermission.__table__.c)
+    return db.execute(stmt).one()
@@ -1,8 +1,8 @@
-from sqlalchemy import Column, String, DateTime, Text, Integer, ForeignKey
+from sqlalchemy import Column, String, Text, Integer, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
-from datetime import datetime
 from app.db.session import Base
+from app.models._mixins import TimestampMixin
 
 MAX_SHARED_PADS_PER_ORG = 10
 
@@ -17,7 +17,7 @@ DEFAULT_SHARED_PAD_CONTENT = """## Onboarding Checklist
 DEFAULT_SHARED_PAD_TITLE = "Onboarding"
 
 
-class PortalSharedPad(Base):
+class PortalSharedPad(Base, TimestampMixin):
     """Named shared live notepad tab for an org (consultant ↔ client consulting portal)."""
 
     __tablename__ = "portal_shared_pads"
@@ -35,5 +35,3 @@ class PortalSharedPad(Base):
     revision = Column(Integer, nullable=False, default=1)
     updated_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
     updated_by_name = Column(String(255), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -1,11 +1,11 @@
-from sqlalchemy import Column, String, DateTime, Text, Boolean, Date, ForeignKey
+from sqlalchemy import Column, String, Text, Boolean, Date, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
-from datetime import datetime
 from app.db.session import Base
+from app.models._mixins import TimestampMixin
 
 
-class PortalTodo(Base):
+class PortalTodo(Base, TimestampMixin):
     """Org-scoped to-do items shown in the consulting org portal."""
 
     __tablename__ = "portal_todos"
@@ -22,5 +22,3 @@ class PortalTodo(Base):
     completed = Column(Boolean, default=False, nullable=False)
     due_date = Column(Date, nullable=True)
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -1,9 +1,10 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON, Enum as SQLEnum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 import uuid
 from datetime import datetime
 import enum
 from app.db.session import Base
+from app.models._mixins import FastEnum
 
 
 class RecommendationStatus(str, enum.Enum):
@@ -19,9 +20,8 @@ class Recommendation(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=True)
-    tenant_id = Column(UUID(as_uuid=True), nullable=True)  # Deprecated: use org_id instead
     type = Column(String, nullable=False)
-    payload = Column(JSON, nullable=True)
-    status = Column(SQLEnum(RecommendationStatus), default=RecommendationStatus.PENDING, nullable=False)
+    payload = Column(JSONB, nullable=True)
+    status = Column(FastEnum(RecommendationStatus, length=32), default=RecommendationStatus.PENDING, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
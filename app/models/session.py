@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 import uuid
 from datetime import datetime
 from app.db.session import Base
@@ -14,7 +14,7 @@ class Session(Base):
     session_id = Column(String, nullable=True, index=True)  # Session identifier
     first_seen = Column(DateTime, default=datetime.utcnow, nullable=False)
     last_seen = Column(DateTime, default=datetime.utcnow, nullable=False, onupdate=datetime.utcnow)
-    utm = Column(JSON, nullable=True)  # UTM parameters: {source, medium, campaign, term, content}
+    utm = Column(JSONB, nullable=True)  # UTM parameters: {source, medium, campaign, term, content}
     referrer = Column(String, nullable=True, index=True)  # HTTP referrer (where user came from)
-    session_metadata = Column(JSON, nullable=True)  # Additional session metadata - renamed from 'metadata' to avoid SQLAlchemy reserved name
+    session_metadata = Column(JSONB, nullable=True)  # Additional session metadata - renamed from 'metadata' to avoid SQLAlchemy reserved name
 
@@ -1,19 +1,29 @@
-from sqlalchemy import Column, String, DateTime, JSON, Boolean, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
-import uuid
+from sqlalchemy import Column, String, DateTime, Boolean, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from datetime import datetime
 from app.db.session import Base
+from app.utils.ids import uuid7
 
 
 class StripeEvent(Base):
     __tablename__ = "stripe_events"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Time-ordered ids keep inserts on the right edge of the pkey index; server default
+    # covers raw SQL writers (migration 078)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7, server_default=text("gen_random_uuid()"))
     org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
-    stripe_event_id = Column(String, nullable=False, index=True)  # Not unique across orgs
+    stripe_event_id = Column(String, nullable=False)  # Not unique across orgs; leads uq_stripe_events_event_org
     type = Column(String, nullable=False, index=True)  # invoice.payment_succeeded, charge.succeeded, etc.
-    payload = Column(JSON, nullable=False)  # Full event payload from Stripe
-    processed = Column(Boolean, default=False, nullable=False, index=True)
-    received_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    payload = Column(JSONB, nullable=False)  # Event envelope from Stripe (trimmed; see trim_stripe_event)
+    processed = Column(Boolean, default=False, nullable=False)  # partial index below (migration 077)
+    received_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     processed_at = Column(DateTime, nullable=True)
 
+    __table_args__ = (
+        # Idempotent webhook insert (ON CONFLICT target); migration 069
+        Index("uq_stripe_events_event_org", "stripe_event_id", "org_id", unique=True),
+        # Worker requeue sweep (requeue_unprocessed_stripe_events); migration 077
+        Index("ix_stripe_events_unprocessed", "received_at", postgresql_where=text("processed = false")),
+        # Time-range scans over the append-only log; migration 082
+        Index("ix_stripe_events_received_brin", "received_at", postgresql_using="brin", postgresql_with={"pages_per_range": 32}),
+    )
@@ -1,5 +1,5 @@
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, JSON, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import BigInteger, Column, String, DateTime, ForeignKey, Text, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 import uuid
 from datetime import datetime
 from app.db.session import Base
@@ -9,17 +9,29 @@ class StripePayment(Base):
     __tablename__ = "stripe_payments"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
-    stripe_id = Column(String, nullable=False, index=True)  # charge id or payment_intent id
+    # Indexed by the (org_id, ...) composite below (migration 072)
+    org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
+    stripe_id = Column(String, nullable=False)  # charge id or payment_intent id; leads the unique constraint below
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=True, index=True)
-    amount_cents = Column(Integer, nullable=False)  # Store in cents to avoid floating point issues
+    amount_cents = Column(BigInteger, nullable=False)  # Store in cents to avoid floating point issues
     currency = Column(String(3), default="usd", nullable=False)
-    status = Column(String, nullable=False, index=True)  # succeeded, failed, refunded, pending
+    status = Column(String, nullable=False)  # succeeded, failed, refunded, pending (INCLUDEd in ix_stripe_payments_org_created)
     type = Column(String, nullable=True)  # charge, payment_intent, invoice
     subscription_id = Column(String, nullable=True, index=True)  # stripe subscription id if available
     invoice_id = Column(String, nullable=True, index=True)  # stripe invoice id if available (for deduplication)
     receipt_url = Column(Text, nullable=True)
-    raw_event = Column(JSON, nullable=True)  # Store raw Stripe event data
+    raw_event = Column(JSONB, nullable=True)  # Store raw Stripe event data
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        Index(
+            "ix_stripe_payments_org_created",
+            "org_id",
+            created_at.desc(),
+            postgresql_include=["status", "amount_cents"],
+        ),
+        # Sync upsert target (ON CONFLICT); migration 009
+        UniqueConstraint("stripe_id", "org_id", name="uq_stripe_payments_stripe_id_org_id"),
+    )
+
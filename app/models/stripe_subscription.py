@@ -1,23 +1,47 @@
-from sqlalchemy import Column, String, DateTime, Numeric, ForeignKey, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.hybrid import hybrid_property
 import uuid
 from datetime import datetime
 from app.db.session import Base
+from app.models._mixins import dollars_to_cents
 
 
 class StripeSubscription(Base):
     __tablename__ = "stripe_subscriptions"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
-    stripe_subscription_id = Column(String, nullable=False, index=True)  # Not unique across orgs
+    # Indexed by the (org_id, ...) composite below (migration 072)
+    org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
+    stripe_subscription_id = Column(String, nullable=False)  # Not unique across orgs; leads the unique constraint below
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=True, index=True)
     status = Column(String, nullable=False, index=True)  # active, past_due, canceled, unpaid, incomplete
     current_period_start = Column(DateTime, nullable=True)
     current_period_end = Column(DateTime, nullable=True, index=True)
     plan_id = Column(String, nullable=True)
-    mrr = Column(Numeric(10, 2), default=0, nullable=False)  # Monthly Recurring Revenue in dollars
-    raw = Column(JSON, nullable=True)  # Store raw Stripe subscription data
+    mrr_cents = Column(Integer, default=0, nullable=False)  # Monthly Recurring Revenue in cents (migration 076)
+    raw = Column(JSONB, nullable=True)  # Store raw Stripe subscription data
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True)
 
+    @hybrid_property
+    def mrr(self):
+        """MRR in dollars; assigning dollars stores rounded cents."""
+        return self.mrr_cents / 100 if self.mrr_cents is not None else None
+
+    @mrr.setter
+    def mrr(self, value):
+        self.mrr_cents = dollars_to_cents(value)
+
+    @mrr.expression
+    def mrr(cls):
+        return cls.mrr_cents / 100.0
+
+    __table_args__ = (
+        Index("ix_stripe_subscriptions_org_updated", "org_id", updated_at.desc()),
+        # Sync upsert target (ON CONFLICT); migration 009
+        UniqueConstraint(
+            "stripe_subscription_id", "org_id", name="uq_stripe_subscriptions_stripe_subscription_id_org_id"
+        ),
+    )
+
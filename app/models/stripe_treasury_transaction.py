@@ -1,9 +1,9 @@
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, JSON, Text, Enum as SQLEnum
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import BigInteger, Column, String, DateTime, Integer, ForeignKey, Text, Index
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 import uuid
-from datetime import datetime
 import enum
 from app.db.session import Base
+from app.models._mixins import FastEnum, TimestampMixin
 
 
 class TreasuryTransactionStatus(str, enum.Enum):
@@ -23,31 +23,32 @@ class TreasuryTransactionFlowType(str, enum.Enum):
     RECEIVED_DEBIT = "received_debit"
 
 
-class StripeTreasuryTransaction(Base):
+class StripeTreasuryTransaction(Base, TimestampMixin):
     __tablename__ = "stripe_treasury_transactions"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False, index=True)
+    # Indexed by the (org_id, ...) composite below (migration 072)
+    org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
     stripe_transaction_id = Column(String, nullable=False, unique=True, index=True)  # trxn_xxx
     financial_account_id = Column(String, nullable=True, index=True)  # fa_xxx
     flow_id = Column(String, nullable=True, index=True)  # Flow ID (obt_xxx, ic_xxx, etc.)
     # Flow type - use native_enum=False to store enum values as strings
-    flow_type = Column(SQLEnum(TreasuryTransactionFlowType, native_enum=False), nullable=True)
+    flow_type = Column(FastEnum(TreasuryTransactionFlowType, by_value=True), nullable=True)
     
     # Amount and currency
-    amount = Column(Integer, nullable=False)  # Amount in cents (can be negative for outbound)
+    amount = Column(BigInteger, nullable=False)  # Amount in cents (can be negative for outbound)
     currency = Column(String(3), default="usd", nullable=False)
     
     # Status - use native_enum=False to store enum values as strings (not enum names)
-    status = Column(SQLEnum(TreasuryTransactionStatus, native_enum=False), nullable=False, index=True)
+    status = Column(FastEnum(TreasuryTransactionStatus, by_value=True), nullable=False, index=True)
     
     # Balance impact
-    balance_impact_cash = Column(Integer, nullable=True)  # Cash balance impact in cents
+    balance_impact_cash = Column(BigInteger, nullable=True)  # Cash balance impact in cents
     balance_impact_inbound_pending = Column(Integer, nullable=True)
     balance_impact_outbound_pending = Column(Integer, nullable=True)
     
     # Timestamps
-    created = Column(DateTime, nullable=False, index=True)  # Transaction created timestamp
+    created = Column(DateTime, nullable=False)  # Transaction created timestamp
     posted_at = Column(DateTime, nullable=True, index=True)  # When transaction posted
     void_at = Column(DateTime, nullable=True)  # When transaction was voided
     
@@ -60,9 +61,14 @@ class StripeTreasuryTransaction(Base):
     client_id = Column(UUID(as_uuid=True), ForeignKey("clients.id"), nullable=True, index=True)
     
     # Raw data
-    raw_data = Column(JSON, nullable=True)  # Store full Stripe transaction object
-    
-    # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    raw_data = Column(JSONB, nullable=True)  # Store full Stripe transaction object
 
+    __table_args__ = (
+        Index("ix_stripe_treasury_transactions_org_created", "org_id", created.desc()),
+        Index(
+            "ix_stripe_treasury_transactions_created_brin",
+            "created",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
+    )
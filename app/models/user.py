@@ -1,5 +1,6 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, TypeDecorator
+from sqlalchemy import Column, Computed, String, Boolean, DateTime, ForeignKey, Index, TypeDecorator, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSON
+from sqlalchemy.orm import relationship
 import uuid
 from datetime import datetime
 import enum
@@ -14,48 +15,34 @@ class UserRole(str, enum.Enum):
     MEMBER = "MEMBER"
 
 
+# Lowercased label -> role; the DB may hold any casing (legacy lowercase `member`).
+_ROLE_BY_KEY = {r.value.lower(): r for r in UserRole}
+_ROLE_BIND_VALUE = {UserRole.OWNER: "OWNER", UserRole.ADMIN: "ADMIN", UserRole.MEMBER: "member"}
+_ROLE_API_VALUE = {r: r.value.lower() for r in UserRole}
+
+
 def parse_user_role_from_db(raw: object) -> UserRole:
     """Map DB `userrole` (any legacy casing) to UserRole."""
     if raw is None:
         return UserRole.ADMIN
-    s = str(raw).strip()
-    up = s.upper()
-    if up == "OWNER":
-        return UserRole.OWNER
-    if up == "ADMIN":
-        return UserRole.ADMIN
-    if up == "MEMBER":
-        return UserRole.MEMBER
-    # legacy lowercase `member` from older migrations
-    if s.lower() == "member":
-        return UserRole.MEMBER
-    return UserRole.ADMIN
+    return _ROLE_BY_KEY.get(str(raw).strip().lower(), UserRole.ADMIN)
 
 
 def userrole_bind_value(role: UserRole) -> str:
     """PostgreSQL `userrole` label for raw SQL CAST (legacy rows use lowercase `member`)."""
-    if role == UserRole.MEMBER:
-        return "member"
-    return role.value
+    return _ROLE_BIND_VALUE[role]
 
 
 def role_to_api(role: UserRole) -> str:
     """API / frontend expect lowercase owner | admin | member."""
-    return role.value.lower()
+    return _ROLE_API_VALUE[role]
 
 
 def parse_user_role_from_api(raw: str) -> UserRole:
     """Parse settings/UI role strings into UserRole."""
     if not raw:
         return UserRole.MEMBER
-    key = str(raw).strip().lower()
-    if key == "owner":
-        return UserRole.OWNER
-    if key == "admin":
-        return UserRole.ADMIN
-    if key == "member":
-        return UserRole.MEMBER
-    return UserRole.MEMBER
+    return _ROLE_BY_KEY.get(str(raw).strip().lower(), UserRole.MEMBER)
 
 
 class PgUserRole(TypeDecorator):
@@ -91,13 +78,21 @@ class User(Base):
     # Nullable for Google-only accounts (no password set)
     hashed_password = Column(String, nullable=True)
     role = Column(PgUserRole(), default=UserRole.ADMIN, nullable=False)
-    is_admin = Column(Boolean, default=False, nullable=False)
+    # Generated from role (migration 067); never written by the app.
+    is_admin = Column(Boolean, Computed("role IN ('OWNER', 'ADMIN')", persisted=True), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     fathom_api_key = Column(String, nullable=True)
     ai_profile = Column(JSON, nullable=True)
     google_id = Column(String, nullable=True, index=True)
     google_email = Column(String, nullable=True)
 
+    # Never lazy-loaded: callers either selectinload() it or query user_tab_permissions directly
+    # (GET /users/{id}/tabs joins it in SQL). Rows go with the user via the FK's ON DELETE CASCADE.
+    tab_permissions = relationship("UserTabPermission", lazy="raise", passive_deletes=True)
+
     __table_args__ = (
+        Index("ix_users_org_id_created_at", "org_id", created_at.desc()),
+        # Email is unique per org (created in migration 004); user creation relies on it for ON CONFLICT
+        UniqueConstraint("email", "org_id", name="uq_users_email_org"),
         {"schema": None},
     )
@@ -1,8 +1,8 @@
-from sqlalchemy import Column, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, ForeignKey, DateTime, Boolean, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID, JSON
-import uuid
 from datetime import datetime
 from app.db.session import Base
+from app.utils.ids import uuid7
 
 
 class UserOrganization(Base):
@@ -12,16 +12,18 @@ class UserOrganization(Base):
     """
     __tablename__ = "user_organizations"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    # Membership lookups use the (user_id, org_id) unique index below
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     org_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True)
     is_primary = Column(Boolean, default=False, nullable=False)  # Primary org for backward compatibility
     # Per-org Intelligence bank when the user has no dedicated users row in that org.
     ai_profile = Column(JSON, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
-    # Composite unique constraint: one record per user-org pair
+    # Composite unique constraint: one record per user-org pair (migrations 019 / 083)
     __table_args__ = (
+        UniqueConstraint("user_id", "org_id", name="uq_user_organizations_user_org"),
         {"schema": None},  # Use default schema
     )
 
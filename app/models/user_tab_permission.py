@@ -1,23 +1,21 @@
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Boolean, ForeignKey, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
-import uuid
-from datetime import datetime
 from app.db.session import Base
+from app.utils.ids import uuid7
+from app.models._mixins import TimestampMixin
 
 
-class UserTabPermission(Base):
+class UserTabPermission(Base, TimestampMixin):
     """Controls which tabs a specific user has access to (overrides org permissions)"""
     __tablename__ = "user_tab_permissions"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     tab_name = Column(String, nullable=False)  # 'brevo', 'clients', 'stripe', 'funnels', 'users'
     enabled = Column(Boolean, default=True, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
-    # Unique constraint: one permission per tab per user
+    # Unique constraint: one permission per tab per user (migrations 007 / 083)
     __table_args__ = (
+        UniqueConstraint("user_id", "tab_name", name="uq_user_tab_permissions_user_tab"),
         {"schema": None},
     )
-
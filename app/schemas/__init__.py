@@ -4,11 +4,28 @@ from app.schemas.event import Event, EventCreate
 from app.schemas.oauth import OAuthTokenResponse, OAuthStartResponse
 from app.schemas.integration import StripeSummary, BrevoStatus
 
+
+def from_orm_fast(schema_cls, obj, **overrides):
+    """
+    Build ``schema_cls`` from a trusted ORM row with ``model_construct`` (no validators).
+
+    Only for schemas whose fields map 1:1 onto already-typed columns; attributes missing on
+    ``obj`` fall back to the schema defaults. Network payloads keep ``model_validate``.
+    """
+    values = {
+        name: getattr(obj, name)
+        for name in schema_cls.model_fields
+        if name not in overrides and hasattr(obj, name)
+    }
+    values.update(overrides)
+    return schema_cls.model_construct(**values)
+
 __all__ = [
     "User", "UserCreate", "UserLogin", "Token",
     "Client", "ClientCreate", "ClientUpdate",
     "Event", "EventCreate",
     "OAuthTokenResponse", "OAuthStartResponse",
-    "StripeSummary", "BrevoStatus"
+    "StripeSummary", "BrevoStatus",
+    "from_orm_fast",
 ]
 
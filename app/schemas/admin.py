@@ -1,8 +1,10 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict
 from datetime import datetime
 from uuid import UUID
 
+from app.models.client import LifecycleState
+
 
 class HealthTrendPeriod(BaseModel):
     """One 30-day bucket for owner health trends (oldest-first in the list)."""
@@ -178,6 +180,15 @@ class OrganizationFunnelUpdate(BaseModel):
     env: Optional[str] = None
 
 
+class RecentFunnel(BaseModel):
+    """Funnel row in the org dashboard's management list"""
+    id: UUID
+    name: str
+    domain: Optional[str] = None
+    slug: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
 class OrganizationDashboardSummary(BaseModel):
     """Summary of an organization's dashboard data"""
     organization_id: UUID
@@ -189,7 +200,7 @@ class OrganizationDashboardSummary(BaseModel):
 
     # Client stats
     total_clients: int
-    clients_by_status: Dict[str, int]  # e.g., {"lead": 5, "active": 10}
+    clients_by_status: Dict[LifecycleState, int]  # e.g., {"cold_lead": 5, "active": 10}
     
     # Funnel stats
     total_funnels: int
@@ -211,7 +222,7 @@ class OrganizationDashboardSummary(BaseModel):
     funnel_conversion_metrics: List[FunnelConversionMetric] = []
 
     # All funnels for the org (for management UI)
-    recent_funnels: List[Dict[str, Any]]
+    recent_funnels: List[RecentFunnel]
 
     # Platform onboarding & coaching trends (owner org modal)
     organization_onboarded_at: Optional[str] = None  # ISO 8601 — org.created_at
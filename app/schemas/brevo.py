@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -40,6 +40,10 @@ class BrevoContactResponse(BaseModel):
     modifiedAt: Optional[str] = None
 
 
+# Whole-page validate/dump in one pydantic-core call (built once at import)
+BrevoContactResponseListAdapter = TypeAdapter(List[BrevoContactResponse])
+
+
 class BrevoContactList(BaseModel):
     contacts: List[BrevoContactResponse]
     count: int
@@ -67,6 +71,9 @@ class BrevoListResponse(BaseModel):
     createdAt: Optional[str] = None
 
 
+BrevoListResponseListAdapter = TypeAdapter(List[BrevoListResponse])
+
+
 class BrevoListList(BaseModel):
     lists: List[BrevoListResponse]
     count: int
@@ -116,7 +123,7 @@ class BrevoSendEmailRequest(BaseModel):
     recipients: Optional[List[BrevoEmailRecipient]] = None  # Direct email addresses
     
     # Email content
-    sender: Dict[str, str]  # {"email": "...", "name": "..."}
+    sender: BrevoEmailRecipient
     subject: str
     htmlContent: Optional[str] = None
     textContent: Optional[str] = None
@@ -125,7 +132,7 @@ class BrevoSendEmailRequest(BaseModel):
     # Optional parameters
     params: Optional[Dict[str, Any]] = None  # Template parameters
     tags: Optional[List[str]] = None
-    replyTo: Optional[Dict[str, str]] = None
+    replyTo: Optional[BrevoEmailRecipient] = None
     attachments: Optional[List[Dict[str, Any]]] = None  # [{"name": "...", "content": "base64..."}]
 
 
@@ -4,11 +4,13 @@ from decimal import Decimal
 from datetime import datetime, timezone
 from typing import List, Optional, Union
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError, field_validator, model_validator
 
 from app.models.client import LifecycleState
 
 _OFFER_SLOT_RE = re.compile(r"^(core|referral|custom|upsell:\d+|downsell:\d+)$")
+# ISO-8601 parsing (incl. date-only and Z suffix) runs in pydantic-core
+_OPTIONAL_DATETIME = TypeAdapter(Optional[datetime])
 
 
 def _naive_utc_program(dt: datetime) -> datetime:
@@ -19,20 +21,13 @@ def _naive_utc_program(dt: datetime) -> datetime:
 
 
 def parse_optional_program_datetime(v):
-    """Parse program date fields from API (ISO-Z) or datetime; always naive UTC."""
+    """Parse program date fields from API (ISO-8601, date-only or Z) or datetime; always naive UTC."""
     if v is None or v == "":
         return None
-    if isinstance(v, datetime):
-        return _naive_utc_program(v)
-    if isinstance(v, str):
+    if isinstance(v, (str, datetime)):
         try:
-            s = v
-            if s.endswith("Z"):
-                s = s.replace("Z", "+00:00")
-            if "T" not in s and len(s) == 10:
-                s = s + "T00:00:00"
-            return _naive_utc_program(datetime.fromisoformat(s))
-        except Exception:
+            return _naive_utc_program(_OPTIONAL_DATETIME.validate_python(v))
+        except ValidationError:
             raise ValueError(f"Invalid datetime format: {v}")
     return v
 
@@ -40,7 +35,7 @@ def parse_optional_program_datetime(v):
 class ClientBase(BaseModel):
     first_name: Optional[str] = None
     last_name: Optional[str] = None
-    email: Optional[str] = None  # Primary email (backward compat)
+    email: Optional[str] = None  # Primary email (backward compat); plain str so test domains like @stripe.test pass
     emails: Optional[List[str]] = None  # Additional emails; client can have multiple
     phone: Optional[str] = None
     instagram: Optional[str] = None
@@ -61,14 +56,6 @@ class ClientBase(BaseModel):
             return float(v)
         return v if v is not None else 0.0
     
-    @field_validator('email', mode='before')
-    @classmethod
-    def validate_email(cls, v):
-        """Accept any string as email (including test emails like @stripe.test)"""
-        # Just return the string as-is - no validation
-        # This allows test emails that EmailStr would reject
-        return str(v) if v is not None else None
-    
     @field_validator('emails', mode='before')
     @classmethod
     def normalize_emails_list(cls, v):
@@ -179,7 +166,7 @@ class ClientUpdate(BaseModel):
 
 class Client(ClientBase):
     id: uuid.UUID
-    tenant_id: Optional[uuid.UUID] = None
+    tenant_id: Optional[uuid.UUID] = None  # Column dropped (migration 079); kept as null for API compatibility
     last_activity_at: Optional[datetime] = None
     lifetime_revenue_cents: Optional[int] = 0
     notes: Optional[str] = None
@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+import enum
+
+from pydantic import BaseModel, field_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
@@ -57,6 +59,14 @@ class User(UserBase):
     class Config:
         from_attributes = True
 
+    @field_validator("role", mode="before")
+    @classmethod
+    def _role_to_api(cls, v: Any) -> Any:
+        """Accept UserRole / DB labels so ORM users validate directly (API uses lowercase)."""
+        if isinstance(v, enum.Enum):
+            v = v.value
+        return v.lower() if isinstance(v, str) else v
+
 
 class Token(BaseModel):
     access_token: str
@@ -61,13 +61,17 @@ def _truncate_notes(notes: Optional[str], max_len: int = 1200) -> str:
     return s[: max_len - 3] + "..."
 
 
-def _parse_raw_event(raw: Optional[str]) -> Dict[str, Any]:
+def _parse_raw_event(raw: Any) -> Dict[str, Any]:
+    """raw_event_data is jsonb (dict); rows read before migration 073 may still be a JSON string."""
+    if isinstance(raw, dict):
+        return raw
     if not raw:
         return {}
     try:
-        return json.loads(raw) if isinstance(raw, str) else {}
+        parsed = json.loads(raw) if isinstance(raw, str) else {}
     except Exception:
         return {}
+    return parsed if isinstance(parsed, dict) else {}
 
 
 def extract_booking_fields(raw_event: Dict[str, Any]) -> Dict[str, Any]:
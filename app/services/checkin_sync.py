@@ -7,7 +7,6 @@ from sqlalchemy import and_, or_, text, func
 from datetime import datetime, timezone, timedelta
 from typing import List, Optional, Dict, Any
 import uuid
-import json
 import re
 from app.models.client import Client, LifecycleState
 from app.models.client_checkin import ClientCheckIn
@@ -614,7 +613,7 @@ def sync_calcom_bookings(
                         no_show=no_show,
                         is_sales_call=is_sales_call,
                         sale_closed=sale_closed,
-                        raw_event_data=json.dumps(booking),
+                        raw_event_data=booking,
                     )
                     db.add(checkin)
                     synced_count += 1
@@ -931,7 +930,7 @@ def sync_calendly_events(
                         no_show=no_show,
                         is_sales_call=is_sales_call,
                         sale_closed=sale_closed,
-                        raw_event_data=json.dumps(event),
+                        raw_event_data=event,
                     )
                     db.add(checkin)
                     synced_count += 1
@@ -986,7 +985,7 @@ def _ensure_client_check_ins_table(db: Session) -> None:
                 attendee_name VARCHAR,
                 completed BOOLEAN NOT NULL DEFAULT false,
                 cancelled BOOLEAN NOT NULL DEFAULT false,
-                raw_event_data TEXT,
+                raw_event_data JSONB,
                 created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
                 updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
             )
@@ -1011,11 +1010,11 @@ def _ensure_client_check_ins_table(db: Session) -> None:
         except Exception as alt_e:
             db.rollback()
             print(f"[CHECKIN SYNC] ensure client_check_ins column: {alt_e}")
-    # Create indexes if not exist (idempotent)
+    # Create indexes if not exist (idempotent). No single-column org_id / event_id indexes:
+    # migrations 072 and 081 drop them (covered by ix_client_check_ins_org_start and the
+    # (event_id, org_id) unique constraint), and recreating them here would undo the drops.
     for idx_sql in (
-        "CREATE INDEX IF NOT EXISTS ix_client_check_ins_org_id ON client_check_ins (org_id)",
         "CREATE INDEX IF NOT EXISTS ix_client_check_ins_client_id ON client_check_ins (client_id)",
-        "CREATE INDEX IF NOT EXISTS ix_client_check_ins_event_id ON client_check_ins (event_id)",
         "CREATE INDEX IF NOT EXISTS ix_client_check_ins_start_time ON client_check_ins (start_time)",
         "CREATE INDEX IF NOT EXISTS ix_client_check_ins_attendee_email ON client_check_ins (attendee_email)",
     ):
@@ -96,7 +96,6 @@ def apply_manual_lifecycle_change(client: Client, new_state: LifecycleState) ->
         if not client.program_start_date or not client.program_duration_days:
             client.program_progress_percent = None
             if not client.program_start_date:
-                client.program_end_date = None
                 client.program_duration_days = None
 
 
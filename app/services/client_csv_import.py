@@ -209,7 +209,7 @@ def _create_new_client(
         client.program_start_date = program_start
         if program_days and int(program_days) > 0:
             client.program_duration_days = int(program_days)
-        client.update_program_dates()
+        client.normalize_program_dates()
         client.program_progress_percent = client.calculate_progress()
 
     db.add(client)
@@ -248,7 +248,7 @@ def _merge_into_existing(client: Client, row) -> bool:
         days = getattr(row, "program_duration_days", None)
         if days and int(days) > 0:
             client.program_duration_days = int(days)
-        client.update_program_dates()
+        client.normalize_program_dates()
         client.program_progress_percent = client.calculate_progress()
         changed = True
 
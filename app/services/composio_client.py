@@ -15,7 +15,7 @@ from typing import Any, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
 
 from app.core.encryption import decrypt_token, encrypt_token
-from app.models.oauth_token import OAuthProvider, OAuthToken
+from app.models.oauth_token import OAuthProvider, OAuthToken, upsert_oauth_token
 
 logger = logging.getLogger(__name__)
 
@@ -88,23 +88,16 @@ def upsert_composio_credentials(
     if not cfg:
         raise ComposioConfigError("Composio Instagram auth config ID is required")
 
-    enc = encrypt_token(key)
-    row = get_composio_token(db, org_id)
-    if row is None:
-        row = OAuthToken(
-            org_id=org_id,
-            provider=OAuthProvider.COMPOSIO,
-            account_id=cfg,
-            access_token=enc,
-            scope=COMPOSIO_CREDENTIALS_SCOPE,
-        )
-        db.add(row)
-    else:
-        row.access_token = enc
-        row.account_id = cfg
-        row.scope = COMPOSIO_CREDENTIALS_SCOPE
+    token_id = upsert_oauth_token(
+        db,
+        org_id,
+        OAuthProvider.COMPOSIO,
+        account_id=cfg,
+        access_token=encrypt_token(key),
+        scope=COMPOSIO_CREDENTIALS_SCOPE,
+    )
     db.commit()
-    db.refresh(row)
+    row = db.get(OAuthToken, token_id)
     # Drop cached client for this org (key may have changed)
     _evict_org_client(org_id)
     return row
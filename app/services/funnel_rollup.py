@@ -0,0 +1,121 @@
+"""
+Daily funnel step-count rollup (``funnel_step_daily_counts``, migrations 084 / 085).
+
+The org dashboard's funnel conversion tiles used to count raw ``events`` over the last 30
+days on every load; they now sum these buckets (``funnel_step_counts``). The worker keeps
+them current with ``refresh_funnel_step_daily_counts``: every (org, funnel, UTC day) bucket
+that received an event since the last run (by ``events.received_at``, so backdated and
+replayed events are caught) is recomputed from scratch. Distinct-visitor totals are not
+additive across days and still come from ``events``.
+
+Deletes are not tracked: a bucket is only revisited when a new event lands in it. The app
+removes events only together with their funnel (funnel delete, org delete), and those
+buckets go with the funnel via the ``funnel_id`` ON DELETE CASCADE. Events deleted any
+other way (manual SQL) leave their buckets' counts stale until a new event arrives for the
+same funnel and day.
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.models.funnel import FunnelRollupWatermark, FunnelStepDailyCount
+
+# Re-read this much before the previous watermark so events whose transaction committed
+# after the last run started (received_at is set before commit) are not missed.
+REFRESH_OVERLAP = timedelta(minutes=10)
+# First run (no watermark yet): events received this far back.
+INITIAL_LOOKBACK = timedelta(days=31)
+
+# (org_id, funnel_id, UTC day) buckets with an event received since :since
+_TOUCHED_CTE = """
+    WITH touched AS (
+        SELECT DISTINCT e.org_id, e.funnel_id, (e.occurred_at)::date AS day
+        FROM events e
+        WHERE e.funnel_id IS NOT NULL AND e.received_at >= :since
+    )
+"""
+
+_DELETE_TOUCHED_SQL = text(
+    _TOUCHED_CTE
+    + """
+    DELETE FROM funnel_step_daily_counts c
+    USING touched t
+    WHERE c.org_id = t.org_id AND c.funnel_id = t.funnel_id AND c.day = t.day
+    """
+)
+
+_INSERT_TOUCHED_SQL = text(
+    _TOUCHED_CTE
+    + """
+    INSERT INTO funnel_step_daily_counts (org_id, funnel_id, day, event_name, event_count)
+    SELECT e.org_id, e.funnel_id, t.day, e.event_name, COUNT(*)
+    FROM touched t
+    JOIN funnels f ON f.id = t.funnel_id
+    JOIN events e
+      ON e.org_id = t.org_id
+     AND e.funnel_id = t.funnel_id
+     AND e.occurred_at >= t.day
+     AND e.occurred_at < t.day + 1
+    GROUP BY e.org_id, e.funnel_id, t.day, e.event_name
+    ON CONFLICT (org_id, funnel_id, day, event_name)
+    DO UPDATE SET event_count = EXCLUDED.event_count
+    """
+)
+
+
+def refresh_since(refreshed_through: Optional[datetime], now: datetime) -> datetime:
+    """Lower bound on ``events.received_at`` for the next refresh."""
+    if refreshed_through is None:
+        return now - INITIAL_LOOKBACK
+    return refreshed_through - REFRESH_OVERLAP
+
+
+def refresh_funnel_step_daily_counts(db: Session) -> int:
+    """
+    Recompute every bucket touched by events received since the last run, in one
+    transaction, and advance the watermark. Returns bucket rows written.
+    """
+    started_at = datetime.utcnow()
+    watermark = (
+        db.query(FunnelRollupWatermark)
+        .filter(FunnelRollupWatermark.id == 1)
+        .with_for_update()
+        .first()
+    )
+    if watermark is None:
+        watermark = FunnelRollupWatermark(id=1)
+        db.add(watermark)
+    params = {"since": refresh_since(watermark.refreshed_through, started_at)}
+    # Clear the touched days first: an event_name with no events left on a re-aggregated day
+    # must drop out rather than keep its old count (see module docstring for untouched days).
+    db.execute(_DELETE_TOUCHED_SQL, params)
+    written = db.execute(_INSERT_TOUCHED_SQL, params).rowcount or 0
+    watermark.refreshed_through = started_at
+    db.commit()
+    return written
+
+
+def funnel_step_counts(
+    db: Session,
+    org_id: uuid.UUID,
+    funnel_ids: Iterable[uuid.UUID],
+    event_names: Iterable[str],
+    since: date,
+) -> Dict[Tuple[uuid.UUID, str], int]:
+    """``{(funnel_id, event_name): events since ``since``}`` from the rollup, in one query."""
+    rows = db.query(
+        FunnelStepDailyCount.funnel_id,
+        FunnelStepDailyCount.event_name,
+        func.sum(FunnelStepDailyCount.event_count),
+    ).filter(
+        FunnelStepDailyCount.org_id == org_id,
+        FunnelStepDailyCount.funnel_id.in_(list(funnel_ids)),
+        FunnelStepDailyCount.event_name.in_(list(event_names)),
+        FunnelStepDailyCount.day >= since,
+    ).group_by(FunnelStepDailyCount.funnel_id, FunnelStepDailyCount.event_name).all()
+    return {(funnel_id, name): int(total or 0) for funnel_id, name, total in rows}
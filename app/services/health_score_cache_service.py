@@ -12,6 +12,7 @@ from typing import Any, Dict, List, Optional
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.db.session import json_safe
 from app.models.client import Client
 from app.models.client_health_score_cache import ClientHealthScoreCache
 from app.models.fathom_call_record import FathomCallRecord
@@ -344,7 +345,7 @@ def resolve_health_score(
             }
 
     now = datetime.now(timezone.utc)
-    factors_to_store = json.loads(json.dumps(factors, default=str))
+    factors_to_store = json_safe(factors)
 
     if not cache_row:
         cache_row = ClientHealthScoreCache(client_id=client_id, org_id=org_id)
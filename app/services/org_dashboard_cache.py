@@ -0,0 +1,112 @@
+"""
+Short-TTL cache of the admin org dashboard summary (GET /admin/organizations/{id}/dashboard).
+
+The summary joins clients, Stripe, Brevo and funnel analytics and is identical for every
+admin viewing the same org / range / scope, so the serialized JSON is kept for a minute.
+Stored in Redis when REDIS_URL is set (shared across workers), else in-process. Funnel and
+step writes (admin and tenant routes) call ``invalidate_org_dashboard``, which bumps a per-org
+generation baked into the entry keys; the TTL bounds staleness otherwise.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Optional
+
+from app.core.rate_limit import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+ORG_DASHBOARD_CACHE_TTL_SEC = 60
+
+_KEY_PREFIX = "orgdash"
+# Per-org generation, part of every entry key; invalidation bumps it so stale entries are
+# never read again and simply expire. Outlives the entries it guards.
+_GEN_KEY_TTL_SEC = ORG_DASHBOARD_CACHE_TTL_SEC * 10
+
+_memory_cache: dict[str, tuple[float, bytes]] = {}
+_memory_generations: dict[str, int] = {}
+_memory_lock = threading.Lock()
+
+
+def _generation_key(org_id) -> str:
+    return f"{_KEY_PREFIX}:gen:{org_id}"
+
+
+def org_dashboard_cache_key(org_id, range_days: int, scope: Optional[str]) -> str:
+    """
+    Entry key for the org's current generation. Resolve it before computing the summary so
+    an invalidation that lands mid-computation makes the result unreachable.
+    """
+    r = get_redis_client()
+    generation = 0
+    if r is not None:
+        try:
+            generation = int(r.get(_generation_key(org_id)) or 0)
+        except Exception as e:
+            logger.warning("org dashboard cache generation read failed: %s", e)
+    else:
+        with _memory_lock:
+            generation = _memory_generations.get(str(org_id), 0)
+    return f"{_KEY_PREFIX}:{org_id}:g{generation}:{range_days}:{scope or ''}"
+
+
+def org_dashboard_cache_get(key: str) -> Optional[bytes]:
+    r = get_redis_client()
+    if r is not None:
+        try:
+            raw = r.get(key)
+            if raw is None:
+                return None
+            return raw if isinstance(raw, bytes) else raw.encode()
+        except Exception as e:
+            logger.warning("org dashboard cache read failed: %s", e)
+            return None
+    now = time.monotonic()
+    with _memory_lock:
+        hit = _memory_cache.get(key)
+        if not hit:
+            return None
+        ts, body = hit
+        if now - ts > ORG_DASHBOARD_CACHE_TTL_SEC:
+            _memory_cache.pop(key, None)
+            return None
+        return body
+
+
+def org_dashboard_cache_set(key: str, body: bytes) -> None:
+    r = get_redis_client()
+    if r is not None:
+        try:
+            r.set(key, body, ex=ORG_DASHBOARD_CACHE_TTL_SEC)
+        except Exception as e:
+            logger.warning("org dashboard cache write failed: %s", e)
+        return
+    with _memory_lock:
+        _memory_cache[key] = (time.monotonic(), body)
+        # Bound memory: drop oldest if map grows large
+        if len(_memory_cache) > 1024:
+            oldest = sorted(_memory_cache.items(), key=lambda kv: kv[1][0])[:256]
+            for k, _ in oldest:
+                _memory_cache.pop(k, None)
+
+
+def invalidate_org_dashboard(org_id) -> None:
+    """Retire every cached summary for org_id (all ranges / scopes) by bumping its generation."""
+    r = get_redis_client()
+    if r is not None:
+        try:
+            gen_key = _generation_key(org_id)
+            pipe = r.pipeline()
+            pipe.incr(gen_key)
+            pipe.expire(gen_key, _GEN_KEY_TTL_SEC)
+            pipe.execute()
+        except Exception as e:
+            logger.warning("org dashboard cache invalidate failed: %s", e)
+        return
+    prefix = f"{_KEY_PREFIX}:{org_id}:"
+    with _memory_lock:
+        _memory_generations[str(org_id)] = _memory_generations.get(str(org_id), 0) + 1
+        for k in [k for k in _memory_cache if k.startswith(prefix)]:
+            _memory_cache.pop(k, None)
@@ -0,0 +1,49 @@
+"""
+Per-worker cache of ``organizations.max_user_seats`` for the user-create seat check.
+
+Seat limits change only through the admin org editor, which drops the entry; other workers
+pick the change up within the TTL. A cached ``None`` (unlimited) lets create_user skip the
+org row lock and the member count entirely.
+"""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from typing import Optional, Tuple
+
+ORG_SEAT_LIMIT_CACHE_TTL_SEC = 60.0
+
+_MISSING = object()
+
+# org_id -> (cached_at monotonic, max_user_seats)
+_org_seat_limit_cache: dict[str, Tuple[float, Optional[int]]] = {}
+_org_seat_limit_lock = threading.Lock()
+
+
+def org_seat_limit_cache_get(org_id: uuid.UUID):
+    """Return the cached ``max_user_seats`` (may be None = unlimited), or ``_MISSING``."""
+    key = str(org_id)
+    now = time.monotonic()
+    with _org_seat_limit_lock:
+        hit = _org_seat_limit_cache.get(key)
+        if not hit:
+            return _MISSING
+        ts, max_user_seats = hit
+        if now - ts > ORG_SEAT_LIMIT_CACHE_TTL_SEC:
+            _org_seat_limit_cache.pop(key, None)
+            return _MISSING
+        return max_user_seats
+
+
+def org_seat_limit_cache_set(org_id: uuid.UUID, max_user_seats: Optional[int]) -> None:
+    with _org_seat_limit_lock:
+        _org_seat_limit_cache[str(org_id)] = (time.monotonic(), max_user_seats)
+
+
+def invalidate_org_seat_limit(org_id: Optional[uuid.UUID] = None) -> None:
+    with _org_seat_limit_lock:
+        if org_id:
+            _org_seat_limit_cache.pop(str(org_id), None)
+        else:
+            _org_seat_limit_cache.clear()
@@ -7,9 +7,11 @@ import uuid
 from typing import Any, Optional, Tuple
 
 from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.utils.ids import uuid7
 from app.models.user import (
     UserRole,
     parse_user_role_from_api,
@@ -103,29 +105,23 @@ def ensure_user_organization_link(
     """Ensure user_organizations row exists so org switcher and access checks stay in sync."""
     if not email or not org_id or not user_id:
         return
-    existing = db.execute(
-        text(
-            """
-            SELECT 1 FROM user_organizations
-            WHERE user_id = :user_id AND org_id = :org_id
-            LIMIT 1
-            """
-        ),
-        {"user_id": str(user_id), "org_id": str(org_id)},
-    ).fetchone()
-    if existing:
-        return
-    try:
-        from app.models.user_organization import UserOrganization
-
-        db.add(
-            UserOrganization(
-                user_id=user_id,
-                org_id=org_id,
-                is_primary=is_primary,
-            )
+    from app.models.user_organization import UserOrganization
+
+    # Single round trip; the (user_id, org_id) unique index (migrations 019 / 083) absorbs races.
+    # Commit only when a row was inserted so the common already-linked case leaves the session alone.
+    stmt = (
+        pg_insert(UserOrganization)
+        .values(
+            id=uuid7(),
+            user_id=uuid.UUID(str(user_id)),
+            org_id=uuid.UUID(str(org_id)),
+            is_primary=is_primary,
         )
-        db.commit()
+        .on_conflict_do_nothing(index_elements=["user_id", "org_id"])
+    )
+    try:
+        if db.execute(stmt).rowcount:
+            db.commit()
     except IntegrityError:
         db.rollback()
 
@@ -234,8 +230,8 @@ def materialize_org_user_row_if_missing(
         db.execute(
             text(
                 """
-                INSERT INTO users (id, org_id, email, hashed_password, role, is_admin, created_at)
-                VALUES (:id, :org_id, :email, :hashed_password, CAST(:role AS userrole), :is_admin, NOW())
+                INSERT INTO users (id, org_id, email, hashed_password, role, created_at)
+                VALUES (:id, :org_id, :email, :hashed_password, CAST(:role AS userrole), NOW())
                 """
             ),
             {
@@ -244,7 +240,6 @@ def materialize_org_user_row_if_missing(
                 "email": email.strip().lower(),
                 "hashed_password": pwd_row[0],
                 "role": userrole_bind_value(user_role),
-                "is_admin": user_role in (UserRole.ADMIN, UserRole.OWNER),
             },
         )
         db.commit()
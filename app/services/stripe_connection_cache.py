@@ -0,0 +1,170 @@
+"""
+Per-worker cache of Stripe OAuth connection state (``check_stripe_connected``) and of the
+Connect ``account_id -> org_id`` mapping used by the platform webhook.
+
+The token row changes only on connect/disconnect/refresh, yet nearly every Stripe and
+finances request (and every platform webhook event) reads it. Entries live for a short TTL
+and are dropped early when Postgres emits ``NOTIFY oauth_token_changed`` (trigger from
+migrations 066 and 086), received over a direct connection (``DATABASE_DIRECT_URL`` under PgBouncer).
+"""
+from __future__ import annotations
+
+import logging
+import select
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+OAUTH_TOKEN_CHANGED_CHANNEL = "oauth_token_changed"
+STRIPE_CONNECTED_CACHE_TTL_SEC = 60.0
+STRIPE_ACCOUNT_ORG_CACHE_TTL_SEC = 300.0
+
+# org_id -> (cached_at monotonic, token present, expires_at)
+_stripe_connected_cache: dict[str, Tuple[float, bool, Optional[datetime]]] = {}
+_stripe_connected_lock = threading.Lock()
+
+# Stripe account_id -> (cached_at monotonic, org_id); only matches are cached so an unknown
+# account is re-checked on Stripe's retry once the org connects.
+_stripe_account_org_cache: dict[str, Tuple[float, uuid.UUID]] = {}
+
+_listener_started = False
+_listener_guard = threading.Lock()
+
+
+def stripe_connected_cache_get(org_id: uuid.UUID) -> Optional[Tuple[bool, Optional[datetime]]]:
+    """Return ``(has_token, expires_at)`` when a fresh entry exists, else None."""
+    key = str(org_id)
+    now = time.monotonic()
+    with _stripe_connected_lock:
+        hit = _stripe_connected_cache.get(key)
+        if not hit:
+            return None
+        ts, has_token, expires_at = hit
+        if now - ts > STRIPE_CONNECTED_CACHE_TTL_SEC:
+            _stripe_connected_cache.pop(key, None)
+            return None
+        return has_token, expires_at
+
+
+def stripe_connected_cache_set(
+    org_id: uuid.UUID, has_token: bool, expires_at: Optional[datetime]
+) -> None:
+    with _stripe_connected_lock:
+        _stripe_connected_cache[str(org_id)] = (time.monotonic(), has_token, expires_at)
+
+
+def stripe_account_org_cache_get(account_id: str) -> Optional[uuid.UUID]:
+    now = time.monotonic()
+    with _stripe_connected_lock:
+        hit = _stripe_account_org_cache.get(account_id)
+        if not hit:
+            return None
+        ts, org_id = hit
+        if now - ts > STRIPE_ACCOUNT_ORG_CACHE_TTL_SEC:
+            _stripe_account_org_cache.pop(account_id, None)
+            return None
+        return org_id
+
+
+def stripe_account_org_cache_set(account_id: str, org_id: uuid.UUID) -> None:
+    with _stripe_connected_lock:
+        _stripe_account_org_cache[account_id] = (time.monotonic(), org_id)
+
+
+def invalidate_stripe_connected_cache(org_id: Optional[str] = None) -> None:
+    """Drop one org (NOTIFY payload is the org id) or both maps entirely when unknown."""
+    with _stripe_connected_lock:
+        if org_id:
+            key = str(org_id)
+            _stripe_connected_cache.pop(key, None)
+            stale = [a for a, (_, o) in _stripe_account_org_cache.items() if str(o) == key]
+            for account_id in stale:
+                del _stripe_account_org_cache[account_id]
+        else:
+            _stripe_connected_cache.clear()
+            _stripe_account_org_cache.clear()
+
+
+def _listener_dsn() -> Optional[str]:
+    """
+    libpq URI for the LISTEN connection, or None when only a PgBouncer (transaction pooling)
+    URL is configured: NOTIFYs are not delivered through it.
+    """
+    from sqlalchemy.engine import make_url
+
+    raw = getattr(settings, "DATABASE_DIRECT_URL", None)
+    if not raw:
+        if getattr(settings, "DATABASE_PGBOUNCER", False):
+            return None
+        raw = settings.DATABASE_URL
+    # psycopg2 wants a libpq URI, not the SQLAlchemy ``postgresql+psycopg2://`` form.
+    url = make_url(raw).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
+def _listen_forever(dsn: str) -> None:
+    """Hold one dedicated connection on LISTEN; reconnect with backoff on failure."""
+    import psycopg2
+    import psycopg2.extensions
+
+    backoff = 1.0
+    while True:
+        conn = None
+        try:
+            conn = psycopg2.connect(dsn)
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {OAUTH_TOKEN_CHANGED_CHANNEL}")
+            # Anything cached before LISTEN was active may have missed a NOTIFY.
+            invalidate_stripe_connected_cache()
+            backoff = 1.0
+            while True:
+                if select.select([conn], [], [], 30.0) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    note = conn.notifies.pop(0)
+                    invalidate_stripe_connected_cache(note.payload or None)
+        except Exception as e:
+            logger.warning("oauth_token LISTEN connection lost: %s", e)
+            invalidate_stripe_connected_cache()
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+        time.sleep(backoff)
+        backoff = min(backoff * 2, 60.0)
+
+
+def start_oauth_token_listener() -> None:
+    """
+    Start the per-process LISTEN thread once (called from app startup). Without a direct
+    connection (PgBouncer and no DATABASE_DIRECT_URL) it is not started and entries only
+    expire by TTL.
+    """
+    global _listener_started
+    dsn = _listener_dsn()
+    if dsn is None:
+        logger.warning(
+            "oauth_token LISTEN disabled: DATABASE_PGBOUNCER is set without DATABASE_DIRECT_URL; "
+            "Stripe connection cache relies on TTL only"
+        )
+        return
+    with _listener_guard:
+        if _listener_started:
+            return
+        _listener_started = True
+    threading.Thread(
+        target=_listen_forever,
+        args=(dsn,),
+        daemon=True,
+        name="oauth-token-listen",
+    ).start()
@@ -3,7 +3,7 @@ Background processor for Stripe webhook events.
 Processes events and updates database records.
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func
 from app.models.stripe_payment import StripePayment
 from app.models.stripe_subscription import StripeSubscription
 from app.models.client import Client
@@ -744,10 +744,10 @@ def _process_subscription_event(db: Session, data: Dict[str, Any], event_type: s
                 StripeSubscription.status.in_(["active", "trialing"])
             )
         ).with_entities(
-            db.func.sum(StripeSubscription.mrr)
-        ).scalar() or Decimal(0)
+            func.sum(StripeSubscription.mrr_cents)
+        ).scalar() or 0
         
-        client.estimated_mrr = total_mrr
+        client.estimated_mrr_cents = total_mrr
         db.add(client)
     
     try:
@@ -4,7 +4,6 @@ This runs automatically when a user connects their Stripe account.
 """
 import stripe
 from decimal import Decimal
-import json
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
@@ -12,6 +11,7 @@ import uuid
 import httpx
 
 from app.core.config import settings
+from app.db.session import json_safe
 from app.core.encryption import decrypt_token, encrypt_token
 from app.models.oauth_token import OAuthToken, OAuthProvider
 from app.models.stripe_payment import StripePayment
@@ -577,7 +577,7 @@ def sync_stripe_historical_data(db: Session, org_id: uuid.UUID = None, backgroun
                 existing_sub.mrr = mrr
                 existing_sub.current_period_start = datetime.fromtimestamp(sub_data.current_period_start)
                 existing_sub.current_period_end = datetime.fromtimestamp(sub_data.current_period_end) if sub_data.current_period_end else None
-                existing_sub.raw = json.loads(json.dumps(sub_data, default=str))
+                existing_sub.raw = json_safe(sub_data)
                 existing_sub.updated_at = datetime.utcnow()
                 subscriptions_updated += 1
             else:
@@ -590,7 +590,7 @@ def sync_stripe_historical_data(db: Session, org_id: uuid.UUID = None, backgroun
                     current_period_end=datetime.fromtimestamp(sub_data.current_period_end) if sub_data.current_period_end else None,
                     plan_id=plan_id,
                     mrr=mrr,
-                    raw=json.loads(json.dumps(sub_data, default=str)),
+                    raw=json_safe(sub_data),
                     created_at=datetime.fromtimestamp(sub_data.created),
                     updated_at=datetime.utcnow()
                 )
@@ -730,7 +730,7 @@ def sync_stripe_historical_data(db: Session, org_id: uuid.UUID = None, backgroun
                         updated = True
                     
                     # Update raw event data
-                    existing_payment.raw_event = json.loads(json.dumps(charge_data, default=str))
+                    existing_payment.raw_event = json_safe(charge_data)
                     existing_payment.updated_at = datetime.utcnow()
                     
                     # Update client lifetime revenue if payment status changed to succeeded
@@ -765,7 +765,7 @@ def sync_stripe_historical_data(db: Session, org_id: uuid.UUID = None, backgroun
                     type='charge',
                     subscription_id=subscription_id,
                     receipt_url=getattr(charge_data, 'receipt_url', None),
-                    raw_event=json.loads(json.dumps(charge_data, default=str)),
+                    raw_event=json_safe(charge_data),
                     created_at=charge_created or datetime.utcnow(),
                     updated_at=datetime.utcnow()
                 )
@@ -805,7 +805,7 @@ def sync_stripe_historical_data(db: Session, org_id: uuid.UUID = None, backgroun
                         existing_payment.status = new_status
                         updated = True
                     
-                    existing_payment.raw_event = json.loads(json.dumps(pi_data, default=str))
+                    existing_payment.raw_event = json_safe(pi_data)
                     existing_payment.updated_at = datetime.utcnow()
                     
                     if updated:
@@ -834,7 +834,7 @@ def sync_stripe_historical_data(db: Session, org_id: uuid.UUID = None, backgroun
                     type='payment_intent',
                     subscription_id=pi_data.invoice if hasattr(pi_data, 'invoice') else None,
                     receipt_url=None,  # PaymentIntents don't have receipt_url directly
-                    raw_event=json.loads(json.dumps(pi_data, default=str)),
+                    raw_event=json_safe(pi_data),
                     created_at=datetime.fromtimestamp(pi_data.created),
                     updated_at=datetime.utcnow()
                 )
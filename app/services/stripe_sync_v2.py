@@ -30,10 +30,12 @@ import httpx
 import time
 
 from app.core.config import settings
+from app.db.session import json_safe
 from app.core.encryption import decrypt_token
 from app.models.oauth_token import OAuthToken, OAuthProvider
 from app.models.stripe_payment import StripePayment
 from app.models.stripe_subscription import StripeSubscription
+from app.models._mixins import dollars_to_cents
 from app.models.client import Client, find_client_by_email
 from app.utils.stripe_ids import normalize_stripe_id_for_dedup
 
@@ -509,125 +511,38 @@ def upsert_payment(db: Session, payment_data, org_id: uuid.UUID, payment_type: s
                 print(f"[SYNC] Skipping invoice {invoice_id} - {existing_invoice_payment.type} {existing_invoice_payment.stripe_id} already exists")
                 return existing_invoice_payment
     
-    # Use PostgreSQL ON CONFLICT for idempotent upsert
-    # Fallback to manual upsert if constraint doesn't exist (migration not run yet)
-    try:
-        stmt = insert(StripePayment).values(
-            org_id=org_id,
-            stripe_id=payment_id,
-            client_id=client.id if client else None,
-            amount_cents=amount_cents,
-            currency=getattr(payment_data, 'currency', 'usd'),
-            status=status,
-            type=payment_type,
-            subscription_id=subscription_id,
-            invoice_id=invoice_id,
-            receipt_url=receipt_url,
-            raw_event=json.loads(json.dumps(payment_data, default=str)),
-            created_at=created_at,
+    # Idempotent upsert on uq_stripe_payments_stripe_id_org_id; RETURNING loads the row in the
+    # same round trip (populate_existing refreshes an instance already in the session).
+    stmt = insert(StripePayment).values(
+        org_id=org_id,
+        stripe_id=payment_id,
+        client_id=client.id if client else None,
+        amount_cents=amount_cents,
+        currency=getattr(payment_data, 'currency', 'usd'),
+        status=status,
+        type=payment_type,
+        subscription_id=subscription_id,
+        invoice_id=invoice_id,
+        receipt_url=receipt_url,
+        raw_event=json_safe(payment_data),
+        created_at=created_at,
+        updated_at=datetime.utcnow()
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['stripe_id', 'org_id'],
+        set_=dict(
+            status=stmt.excluded.status,
+            amount_cents=stmt.excluded.amount_cents,
+            currency=stmt.excluded.currency,
+            client_id=stmt.excluded.client_id,
+            subscription_id=stmt.excluded.subscription_id,
+            invoice_id=stmt.excluded.invoice_id,
+            receipt_url=stmt.excluded.receipt_url,
+            raw_event=stmt.excluded.raw_event,
             updated_at=datetime.utcnow()
         )
-        
-        stmt = stmt.on_conflict_do_update(
-            index_elements=['stripe_id', 'org_id'],
-            set_=dict(
-                status=stmt.excluded.status,
-                amount_cents=stmt.excluded.amount_cents,
-                currency=stmt.excluded.currency,
-                client_id=stmt.excluded.client_id,
-                subscription_id=stmt.excluded.subscription_id,
-                invoice_id=stmt.excluded.invoice_id,
-                receipt_url=stmt.excluded.receipt_url,
-                raw_event=stmt.excluded.raw_event,
-                updated_at=datetime.utcnow()
-            )
-        )
-        
-        db.execute(stmt)
-    except Exception as e:
-        # Fallback: manual upsert if constraint doesn't exist
-        print(f"[SYNC] ON CONFLICT failed, using manual upsert: {str(e)}")
-        existing_payment = db.query(StripePayment).filter(
-            StripePayment.stripe_id == payment_id,
-            StripePayment.org_id == org_id
-        ).first()
-        
-        if existing_payment:
-            # Update existing
-            existing_payment.status = status
-            existing_payment.amount_cents = amount_cents
-            existing_payment.currency = getattr(payment_data, 'currency', 'usd')
-            existing_payment.client_id = client.id if client else None
-            existing_payment.subscription_id = subscription_id
-            existing_payment.invoice_id = invoice_id
-            existing_payment.receipt_url = receipt_url
-            existing_payment.raw_event = json.loads(json.dumps(payment_data, default=str))
-            existing_payment.updated_at = datetime.utcnow()
-        else:
-            if status == 'succeeded':
-                if subscription_id and invoice_id:
-                    norm_sub = normalize_stripe_id_for_dedup(subscription_id)
-                    norm_inv = normalize_stripe_id_for_dedup(invoice_id)
-                    fallback_candidates = db.query(StripePayment).filter(
-                        StripePayment.org_id == org_id,
-                        StripePayment.status == 'succeeded',
-                        or_(
-                            StripePayment.invoice_id == invoice_id,
-                            StripePayment.subscription_id == subscription_id
-                        )
-                    ).all()
-                    existing_sub_invoice = next(
-                        (p for p in fallback_candidates if normalize_stripe_id_for_dedup(p.subscription_id or "") == norm_sub and normalize_stripe_id_for_dedup(p.invoice_id or "") == norm_inv),
-                        None
-                    )
-                    if existing_sub_invoice and existing_sub_invoice.stripe_id != payment_id:
-                        existing_type_priority = {'charge': 0, 'payment_intent': 1, 'invoice': 2}.get(existing_sub_invoice.type, 3)
-                        new_type_priority = {'charge': 0, 'payment_intent': 1, 'invoice': 2}.get(payment_type, 3)
-                        
-                        if new_type_priority > existing_type_priority:
-                            print(f"[SYNC] Skipping {payment_type} payment {payment_id} - {existing_sub_invoice.type} {existing_sub_invoice.stripe_id} already exists for subscription {subscription_id}, invoice {invoice_id}")
-                            return existing_sub_invoice
-                
-                # Check invoice_id duplicates
-                if invoice_id and payment_type == 'invoice':
-                    existing_invoice = db.query(StripePayment).filter(
-                        StripePayment.invoice_id == invoice_id,
-                        StripePayment.org_id == org_id,
-                        StripePayment.status == 'succeeded',
-                        StripePayment.type.in_(['charge', 'payment_intent'])
-                    ).first()
-                    
-                    if existing_invoice:
-                        print(f"[SYNC] Skipping invoice {invoice_id} - {existing_invoice.type} {existing_invoice.stripe_id} already exists")
-                        return existing_invoice
-            
-            # Create new
-            payment = StripePayment(
-                org_id=org_id,
-                stripe_id=payment_id,
-                client_id=client.id if client else None,
-                amount_cents=amount_cents,
-                currency=getattr(payment_data, 'currency', 'usd'),
-                status=status,
-                type=payment_type,
-                subscription_id=subscription_id,
-                invoice_id=invoice_id,
-                receipt_url=receipt_url,
-                raw_event=json.loads(json.dumps(payment_data, default=str)),
-                created_at=created_at,
-                updated_at=datetime.utcnow()
-            )
-            db.add(payment)
-            db.flush()  # Flush to ensure payment is available for query
-    
-    # Get the payment record (after upsert)
-    payment = db.query(StripePayment).filter(
-        StripePayment.stripe_id == payment_id,
-        StripePayment.org_id == org_id
-    ).first()
-    
-    if not payment:
-        raise Exception(f"Failed to retrieve payment {payment_id} after upsert")
+    ).returning(StripePayment)
+    payment = db.scalars(stmt, execution_options={"populate_existing": True}).one()
     
     # Note: Client lifetime revenue is recalculated during reconciliation
     # to avoid double-counting during sync
@@ -779,7 +694,7 @@ def upsert_subscription(db: Session, sub_data, org_id: uuid.UUID):
         existing_sub.mrr = float(mrr)
         existing_sub.current_period_start = datetime.fromtimestamp(sub_data.current_period_start) if sub_data.current_period_start else None
         existing_sub.current_period_end = datetime.fromtimestamp(sub_data.current_period_end) if sub_data.current_period_end else None
-        existing_sub.raw = json.loads(json.dumps(sub_data, default=str))
+        existing_sub.raw = json_safe(sub_data)
         existing_sub.updated_at = datetime.utcnow()
         if client and not existing_sub.client_id:
             existing_sub.client_id = client.id
@@ -793,75 +708,29 @@ def upsert_subscription(db: Session, sub_data, org_id: uuid.UUID):
         stripe_subscription_id=sub_id,
         client_id=client.id if client else None,
         status=subscription_status,
-        mrr=float(mrr),
+        mrr_cents=dollars_to_cents(mrr),
         current_period_start=datetime.fromtimestamp(sub_data.current_period_start) if sub_data.current_period_start else None,
         current_period_end=datetime.fromtimestamp(sub_data.current_period_end) if sub_data.current_period_end else None,
-        raw=json.loads(json.dumps(sub_data, default=str)),
+        raw=json_safe(sub_data),
         created_at=datetime.fromtimestamp(sub_data.created) if sub_data.created else datetime.utcnow(),
         updated_at=datetime.utcnow()
     )
     
-    # Check if unique constraint exists, if not use manual upsert
-    try:
-        stmt = stmt.on_conflict_do_update(
-            index_elements=['stripe_subscription_id', 'org_id'],
-            set_=dict(
-                status=stmt.excluded.status,
-                mrr=stmt.excluded.mrr,
-                current_period_start=stmt.excluded.current_period_start,
-                current_period_end=stmt.excluded.current_period_end,
-                raw=stmt.excluded.raw,
-                updated_at=datetime.utcnow()
-            )
+    # Upsert on uq_stripe_subscriptions_stripe_subscription_id_org_id (a concurrent sync may have
+    # inserted it since the lookup above); RETURNING loads the row in the same round trip.
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['stripe_subscription_id', 'org_id'],
+        set_=dict(
+            status=stmt.excluded.status,
+            mrr_cents=stmt.excluded.mrr_cents,
+            current_period_start=stmt.excluded.current_period_start,
+            current_period_end=stmt.excluded.current_period_end,
+            raw=stmt.excluded.raw,
+            updated_at=datetime.utcnow()
         )
-        db.execute(stmt)
-        print(f"[SYNC] Created/updated subscription {sub_id} via ON CONFLICT: status={subscription_status}, mrr={mrr}")
-    except Exception as e:
-        # Fallback: manual upsert if constraint doesn't exist
-        print(f"[SYNC] ON CONFLICT failed for subscription, using manual upsert: {str(e)}")
-        # Check again in case it was created by another process
-        existing = db.query(StripeSubscription).filter(
-            StripeSubscription.stripe_subscription_id == sub_id,
-            StripeSubscription.org_id == org_id
-        ).first()
-        
-        if existing:
-            existing.status = subscription_status
-            existing.mrr = float(mrr)
-            existing.current_period_start = datetime.fromtimestamp(sub_data.current_period_start) if sub_data.current_period_start else None
-            existing.current_period_end = datetime.fromtimestamp(sub_data.current_period_end) if sub_data.current_period_end else None
-            existing.raw = json.loads(json.dumps(sub_data, default=str))
-            existing.updated_at = datetime.utcnow()
-            if client and not existing.client_id:
-                existing.client_id = client.id
-            print(f"[SYNC] Updated existing subscription {sub_id} via manual upsert: status={subscription_status}, mrr={mrr}")
-            db.flush()
-            return existing, True
-        else:
-            subscription = StripeSubscription(
-                org_id=org_id,
-                stripe_subscription_id=sub_id,
-                client_id=client.id if client else None,
-                status=subscription_status,
-                mrr=float(mrr),
-                current_period_start=datetime.fromtimestamp(sub_data.current_period_start) if sub_data.current_period_start else None,
-                current_period_end=datetime.fromtimestamp(sub_data.current_period_end) if sub_data.current_period_end else None,
-                raw=json.loads(json.dumps(sub_data, default=str)),
-                created_at=datetime.fromtimestamp(sub_data.created) if sub_data.created else datetime.utcnow(),
-                updated_at=datetime.utcnow()
-            )
-            db.add(subscription)
-            print(f"[SYNC] Created new subscription {sub_id}: status={subscription_status}, mrr={mrr}")
-            db.flush()
-            return subscription, False
-    
-    subscription = db.query(StripeSubscription).filter(
-        StripeSubscription.stripe_subscription_id == sub_id,
-        StripeSubscription.org_id == org_id
-    ).first()
-    
-    if not subscription:
-        raise Exception(f"Failed to retrieve subscription {sub_id} after upsert")
+    ).returning(StripeSubscription)
+    subscription = db.scalars(stmt, execution_options={"populate_existing": True}).one()
+    print(f"[SYNC] Created/updated subscription {sub_id} via ON CONFLICT: status={subscription_status}, mrr={mrr}")
     return subscription, True  # ON_CONFLICT path: treat as update for counting
 
 
@@ -0,0 +1,151 @@
+"""
+Stripe webhook event processing, shared by the inline webhook path and the RQ job.
+
+With STRIPE_WEBHOOK_ASYNC and RQ long jobs enabled, the webhook only verifies, stores the
+``stripe_events`` row and enqueues ``process_stored_stripe_event_job``; the worker applies it.
+Rows that stay ``processed=False`` (job crashed / lost) are re-enqueued by the worker sweep.
+"""
+from __future__ import annotations
+
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.oauth_token import OAuthProvider, OAuthToken
+from app.models.stripe_event import StripeEvent
+from app.utils.ids import uuid7
+
+logger = logging.getLogger(__name__)
+
+STRIPE_EVENT_JOB_TIMEOUT_SEC = 300
+# Leave fresh rows to their own job; Stripe stops retrying after ~3 days, so do we.
+_UNPROCESSED_MIN_AGE = timedelta(minutes=5)
+_UNPROCESSED_MAX_AGE = timedelta(days=3)
+_UNPROCESSED_SWEEP_LIMIT = 100
+
+
+def stripe_webhook_async_enabled() -> bool:
+    from app.long_jobs import long_jobs_enabled
+
+    return bool(getattr(settings, "STRIPE_WEBHOOK_ASYNC", True)) and long_jobs_enabled()
+
+
+# Envelope keys the processor (and payments.raw_event readers) use; the rest of the Stripe
+# envelope (request, pending_webhooks, object) is dropped before storage.
+_STORED_EVENT_KEYS = ("id", "type", "account", "created", "livemode", "api_version", "data")
+
+
+def trim_stripe_event(event: dict) -> dict:
+    return {k: event[k] for k in _STORED_EVENT_KEYS if k in event}
+
+
+def store_stripe_event(db: Session, event: dict, org_id: uuid.UUID) -> Optional[Tuple[uuid.UUID, bool]]:
+    """
+    Idempotently record a verified event in one statement (uq_stripe_events_event_org).
+
+    Returns ``(row id, inserted)`` when the event still needs processing (new, or a prior attempt
+    failed, in which case payload/type are refreshed), or None when it was already processed.
+    Not committed. Callers pass the trimmed event (``trim_stripe_event``).
+    """
+    stmt = pg_insert(StripeEvent).values(
+        id=uuid7(),
+        org_id=org_id,
+        stripe_event_id=event["id"],
+        type=event["type"],
+        payload=event,
+        processed=False,
+        received_at=datetime.utcnow(),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[StripeEvent.stripe_event_id, StripeEvent.org_id],
+        set_={"payload": stmt.excluded.payload, "type": stmt.excluded.type},
+        where=StripeEvent.processed.is_(False),
+    ).returning(StripeEvent.id, literal_column("xmax = 0"))
+    row = db.execute(stmt).first()
+    return (row[0], bool(row[1])) if row else None
+
+
+def apply_stored_stripe_event(db: Session, row_id: uuid.UUID, org_id: uuid.UUID, event: dict) -> None:
+    """Run the processor for a stored event, mark it processed and commit. Raises on failure."""
+    from app.services.stripe_processor import process_stripe_event
+
+    process_stripe_event(db, event, org_id)
+    now = datetime.utcnow()
+    db.query(StripeEvent).filter(StripeEvent.id == row_id).update(
+        {StripeEvent.processed: True, StripeEvent.processed_at: now},
+        synchronize_session=False,
+    )
+    # Mark org's Stripe data as updated so terminal tab can refetch only when webhook fired
+    db.query(OAuthToken).filter(
+        OAuthToken.provider == OAuthProvider.STRIPE,
+        OAuthToken.org_id == org_id,
+    ).update({OAuthToken.last_webhook_processed_at: now}, synchronize_session=False)
+    db.commit()
+
+
+def process_stored_stripe_event_job(stripe_event_row_id: str) -> None:
+    """RQ job: apply one stored stripe_events row (no-op if already processed)."""
+    from app.db.session import SessionLocal
+
+    db = SessionLocal()
+    try:
+        # Row lock: a redelivered event can be queued twice; the second job skips it.
+        stripe_event = (
+            db.query(StripeEvent)
+            .filter(StripeEvent.id == uuid.UUID(stripe_event_row_id))
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if stripe_event is None or stripe_event.processed:
+            return
+        apply_stored_stripe_event(db, stripe_event.id, stripe_event.org_id, stripe_event.payload)
+        logger.info(
+            "stripe event %s (%s) processed for org %s",
+            stripe_event.stripe_event_id,
+            stripe_event.type,
+            stripe_event.org_id,
+        )
+    except Exception:
+        db.rollback()
+        logger.exception("stripe event job failed row=%s", stripe_event_row_id)
+        raise
+    finally:
+        db.close()
+
+
+def enqueue_stored_stripe_event(stripe_event_row_id: uuid.UUID) -> None:
+    from app.long_jobs import schedule_background_work
+
+    schedule_background_work(
+        process_stored_stripe_event_job,
+        None,
+        str(stripe_event_row_id),
+        prefer_rq=True,
+        job_timeout=STRIPE_EVENT_JOB_TIMEOUT_SEC,
+    )
+
+
+def requeue_unprocessed_stripe_events(db: Session) -> int:
+    """Re-enqueue stored events whose job never completed (worker sweep)."""
+    now = datetime.utcnow()
+    rows = (
+        db.query(StripeEvent.id)
+        .filter(
+            # "= false" (not IS false) so the planner can use ix_stripe_events_unprocessed
+            StripeEvent.processed == False,  # noqa: E712
+            StripeEvent.received_at < now - _UNPROCESSED_MIN_AGE,
+            StripeEvent.received_at > now - _UNPROCESSED_MAX_AGE,
+        )
+        .order_by(StripeEvent.received_at)
+        .limit(_UNPROCESSED_SWEEP_LIMIT)
+        .all()
+    )
+    for (row_id,) in rows:
+        enqueue_stored_stripe_event(row_id)
+    return len(rows)
@@ -0,0 +1,135 @@
+"""
+Short-TTL cache of resolved tab permission maps (GET /users/tabs/access and friends).
+
+The map only changes when user/org tab permissions or the user's role are edited, but the UI
+asks for it on every navigation. Stored in Redis when REDIS_URL is set (shared across workers),
+else in-process. Writers call the invalidate_* helpers; the TTL bounds staleness otherwise.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.rate_limit import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+TAB_PERMISSIONS_CACHE_TTL_SEC = 60
+
+_KEY_PREFIX = "tabperms"
+
+_memory_cache: dict[str, tuple[float, Dict[str, bool]]] = {}
+_memory_lock = threading.Lock()
+
+
+def _cache_key(user_id, org_id) -> str:
+    return f"{_KEY_PREFIX}:{user_id}:{org_id}"
+
+
+def tab_permissions_cache_get(user_id, org_id) -> Optional[Dict[str, bool]]:
+    key = _cache_key(user_id, org_id)
+    r = get_redis_client()
+    if r is not None:
+        try:
+            raw = r.get(key)
+            return json.loads(raw) if raw else None
+        except Exception as e:
+            logger.warning("tab permission cache read failed: %s", e)
+            return None
+    now = time.monotonic()
+    with _memory_lock:
+        hit = _memory_cache.get(key)
+        if not hit:
+            return None
+        ts, perms = hit
+        if now - ts > TAB_PERMISSIONS_CACHE_TTL_SEC:
+            _memory_cache.pop(key, None)
+            return None
+        return dict(perms)
+
+
+def tab_permissions_cache_set(user_id, org_id, perms: Dict[str, bool]) -> None:
+    key = _cache_key(user_id, org_id)
+    r = get_redis_client()
+    if r is not None:
+        try:
+            r.set(key, json.dumps(perms, separators=(",", ":")), ex=TAB_PERMISSIONS_CACHE_TTL_SEC)
+        except Exception as e:
+            logger.warning("tab permission cache write failed: %s", e)
+        return
+    with _memory_lock:
+        _memory_cache[key] = (time.monotonic(), dict(perms))
+        # Bound memory: drop oldest if map grows large
+        if len(_memory_cache) > 4096:
+            oldest = sorted(_memory_cache.items(), key=lambda kv: kv[1][0])[:1024]
+            for k, _ in oldest:
+                _memory_cache.pop(k, None)
+
+
+def invalidate_tab_permissions(user_id, org_id) -> None:
+    """Drop one user's cached map in one org (user tab permission or role change)."""
+    key = _cache_key(user_id, org_id)
+    r = get_redis_client()
+    if r is not None:
+        try:
+            r.delete(key)
+        except Exception as e:
+            logger.warning("tab permission cache invalidate failed: %s", e)
+    with _memory_lock:
+        _memory_cache.pop(key, None)
+
+
+def invalidate_org_tab_permissions(org_id) -> None:
+    """Drop every cached map scoped to org_id (org-level tab permission change)."""
+    suffix = f":{org_id}"
+    r = get_redis_client()
+    if r is not None:
+        try:
+            keys = list(r.scan_iter(match=f"{_KEY_PREFIX}:*{suffix}", count=500))
+            if keys:
+                r.delete(*keys)
+        except Exception as e:
+            logger.warning("tab permission cache org invalidate failed: %s", e)
+    with _memory_lock:
+        for k in [k for k in _memory_cache if k.endswith(suffix)]:
+            _memory_cache.pop(k, None)
+
+
+def get_cached_user_tab_permissions(user, db: Session, request=None) -> Dict[str, bool]:
+    """
+    get_user_tab_permissions behind the cache, keyed by (user id, selected org).
+
+    When ``request`` is passed the map is also kept on ``request.state.tab_perms`` so repeated
+    tab checks within one request are plain dict lookups.
+    """
+    from app.api.deps import _tab_scope_org_id, get_user_tab_permissions
+
+    state = getattr(request, "state", None)
+    perms = getattr(state, "tab_perms", None) if state is not None else None
+    if perms is not None:
+        return perms
+
+    org_id = _tab_scope_org_id(user)
+    perms = tab_permissions_cache_get(user.id, org_id)
+    if perms is None:
+        perms = get_user_tab_permissions(user, db)
+        tab_permissions_cache_set(user.id, org_id, perms)
+    if state is not None:
+        state.tab_perms = perms
+    return perms
+
+
+def cached_check_tab_access(tab_name: str, user, db: Session, request=None) -> bool:
+    """check_tab_access answered from the resolved map when the tab is in it."""
+    has_access = get_cached_user_tab_permissions(user, db, request).get(tab_name)
+    if has_access is None:
+        # Tabs outside the resolved map (legacy names like finances/stripe)
+        from app.api.deps import check_tab_access
+
+        has_access = check_tab_access(tab_name, user, db)
+    return has_access
@@ -0,0 +1,70 @@
+"""
+Monthly range partitions for append-only tables (migration 075).
+
+``events`` (occurred_at) and ``audit_logs`` (created_at) are partitioned by month so each
+month's indexes stay small and old months can be detached/dropped instead of deleted row by
+row. The worker calls ``ensure_monthly_partitions`` periodically to create the current and
+next months ahead of time; rows outside every partition land in ``<table>_default``.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import date
+from typing import Iterator, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# table -> partition key column
+PARTITIONED_TABLES = {"events": "occurred_at", "audit_logs": "created_at"}
+PARTITION_MONTHS_AHEAD = 2
+
+
+def _add_months(d: date, months: int) -> date:
+    index = d.year * 12 + d.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def monthly_ranges(start: date, end: date) -> Iterator[Tuple[str, date, date]]:
+    """``(suffix, from, to)`` for every month from ``start``'s month through ``end``'s month."""
+    month = date(start.year, start.month, 1)
+    while month <= end:
+        upper = _add_months(month, 1)
+        yield f"{month:%Y_%m}", month, upper
+        month = upper
+
+
+def partition_ddl(table: str, suffix: str, lower: date, upper: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {table}_{suffix} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+    )
+
+
+def ensure_monthly_partitions(db: Session, months_ahead: int = PARTITION_MONTHS_AHEAD) -> int:
+    """Create missing partitions for this month and ``months_ahead`` more. Returns tables touched."""
+    today = date.today()
+    horizon = _add_months(today, months_ahead)
+    touched = 0
+    for table in PARTITIONED_TABLES:
+        partitioned = db.execute(
+            text(
+                "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+                "WHERE c.relname = :t AND c.relnamespace = current_schema()::regnamespace"
+            ),
+            {"t": table},
+        ).scalar()
+        if not partitioned:
+            continue
+        try:
+            for suffix, lower, upper in monthly_ranges(today, horizon):
+                db.execute(text(partition_ddl(table, suffix, lower, upper)))
+            db.commit()
+            touched += 1
+        except Exception as e:
+            # e.g. the default partition already holds rows for that month
+            db.rollback()
+            logger.warning("partition roll-forward failed for %s: %s", table, e)
+    return touched
@@ -0,0 +1,19 @@
+"""
+Time-ordered UUIDs (version 7, RFC 9562) for append-heavy tables.
+
+The leading 48 bits are the Unix time in milliseconds, so new primary keys land on the
+rightmost B-tree leaf instead of a random page (uuid4). The remaining 74 bits are random.
+Ordering is by millisecond only; ids minted in the same millisecond are unordered.
+"""
+import os
+import time
+import uuid
+
+
+def uuid7() -> uuid.UUID:
+    """Return a new version-7 UUID."""
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    # version (4 bits at 76..79) and RFC 4122 variant (2 bits at 62..63)
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+    return uuid.UUID(int=value)
@@ -110,6 +110,8 @@ def _dispatcher_loop() -> None:
     last_call_library_drain = 0.0
     last_stripe_catchup = 0.0
     last_instagram_sync = 0.0
+    last_partition_maintenance = 0.0
+    last_funnel_rollup = 0.0
     call_library_drain_interval = float(
         getattr(settings, "CALL_LIBRARY_WORKER_DRAIN_INTERVAL_SEC", 180) or 180
     )
@@ -119,6 +121,10 @@ def _dispatcher_loop() -> None:
     instagram_sync_interval = float(
         getattr(settings, "INSTAGRAM_SYNC_INTERVAL_SEC", 21600) or 21600
     )
+    partition_maintenance_interval = float(
+        getattr(settings, "PARTITION_MAINTENANCE_INTERVAL_SEC", 21600) or 21600
+    )
+    funnel_rollup_interval = float(getattr(settings, "FUNNEL_ROLLUP_INTERVAL_SEC", 3600) or 0)
     while not _SHUTDOWN:
         loop_started = time.time()
         try:
@@ -157,6 +163,19 @@ def _dispatcher_loop() -> None:
                             LOG.info("stripe catch-up %s", stats)
                     except Exception:
                         LOG.exception("stripe catch-up failed")
+                    try:
+                        from app.services.stripe_webhook_jobs import (
+                            requeue_unprocessed_stripe_events,
+                            stripe_webhook_async_enabled,
+                        )
+
+                        if stripe_webhook_async_enabled():
+                            n = requeue_unprocessed_stripe_events(db)
+                            if n:
+                                LOG.info("stripe webhook events requeued=%s", n)
+                    except Exception:
+                        LOG.exception("stripe webhook requeue sweep failed")
+                        db.rollback()
                     last_stripe_catchup = now
                 if instagram_sync_interval > 0 and now - last_instagram_sync >= instagram_sync_interval:
                     try:
@@ -177,6 +196,24 @@ def _dispatcher_loop() -> None:
                     except Exception:
                         LOG.exception("instagram sync enqueue failed")
                     last_instagram_sync = now
+                if now - last_partition_maintenance >= partition_maintenance_interval:
+                    try:
+                        from app.services.table_partitions import ensure_monthly_partitions
+
+                        ensure_monthly_partitions(db)
+                    except Exception:
+                        LOG.exception("partition maintenance failed")
+                        db.rollback()
+                    last_partition_maintenance = now
+                if funnel_rollup_interval > 0 and now - last_funnel_rollup >= funnel_rollup_interval:
+                    try:
+                        from app.services.funnel_rollup import refresh_funnel_step_daily_counts
+
+                        refresh_funnel_step_daily_counts(db)
+                    except Exception:
+                        LOG.exception("funnel rollup refresh failed")
+                        db.rollback()
+                    last_funnel_rollup = now
                 if attempted:
                     LOG.info("dispatcher: processed %d job(s)", attempted)
         except Exception:
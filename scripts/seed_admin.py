@@ -30,7 +30,6 @@ def seed_admin():
         admin = User(
             email=settings.SUDO_ADMIN_EMAIL,
             hashed_password=get_password_hash(settings.SUDO_ADMIN_PASSWORD),
-            is_admin=True,
             org_id=DEFAULT_ORG_ID,
             role=UserRole.OWNER,
         )
@@ -0,0 +1,49 @@
+"""Security audit rows are queued, batched into one INSERT on their own session, and shed when backed up."""
+import os
+from unittest.mock import MagicMock, patch
+
+from sqlalchemy.dialects import postgresql
+
+from app.core import audit
+from app.models.audit_log import AuditEventType, AuditLog
+
+
+def test_queued_events_flush_as_single_insert():
+    session = MagicMock()
+    with patch.object(audit, "_writer_pid", os.getpid()), patch(
+        "app.db.session.SessionLocal", return_value=session
+    ):
+        for _ in range(3):
+            audit.log_security_event(
+                db=None,
+                event_type=AuditEventType.RATE_LIMIT_EXCEEDED,
+                org_id="00000000-0000-0000-0000-000000000001",
+                details={"endpoint": "x"},
+            )
+        assert audit.flush_audit_events() == 3
+
+    session.execute.assert_called_once()
+    stmt, rows = session.execute.call_args.args
+    assert stmt.table.name == "audit_logs" and len(rows) == 3
+    assert rows[0]["event_type"] == "rate_limit_exceeded"
+    assert rows[0]["details_json"] == '{"endpoint":"x"}'
+    session.commit.assert_called_once()
+
+
+def test_event_type_binds_lowercase_value():
+    bind = AuditLog.__table__.c.event_type.type.bind_processor(postgresql.dialect())
+    assert bind(AuditEventType.RATE_LIMIT_EXCEEDED) == "rate_limit_exceeded"
+    assert bind("token_decrypted") == "token_decrypted"
+
+
+def test_full_queue_drops_instead_of_blocking():
+    with patch.object(audit, "_writer_pid", os.getpid()), patch.object(
+        audit, "_audit_queue", audit.queue.Queue(maxsize=1)
+    ), patch.object(audit, "_dropped_events", 0):
+        for _ in range(3):
+            audit.log_security_event(
+                db=None,
+                event_type=AuditEventType.TOKEN_DECRYPTED,
+                org_id="00000000-0000-0000-0000-000000000001",
+            )
+        assert audit.dropped_audit_events() == 2
@@ -0,0 +1,29 @@
+"""Brevo contact pages are validated once per contact and serialized with orjson."""
+
+import orjson
+
+from app.api.integrations import _brevo_contact_list_response
+
+
+def test_contact_page_payload():
+    data = {
+        "contacts": [
+            {"id": 1, "email": "a@example.com", "listIds": [3]},
+            {"id": 2, "attributes": {"EMAIL": "b@example.com"}},
+            {"email": "missing-id@example.com"},
+        ],
+        "count": 3,
+    }
+    body = orjson.loads(_brevo_contact_list_response(data, 0, 50, "contact").body)
+    assert body["count"] == 3
+    assert body["offset"] == 0 and body["limit"] == 50
+    assert [c["id"] for c in body["contacts"]] == [1, 2]
+    assert body["contacts"][1]["email"] == "b@example.com"
+    assert body["contacts"][0]["listIds"] == [3]
+
+
+def test_valid_page_keeps_every_contact():
+    data = {"contacts": [{"id": i, "email": f"{i}@example.com"} for i in range(3)]}
+    body = orjson.loads(_brevo_contact_list_response(data, 10, 3, "contact").body)
+    assert [c["id"] for c in body["contacts"]] == [0, 1, 2]
+    assert body["count"] == 3 and body["offset"] == 10
@@ -0,0 +1,19 @@
+"""Client.progress_percent: Python value on instances, SQL projection on the class."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models.client import Client
+
+
+def test_progress_percent_instance_matches_calculate_progress():
+    client = Client(program_start_date=datetime.utcnow() - timedelta(days=10), program_duration_days=40)
+    client.normalize_program_dates()
+    assert 24.9 < client.progress_percent < 25.1
+    assert Client(program_start_date=None).progress_percent is None
+
+
+def test_progress_percent_compiles_to_sql():
+    sql = str(select(Client.id, Client.progress_percent).compile(dialect=postgresql.dialect()))
+    assert "EXTRACT(epoch FROM" in sql and "AS progress_percent" in sql
@@ -0,0 +1,20 @@
+"""Program date parsing on client create/update payloads."""
+
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.client import ClientCreate, ClientUpdate
+
+
+def test_program_dates_parse_to_naive_utc():
+    assert ClientCreate(program_start_date="2026-01-05").program_start_date == datetime(2026, 1, 5)
+    assert ClientUpdate(program_end_date="2026-01-05T10:00:00Z").program_end_date == datetime(2026, 1, 5, 10)
+    assert ClientUpdate(program_start_date="2026-01-05T10:00:00+02:00").program_start_date == datetime(2026, 1, 5, 8)
+    assert ClientUpdate(program_start_date="").program_start_date is None
+
+
+def test_invalid_program_date_rejected():
+    with pytest.raises(ValidationError, match="Invalid datetime format"):
+        ClientUpdate(program_start_date="not-a-date")
@@ -0,0 +1,25 @@
+"""orjson-backed JSON handling for JSON/JSONB columns."""
+import uuid
+from decimal import Decimal
+
+import stripe
+
+from app.db.session import engine, json_safe
+
+
+def test_json_safe_copies_stripe_objects_to_plain_json():
+    obj = stripe.util.convert_to_stripe_object(
+        {"id": "sub_1", "object": "subscription", "metadata": {"plan": "pro"}}
+    )
+    value = json_safe({"sub": obj, "amount": Decimal("1.50"), 3: "x"})
+    assert value == {
+        "sub": {"id": "sub_1", "object": "subscription", "metadata": {"plan": "pro"}},
+        "amount": "1.50",
+        "3": "x",
+    }
+    assert type(value["sub"]) is dict
+
+
+def test_engine_serializes_json_binds_with_orjson():
+    org_id = uuid.UUID(int=1)
+    assert engine.dialect._json_serializer({"org_id": org_id}) == f'{{"org_id":"{org_id}"}}'
@@ -0,0 +1,33 @@
+"""Unit tests for PgBouncer-mode engine settings in app.db.session."""
+from app.db import session
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.sql = []
+
+    def exec_driver_sql(self, sql):
+        self.sql.append(sql)
+
+
+def test_pgbouncer_async_connect_args(monkeypatch):
+    monkeypatch.setattr(session, "_USE_PGBOUNCER", True)
+    args = session._async_connect_args()
+    assert "server_settings" not in args
+    assert args["prepared_statement_cache_size"] == 0
+    assert args["statement_cache_size"] == 0
+    first, second = args["prepared_statement_name_func"](), args["prepared_statement_name_func"]()
+    assert first.startswith("__asyncpg_") and first != second
+
+
+def test_direct_async_connect_args_keep_session_timeout(monkeypatch):
+    monkeypatch.setattr(session, "_USE_PGBOUNCER", False)
+    args = session._async_connect_args()
+    assert args["server_settings"] == {"statement_timeout": session.STATEMENT_TIMEOUT}
+    assert "prepared_statement_name_func" not in args
+
+
+def test_statement_timeout_is_transaction_scoped():
+    conn = _FakeConnection()
+    session._set_local_statement_timeout(conn)
+    assert conn.sql == ["SET LOCAL statement_timeout = '120s'"]
@@ -0,0 +1,87 @@
+"""Token encryption round-trips and stays compatible with cryptography's Fernet tokens."""
+import base64
+
+import pytest
+
+from cryptography.fernet import Fernet
+
+from app.core import encryption_v2
+
+
+def _fresh_manager(monkeypatch, key: bytes):
+    monkeypatch.setattr(encryption_v2.settings, "ENCRYPTION_KEY", key.decode())
+    monkeypatch.delenv("ENCRYPTION_KEY_ROTATION", raising=False)
+    monkeypatch.setattr(encryption_v2, "_key_manager", None)
+
+
+def test_round_trip_and_cryptography_compat(monkeypatch):
+    key = Fernet.generate_key()
+    _fresh_manager(monkeypatch, key)
+
+    stored = encryption_v2.encrypt_token("sk_test_123")
+    assert stored.startswith("v1:")
+    assert encryption_v2.decrypt_token(stored) == "sk_test_123"
+
+    # Default keeps the double-wrapped form older deploys read, compatible with cryptography
+    assert Fernet(key).decrypt(base64.urlsafe_b64decode(stored[3:])) == b"sk_test_123"
+
+    # Opt-in single wrap stores the plain Fernet token after the prefix; both forms decrypt
+    monkeypatch.setattr(encryption_v2.settings, "ENCRYPTION_FERNET_SINGLE_WRAP", True)
+    single = encryption_v2.encrypt_token("sk_test_456")
+    assert Fernet(key).decrypt(single[3:].encode()) == b"sk_test_456"
+    assert encryption_v2.decrypt_token(single) == "sk_test_456"
+    legacy = "v1:" + base64.urlsafe_b64encode(Fernet(key).encrypt(b"old")).decode()
+    assert encryption_v2.decrypt_token(legacy) == "old"
+
+
+def test_aesgcm_tokens_round_trip_and_survive_rotation(monkeypatch):
+    old_key, new_key = Fernet.generate_key(), Fernet.generate_key()
+    _fresh_manager(monkeypatch, old_key)
+    monkeypatch.setattr(encryption_v2.settings, "ENCRYPTION_AESGCM", True)
+    stored = encryption_v2.encrypt_token("sk_live_abc")
+    assert stored.startswith("g1:")
+    assert encryption_v2.decrypt_token(stored) == "sk_live_abc"
+
+    # Tampered ciphertext fails the GCM tag check
+    raw = bytearray(base64.urlsafe_b64decode(stored[3:]))
+    raw[-1] ^= 1
+    with pytest.raises(ValueError):
+        encryption_v2.decrypt_token("g1:" + base64.urlsafe_b64encode(bytes(raw)).decode())
+
+    # Old key moved to the rotation list: still decrypts, re-encryption uses the new key
+    _fresh_manager(monkeypatch, new_key)
+    monkeypatch.setenv("ENCRYPTION_KEY_ROTATION", old_key.decode())
+    assert encryption_v2.decrypt_token(stored) == "sk_live_abc"
+    rotated = encryption_v2.rotate_token(stored)
+    assert encryption_v2.get_key_manager().get_aead_encryptor().decrypt(rotated[3:].encode()) == b"sk_live_abc"
+
+
+def test_rotation_key_still_decrypts(monkeypatch):
+    old_key, new_key = Fernet.generate_key(), Fernet.generate_key()
+    _fresh_manager(monkeypatch, new_key)
+    monkeypatch.setenv("ENCRYPTION_KEY_ROTATION", old_key.decode())
+
+    old_token = "v1:" + base64.urlsafe_b64encode(Fernet(old_key).encrypt(b"tok")).decode()
+    assert encryption_v2.decrypt_token(old_token) == "tok"
+
+
+def test_fernet_objects_are_built_once(monkeypatch):
+    _fresh_manager(monkeypatch, Fernet.generate_key())
+    manager = encryption_v2.get_key_manager()
+    assert manager.get_encryptor() is manager.get_encryptor()
+    assert manager.get_decryptor() is manager.get_decryptor()
+
+    decryptor = manager.get_decryptor()
+    manager.reload()
+    assert manager.get_decryptor() is not decryptor
+
+
+def test_decrypt_is_cached_per_ciphertext_until_reload(monkeypatch):
+    _fresh_manager(monkeypatch, Fernet.generate_key())
+    stored = encryption_v2.encrypt_token("tok")
+    encryption_v2.decrypt_token(stored)
+    encryption_v2.decrypt_token(stored)
+    assert encryption_v2._decrypt_cached.cache_info().hits >= 1
+
+    encryption_v2.get_key_manager().reload()
+    assert encryption_v2._decrypt_cached.cache_info().currsize == 0
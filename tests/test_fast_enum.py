@@ -0,0 +1,23 @@
+"""FastEnum keeps Enum(native_enum=False) storage while interning member lookups."""
+
+from app.models._mixins import FastEnum
+from app.models.audit_log import AuditEventType
+from app.models.recommendation import RecommendationStatus
+
+
+def test_names_stored_by_default():
+    t = FastEnum(RecommendationStatus)
+    assert t.process_bind_param(RecommendationStatus.PENDING, None) == "PENDING"
+    assert t.process_bind_param("pending", None) == "PENDING"
+    assert t.process_bind_param("APPROVED", None) == "APPROVED"
+    assert t.process_result_value("EXECUTED", None) is RecommendationStatus.EXECUTED
+    assert t.length == len("EXECUTED")
+
+
+def test_values_stored_with_by_value():
+    t = FastEnum(AuditEventType, length=32, by_value=True)
+    member = next(iter(AuditEventType))
+    assert t.process_bind_param(member, None) == member.value
+    assert t.process_result_value(member.value, None) is member
+    assert t.process_bind_param(None, None) is None
+    assert t.process_result_value(None, None) is None
@@ -0,0 +1,23 @@
+"""from_orm_fast builds response schemas from trusted rows without validation."""
+
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.schemas import from_orm_fast
+from app.schemas.funnel import FunnelStep, FunnelWithSteps
+
+
+def _row(**kw):
+    now = datetime(2026, 1, 1)
+    return SimpleNamespace(id=uuid.uuid4(), org_id=uuid.uuid4(), created_at=now, updated_at=now, **kw)
+
+
+def test_nested_steps_and_defaults():
+    funnel = _row(name="Main")
+    step = _row(funnel_id=funnel.id, step_order=1, event_name="page_view", label=None)
+    out = from_orm_fast(FunnelWithSteps, funnel, steps=[from_orm_fast(FunnelStep, step)])
+    assert out.name == "Main" and out.slug is None
+    assert out.steps[0].event_name == "page_view"
+    dumped = FunnelWithSteps.model_validate(out.model_dump())
+    assert dumped.steps[0].funnel_id == funnel.id
@@ -0,0 +1,122 @@
+"""Funnel step-count rollup refresh and dashboard conversion metrics."""
+import uuid
+from datetime import date, datetime
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.api.admin import _build_funnel_conversion_metrics
+from app.models.funnel import FunnelRollupWatermark
+from app.services import funnel_rollup
+
+
+class _Query:
+    def __init__(self, result):
+        self.result = result
+        self.statement = None
+
+    def filter(self, *criteria):
+        return self
+
+    def with_for_update(self):
+        return self
+
+    def group_by(self, *cols):
+        return self
+
+    def first(self):
+        return self.result
+
+    def all(self):
+        return self.result
+
+
+class _FakeSession:
+    def __init__(self, query_result=None, rowcount=0):
+        self.query_result = query_result
+        self.rowcount = rowcount
+        self.executed = []
+        self.added = []
+        self.commits = 0
+        self.query_args = None
+
+    def query(self, *args):
+        self.query_args = args
+        return _Query(self.query_result)
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def execute(self, stmt, params=None):
+        self.executed.append((str(stmt), params))
+        return SimpleNamespace(rowcount=self.rowcount)
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_refresh_since_overlaps_previous_watermark():
+    now = datetime(2026, 3, 10, 12)
+    assert funnel_rollup.refresh_since(None, now) == now - funnel_rollup.INITIAL_LOOKBACK
+    last = datetime(2026, 3, 10, 11)
+    assert funnel_rollup.refresh_since(last, now) == last - funnel_rollup.REFRESH_OVERLAP
+
+
+def test_refresh_recomputes_buckets_touched_by_received_events():
+    watermark = FunnelRollupWatermark(id=1, refreshed_through=datetime(2026, 3, 10, 11))
+    db = _FakeSession(query_result=watermark, rowcount=4)
+
+    assert funnel_rollup.refresh_funnel_step_daily_counts(db) == 4
+
+    (delete_sql, delete_params), (insert_sql, insert_params) = db.executed
+    since = datetime(2026, 3, 10, 11) - funnel_rollup.REFRESH_OVERLAP
+    assert delete_params == insert_params == {"since": since}
+    # Buckets are chosen by received_at (catches backdated events) ...
+    assert "e.received_at >= :since" in delete_sql and "e.received_at >= :since" in insert_sql
+    # ... cleared first so stale event_names on a touched day drop out, then rebuilt per day
+    assert "DELETE FROM funnel_step_daily_counts" in delete_sql
+    assert "e.occurred_at < t.day + 1" in insert_sql
+    assert watermark.refreshed_through > datetime(2026, 3, 10, 11)
+    assert db.commits == 1
+
+
+def test_first_refresh_creates_watermark():
+    db = _FakeSession(query_result=None)
+    funnel_rollup.refresh_funnel_step_daily_counts(db)
+    (watermark,) = db.added
+    assert watermark.id == 1 and watermark.refreshed_through is not None
+    since = db.executed[0][1]["since"]
+    assert watermark.refreshed_through - since == funnel_rollup.INITIAL_LOOKBACK
+
+
+def test_funnel_step_counts_sums_rollup_rows():
+    org, f1, f2 = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    db = _FakeSession(query_result=[(f1, "view", 7), (f2, "buy", None)])
+    counts = funnel_rollup.funnel_step_counts(db, org, [f1, f2], {"view", "buy"}, date(2026, 3, 1))
+    assert counts == {(f1, "view"): 7, (f2, "buy"): 0}
+    sql = str(db.query_args[2].compile(dialect=postgresql.dialect()))
+    assert sql.startswith("sum(funnel_step_daily_counts.event_count)")
+
+
+def test_dashboard_metrics_from_prefetched_counts():
+    funnel = SimpleNamespace(id=uuid.uuid4(), name=None)
+    empty = SimpleNamespace(id=uuid.uuid4(), name="Empty")
+    steps = [
+        SimpleNamespace(step_order=1, label="Land", event_name="view"),
+        SimpleNamespace(step_order=2, label=None, event_name="buy"),
+    ]
+    metrics = _build_funnel_conversion_metrics(
+        [funnel, empty],
+        {funnel.id: steps},
+        {(funnel.id, "view"): 40, (funnel.id, "buy"): 10},
+        {(funnel.id, "view"): 20, (funnel.id, "buy"): 5},
+    )
+    first, second = metrics
+    assert first.funnel_name == "Unnamed"
+    assert [s.count for s in first.step_counts] == [40, 10]
+    assert first.step_counts[0].conversion_rate is None
+    assert first.step_counts[1].conversion_rate == 25.0
+    assert (first.total_visitors, first.total_conversions) == (20, 5)
+    assert first.overall_conversion_rate == 25.0
+    assert second.step_counts == [] and second.total_visitors == 0
+    assert second.overall_conversion_rate == 0.0
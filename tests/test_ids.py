@@ -0,0 +1,21 @@
+"""uuid7 ids for append-heavy tables."""
+import uuid
+
+from app.utils.ids import uuid7
+
+
+def test_uuid7_version_and_variant():
+    value = uuid7()
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+
+
+def test_uuid7_sorts_by_creation_millisecond(monkeypatch):
+    import app.utils.ids as ids
+
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 1_700_000_000_000_000_000)
+    earlier = uuid7()
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 1_700_000_000_001_000_000)
+    later = uuid7()
+    assert earlier < later
+    assert earlier.int >> 80 == 1_700_000_000_000
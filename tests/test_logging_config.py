@@ -0,0 +1,45 @@
+"""Log records are written by the QueueListener thread, not the caller."""
+import logging
+import logging.handlers
+
+from app.core import logging_config
+
+
+def test_records_go_through_queue_listener():
+    root = logging.getLogger()
+    level = root.level
+    logging_config.configure_logging()
+    logging_config.configure_logging()  # idempotent
+    queue_handlers = [h for h in root.handlers if isinstance(h, logging.handlers.QueueHandler)]
+    assert len(queue_handlers) == 1
+
+    seen = []
+
+    class _Capture(logging.Handler):
+        def emit(self, record):
+            seen.append(record.getMessage())
+
+    listener = logging_config._listener
+    listener.handlers = listener.handlers + (_Capture(),)
+    try:
+        logging.getLogger("app.test").warning("queued %s", "line")
+    finally:
+        logging_config.stop_logging()
+        root.setLevel(level)
+    assert seen == ["queued line"]
+    assert queue_handlers[0] not in root.handlers
+
+
+def test_reconfigure_after_stop_keeps_one_handler():
+    root = logging.getLogger()
+    level = root.level
+    logging_config.configure_logging()
+    logging_config.stop_logging()
+    logging_config.configure_logging()
+    try:
+        queue_handlers = [h for h in root.handlers if isinstance(h, logging.handlers.QueueHandler)]
+        assert len(queue_handlers) == 1
+    finally:
+        logging_config.stop_logging()
+        root.setLevel(level)
+    assert not [h for h in root.handlers if isinstance(h, logging.handlers.QueueHandler)]
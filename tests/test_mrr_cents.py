@@ -0,0 +1,21 @@
+"""MRR stored as integer cents behind the dollar-valued attributes."""
+from decimal import Decimal
+
+from app.models.client import Client
+from app.models.stripe_subscription import StripeSubscription
+
+
+def test_assigning_dollars_stores_rounded_cents():
+    client = Client(estimated_mrr=Decimal("199.995"))
+    assert client.estimated_mrr_cents == 20000
+    assert client.estimated_mrr == 200.0
+
+    sub = StripeSubscription(mrr=12.34)
+    assert sub.mrr_cents == 1234
+    assert sub.mrr == 12.34
+
+
+def test_none_passes_through():
+    sub = StripeSubscription(mrr=None)
+    assert sub.mrr_cents is None
+    assert sub.mrr is None
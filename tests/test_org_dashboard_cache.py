@@ -0,0 +1,83 @@
+"""Unit tests for the org dashboard summary cache (in-process path and generation-keyed Redis path)."""
+import uuid
+
+from app.services import org_dashboard_cache as cache
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.commands = []
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex=None):
+        self.store[key] = value
+
+    def incr(self, key):
+        self.commands.append(("incr", key))
+        self.store[key] = str(int(self.store.get(key) or 0) + 1)
+
+    def expire(self, key, seconds):
+        self.commands.append(("expire", key, seconds))
+
+    def pipeline(self):
+        return self
+
+    def execute(self):
+        return []
+
+
+def _key(org, range_days, scope):
+    return cache.org_dashboard_cache_key(org, range_days, scope)
+
+
+def test_keyed_by_range_and_scope_and_invalidated_per_org(monkeypatch):
+    monkeypatch.setattr(cache, "get_redis_client", lambda: None)
+    org_a, org_b = uuid.uuid4(), uuid.uuid4()
+    cache.org_dashboard_cache_set(_key(org_a, 30, None), b'{"a":30}')
+    cache.org_dashboard_cache_set(_key(org_a, 30, "mtd"), b'{"a":"mtd"}')
+    cache.org_dashboard_cache_set(_key(org_b, 30, None), b'{"b":30}')
+
+    assert cache.org_dashboard_cache_get(_key(org_a, 30, None)) == b'{"a":30}'
+    assert cache.org_dashboard_cache_get(_key(org_a, 30, "mtd")) == b'{"a":"mtd"}'
+    assert cache.org_dashboard_cache_get(_key(org_a, 7, None)) is None
+
+    cache.invalidate_org_dashboard(org_a)
+    assert cache.org_dashboard_cache_get(_key(org_a, 30, None)) is None
+    assert cache.org_dashboard_cache_get(_key(org_a, 30, "mtd")) is None
+    assert cache.org_dashboard_cache_get(_key(org_b, 30, None)) == b'{"b":30}'
+
+
+def test_key_resolved_before_invalidation_is_not_readable_after(monkeypatch):
+    monkeypatch.setattr(cache, "get_redis_client", lambda: None)
+    org = uuid.uuid4()
+    stale_key = _key(org, 30, None)
+    cache.invalidate_org_dashboard(org)
+    cache.org_dashboard_cache_set(stale_key, b'{"stale":true}')
+    assert cache.org_dashboard_cache_get(_key(org, 30, None)) is None
+
+
+def test_entries_expire(monkeypatch):
+    monkeypatch.setattr(cache, "get_redis_client", lambda: None)
+    org = uuid.uuid4()
+    cache.org_dashboard_cache_set(_key(org, 30, None), b"{}")
+    monkeypatch.setattr(cache, "ORG_DASHBOARD_CACHE_TTL_SEC", -1)
+    assert cache.org_dashboard_cache_get(_key(org, 30, None)) is None
+
+
+def test_redis_invalidation_bumps_generation_without_scanning(monkeypatch):
+    r = _FakeRedis()
+    monkeypatch.setattr(cache, "get_redis_client", lambda: r)
+    org_a, org_b = uuid.uuid4(), uuid.uuid4()
+    cache.org_dashboard_cache_set(_key(org_a, 30, None), b'{"a":30}')
+    cache.org_dashboard_cache_set(_key(org_b, 30, None), b'{"b":30}')
+
+    cache.invalidate_org_dashboard(org_a)
+
+    gen_key = f"orgdash:gen:{org_a}"
+    assert r.commands == [("incr", gen_key), ("expire", gen_key, cache._GEN_KEY_TTL_SEC)]
+    assert _key(org_a, 30, None) == f"orgdash:{org_a}:g1:30:"
+    assert cache.org_dashboard_cache_get(_key(org_a, 30, None)) is None
+    assert cache.org_dashboard_cache_get(_key(org_b, 30, None)) == b'{"b":30}'
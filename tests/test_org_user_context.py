@@ -0,0 +1,39 @@
+"""ensure_user_organization_link: one INSERT ... ON CONFLICT, commit only on insert."""
+import uuid
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.org_user_context import ensure_user_organization_link
+
+
+class _FakeSession:
+    def __init__(self, rowcount):
+        self.rowcount = rowcount
+        self.statements = []
+        self.commits = 0
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return SimpleNamespace(rowcount=self.rowcount)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+def test_conflict_targets_columns_not_constraint_name():
+    db = _FakeSession(rowcount=1)
+    ensure_user_organization_link(db, "a@example.com", uuid.uuid4(), uuid.uuid4())
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (user_id, org_id) DO NOTHING" in sql
+    assert db.commits == 1
+
+
+def test_existing_link_does_not_commit():
+    db = _FakeSession(rowcount=0)
+    ensure_user_organization_link(db, "a@example.com", uuid.uuid4(), uuid.uuid4())
+    assert len(db.statements) == 1
+    assert db.commits == 0
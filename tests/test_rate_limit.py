@@ -0,0 +1,97 @@
+"""In-memory sliding window: rejects at the limit and frees slots as stamps expire."""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import rate_limit
+from app.core.config import settings
+
+
+def test_memory_window_expires_old_stamps(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(rate_limit, "_get_redis", lambda: None)
+    key = "test:window"
+    rate_limit._rate_limit_store.pop(key, None)
+
+    assert rate_limit.sliding_window_try_acquire(key, 2, 60)
+    clock[0] += 30
+    assert rate_limit.sliding_window_try_acquire(key, 2, 60)
+    assert not rate_limit.sliding_window_try_acquire(key, 2, 60)
+    # Rejected calls are not recorded, so the deque never exceeds the limit
+    assert len(rate_limit._rate_limit_store[key]) == 2
+
+    clock[0] += 31  # first stamp is now outside the window
+    assert rate_limit.sliding_window_try_acquire(key, 2, 60)
+    assert not rate_limit.sliding_window_try_acquire(key, 2, 60)
+
+
+def test_async_acquire_falls_back_to_memory_without_redis(monkeypatch):
+    monkeypatch.setattr(settings, "REDIS_URL", None)
+    key = "test:async"
+    rate_limit._rate_limit_store.pop(key, None)
+
+    async def _burst():
+        return [await rate_limit.async_sliding_window_try_acquire(key, 2, 60) for _ in range(3)]
+
+    assert asyncio.run(_burst()) == [True, True, False]
+
+
+def test_async_redis_marked_failed_after_first_ping(monkeypatch):
+    import redis.asyncio as aioredis
+
+    created = []
+
+    class _DownRedis:
+        async def ping(self):
+            raise ConnectionError("redis down")
+
+    def _from_url(*args, **kwargs):
+        created.append(kwargs)
+        return _DownRedis()
+
+    monkeypatch.setattr(settings, "REDIS_URL", "redis://redis:6379/0")
+    monkeypatch.setattr(aioredis, "from_url", _from_url)
+    monkeypatch.setattr(rate_limit, "_async_redis_client", None)
+    monkeypatch.setattr(rate_limit, "_async_redis_init_lock", None)
+    key = "test:async-down"
+    rate_limit._rate_limit_store.pop(key, None)
+
+    async def _burst():
+        return [await rate_limit.async_sliding_window_try_acquire(key, 2, 60) for _ in range(3)]
+
+    assert asyncio.run(_burst()) == [True, True, False]
+    assert len(created) == 1
+    assert rate_limit._async_redis_client is False
+
+
+def test_identifier_uses_named_user_kwarg():
+    class _User:
+        id = "u1"
+        org_id = "o1"
+
+    ident, request, user = rate_limit._resolve_rate_limit_identifier(
+        (), {"body": object(), "admin_user": _User()}, identifier_func=None, user_kw="admin_user"
+    )
+    assert ident == "user_u1_o1" and request is None
+
+
+def test_rejection_is_audited_without_db_or_request(monkeypatch):
+    from app.core import audit
+
+    class _User:
+        id = "u1"
+        org_id = "o1"
+
+    queued = []
+    monkeypatch.setattr(audit, "_insert_audit_rows", queued.extend)
+    monkeypatch.setattr(rate_limit, "_get_redis", lambda: None)
+    key = "test:audit"
+    rate_limit._rate_limit_store.pop(key, None)
+
+    rate_limit.check_sliding_window(key, 1, 60, endpoint_name="ep", audit_user=_User())
+    with pytest.raises(HTTPException) as exc:
+        rate_limit.check_sliding_window(key, 1, 60, endpoint_name="ep", audit_user=_User())
+    assert exc.value.status_code == 429
+    assert [row["resource_id"] for row in queued] == ["ep"]
@@ -0,0 +1,31 @@
+"""RequestTimingMiddleware counts DB cursor executes per request, including sync handlers."""
+import json
+import logging
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.middleware.request_timing import RequestTimingMiddleware, current_db_rtts
+
+
+def test_logs_route_and_db_rtt_count(caplog):
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.add_middleware(RequestTimingMiddleware)
+
+    @app.get("/items/{item_id}")
+    def read_item(item_id: int):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+        return {"db_rtts": current_db_rtts()}
+
+    with caplog.at_level(logging.INFO, logger="app.middleware.request_timing"):
+        resp = TestClient(app).get("/items/7")
+
+    assert resp.json() == {"db_rtts": 2}
+    entry = json.loads(caplog.records[-1].getMessage())
+    assert entry["route"] == "/items/{item_id}"
+    assert entry["status"] == 200
+    assert entry["db_rtt_count"] == 2
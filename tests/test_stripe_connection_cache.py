@@ -0,0 +1,58 @@
+"""Unit tests for the per-worker Stripe connection cache."""
+import uuid
+
+from app.services import stripe_connection_cache as cache
+
+
+def test_set_get_and_org_invalidation():
+    org_a, org_b = uuid.uuid4(), uuid.uuid4()
+    cache.stripe_connected_cache_set(org_a, True, None)
+    cache.stripe_connected_cache_set(org_b, False, None)
+
+    assert cache.stripe_connected_cache_get(org_a) == (True, None)
+
+    cache.invalidate_stripe_connected_cache(str(org_a))
+    assert cache.stripe_connected_cache_get(org_a) is None
+    assert cache.stripe_connected_cache_get(org_b) == (False, None)
+
+    cache.invalidate_stripe_connected_cache()
+    assert cache.stripe_connected_cache_get(org_b) is None
+
+
+def test_expired_entry_is_dropped(monkeypatch):
+    org = uuid.uuid4()
+    cache.stripe_connected_cache_set(org, True, None)
+    monkeypatch.setattr(cache, "STRIPE_CONNECTED_CACHE_TTL_SEC", -1.0)
+    assert cache.stripe_connected_cache_get(org) is None
+
+
+def test_account_org_mapping_dropped_with_its_org():
+    org_a, org_b = uuid.uuid4(), uuid.uuid4()
+    cache.stripe_account_org_cache_set("acct_a", org_a)
+    cache.stripe_account_org_cache_set("acct_b", org_b)
+
+    cache.invalidate_stripe_connected_cache(str(org_a))
+    assert cache.stripe_account_org_cache_get("acct_a") is None
+    assert cache.stripe_account_org_cache_get("acct_b") == org_b
+
+
+def test_listener_uses_direct_url_and_skips_pooled_only(monkeypatch):
+    monkeypatch.setattr(cache.settings, "DATABASE_URL", "postgresql+psycopg2://u:p@bouncer:6432/sweep")
+    monkeypatch.setattr(cache.settings, "DATABASE_PGBOUNCER", True)
+    monkeypatch.setattr(cache.settings, "DATABASE_DIRECT_URL", None)
+    assert cache._listener_dsn() is None
+
+    monkeypatch.setattr(cache.settings, "DATABASE_DIRECT_URL", "postgresql://u:p@db:5432/sweep")
+    assert cache._listener_dsn() == "postgresql://u:p@db:5432/sweep"
+
+    monkeypatch.setattr(cache.settings, "DATABASE_PGBOUNCER", False)
+    monkeypatch.setattr(cache.settings, "DATABASE_DIRECT_URL", None)
+    assert cache._listener_dsn() == "postgresql://u:p@bouncer:6432/sweep"
+
+
+def test_listener_not_started_without_direct_connection(monkeypatch):
+    started = []
+    monkeypatch.setattr(cache, "_listener_dsn", lambda: None)
+    monkeypatch.setattr(cache.threading, "Thread", lambda *a, **k: started.append(k))
+    cache.start_oauth_token_listener()
+    assert started == []
@@ -0,0 +1,46 @@
+"""Unit tests for the tab permission map cache (in-process path, no REDIS_URL)."""
+import uuid
+
+from app.services import tab_permission_cache as cache
+
+
+def test_user_and_org_invalidation():
+    org_a, org_b = uuid.uuid4(), uuid.uuid4()
+    u1, u2 = uuid.uuid4(), uuid.uuid4()
+    perms = {"terminal": True, "funnels": False}
+    cache.tab_permissions_cache_set(u1, org_a, perms)
+    cache.tab_permissions_cache_set(u2, org_a, perms)
+    cache.tab_permissions_cache_set(u1, org_b, perms)
+
+    assert cache.tab_permissions_cache_get(u1, org_a) == perms
+
+    cache.invalidate_tab_permissions(u1, org_a)
+    assert cache.tab_permissions_cache_get(u1, org_a) is None
+    assert cache.tab_permissions_cache_get(u2, org_a) == perms
+
+    cache.invalidate_org_tab_permissions(org_a)
+    assert cache.tab_permissions_cache_get(u2, org_a) is None
+    assert cache.tab_permissions_cache_get(u1, org_b) == perms
+
+
+def test_cached_map_is_a_copy():
+    org, user = uuid.uuid4(), uuid.uuid4()
+    cache.tab_permissions_cache_set(user, org, {"terminal": True})
+    cache.tab_permissions_cache_get(user, org)["terminal"] = False
+    assert cache.tab_permissions_cache_get(user, org) == {"terminal": True}
+
+
+def test_request_state_memoizes_map():
+    from types import SimpleNamespace
+
+    org, user_id = uuid.uuid4(), uuid.uuid4()
+    user = SimpleNamespace(id=user_id, org_id=org, selected_org_id=org)
+    request = SimpleNamespace(state=SimpleNamespace())
+    cache.tab_permissions_cache_set(user_id, org, {"terminal": True})
+
+    assert cache.cached_check_tab_access("terminal", user, None, request) is True
+    assert request.state.tab_perms == {"terminal": True}
+
+    # Later checks in the same request skip the shared cache entirely
+    cache.invalidate_tab_permissions(user_id, org)
+    assert cache.get_cached_user_tab_permissions(user, None, request) == {"terminal": True}
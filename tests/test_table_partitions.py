@@ -0,0 +1,21 @@
+"""Monthly partition ranges for events / audit_logs."""
+from datetime import date
+
+from app.services.table_partitions import monthly_ranges, partition_ddl
+
+
+def test_monthly_ranges_cross_year_boundary():
+    ranges = list(monthly_ranges(date(2025, 11, 17), date(2026, 1, 1)))
+    assert ranges == [
+        ("2025_11", date(2025, 11, 1), date(2025, 12, 1)),
+        ("2025_12", date(2025, 12, 1), date(2026, 1, 1)),
+        ("2026_01", date(2026, 1, 1), date(2026, 2, 1)),
+    ]
+
+
+def test_partition_ddl_is_idempotent_range():
+    ddl = partition_ddl("events", "2026_01", date(2026, 1, 1), date(2026, 2, 1))
+    assert ddl == (
+        "CREATE TABLE IF NOT EXISTS events_2026_01 PARTITION OF events "
+        "FOR VALUES FROM ('2026-01-01') TO ('2026-02-01')"
+    )
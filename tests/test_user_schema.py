@@ -0,0 +1,24 @@
+"""UserSchema accepts ORM-shaped users (enum / DB-label roles) without manual dict building."""
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.models.user import UserRole
+from app.schemas.user import User as UserSchema
+
+
+def _orm_user(role):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        org_id=uuid.uuid4(),
+        email="a@example.com",
+        role=role,
+        is_admin=True,
+        created_at=datetime(2025, 1, 1),
+    )
+
+
+def test_model_validate_normalizes_role():
+    assert UserSchema.model_validate(_orm_user(UserRole.OWNER)).role == "owner"
+    assert UserSchema.model_validate(_orm_user("ADMIN")).role == "admin"
+    assert UserSchema.model_validate(_orm_user("member")).role == "member"